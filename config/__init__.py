@@ -1,6 +1,8 @@
+from .dashboard import DashboardConfig
 from .experiment import ExperimentConfig
 from .logging_config import LoggingConfig
 from .paths import PathConfig
+from .processing import ProcessingConfig
 
 
 class Config:
@@ -8,3 +10,5 @@ class Config:
         self.paths = PathConfig()
         self.logging = LoggingConfig()
         self.experiment = ExperimentConfig()
+        self.processing = ProcessingConfig()
+        self.dashboard = DashboardConfig()
@@ -0,0 +1,16 @@
+import os
+
+
+class DashboardConfig:
+    def __init__(self):
+        # ページ間で共有する読み込み結果のキャッシュの上限[bytes]（超えた場合は古いものから削除）
+        self.data_cache_max_bytes = 512 * 1024**2
+        # 時系列のプロットで1つのトレースに描画する点の数の上限（超える場合は間引く）
+        self.plot_max_points = 5000
+        self.decimation_method = "minmax"  # "minmax"（最小・最大）または "lttb"
+        # 描画済みの図のキャッシュ（メモリとoutput/cache/figuresに保存する）
+        self.figure_format = "png"  # "png" または "svg"
+        self.figure_dpi = 100
+        self.figure_cache_max_bytes = 128 * 1024**2  # メモリに保持する画像の上限[bytes]
+        # 被験者ごとの図を並列に描画するプロセス数（1の場合は逐次描画）
+        self.render_workers = min(4, os.cpu_count() or 1)
@@ -7,4 +7,18 @@ class ExperimentConfig:
         self.Obj_PoI_y = 1.931
         self.Obj_w = 1.70
 
+        # 実験条件（コース）ごとの対象物の折れ線の頂点 [[x, y], ...]（最短距離の計算に使う）
+        # 条件が含まれない場合は最短距離を計算しない
+        self.obj_polylines: dict[str, list[list[float]]] = {}
+        # 折れ線を点列に分割する間隔[m]
+        self.obj_polyline_resolution = 0.05
+
+        # 実験条件（コース）ごとの区間の定義（区間ごとの指標の計算に使う）
+        # 各区間は {"name": 区間名, "polygon": [[x, y], ...]} または
+        # {"name": 区間名, "distance": [開始距離, 終了距離]}（累積走行距離[m]、終了は含まない）
+        # 複数の区間に含まれるサンプルは先に定義した区間に割り当てる
+        self.zones: dict[str, list[dict]] = {}
+        # 多角形の判定に使う座標（"ego": 自車の基準点、"front_left": 自車左前端）
+        self.zone_reference = "front_left"
+
         self.ms_to_kmh = 60**2 / 1000
@@ -13,7 +13,18 @@ class FolderPathModel(BaseModel):
     path_folder_simout: Path = base_dir / "simout"
 
     path_folder_subject_results: Path = path_folder_output / "subject_results"
+    path_folder_subject_window_features: Path = (
+        path_folder_output / "subject_window_features"
+    )
     path_folder_log: Path = path_folder_output / "log"
+    path_folder_figures: Path = path_folder_output / "figures"
+    path_folder_cache: Path = path_folder_output / "cache"
+    path_folder_simout_cache: Path = path_folder_cache / "simout"
+    path_folder_event_cache: Path = path_folder_cache / "events"
+    path_folder_distance_cache: Path = path_folder_cache / "distance"
+    path_folder_dtw_cache: Path = path_folder_cache / "dtw"
+    path_folder_spectrum_cache: Path = path_folder_cache / "spectra"
+    path_folder_figure_cache: Path = path_folder_cache / "figures"
 
 
 class FilePathModel(BaseModel):
@@ -27,6 +38,15 @@ class FilePathModel(BaseModel):
     all_subjects_results: Path = (
         folder_path_model.path_folder_output / "all_subjects_results.csv"
     )
+    processing_manifest: Path = (
+        folder_path_model.path_folder_output / "processing_manifest.json"
+    )
+    geometry_sweep_results: Path = (
+        folder_path_model.path_folder_output / "geometry_sweep_results.csv"
+    )
+    figure_export_manifest: Path = (
+        folder_path_model.path_folder_figures / "manifest.json"
+    )
 
 
 class FileManager:
@@ -57,6 +77,9 @@ class FileManager:
     def get_subject_results_path(self, file_name):
         return self.folder_path_model.path_folder_subject_results / file_name
 
+    def get_subject_window_features_path(self, file_name):
+        return self.folder_path_model.path_folder_subject_window_features / file_name
+
     def get_output_path(self, file_name):
         return self.folder_path_model.path_folder_output / file_name
 
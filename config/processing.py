@@ -0,0 +1,62 @@
+import os
+
+
+class ProcessingConfig:
+    def __init__(self):
+        # Trueの場合、指標計算時に生データを分割して読み込む（長時間の記録向け）。
+        # 生データ全体が必要な指標（peak_jerk、min_gap、区間の指標、遅れ時間）は計算しない
+        self.streaming = False
+        self.chunk_size = 100_000  # 分割読み込み時の行数
+        # 被験者ごとの処理を並列に実行するプロセス数（1の場合は逐次処理）
+        self.n_workers = 1
+        # 入力に変更があった被験者だけを再計算する
+        self.incremental = True
+        # Trueの場合、全実験の指標を連結した配列からまとめて計算する
+        self.batch_engine = False
+        # Trueの場合、速度の標準偏差・パーセンタイル、最大減速度も計算する（batch_engine使用時）
+        self.distribution_metrics = False
+        # Trueの場合、スライディングウィンドウの特徴量を計算して保存する
+        self.window_features = False
+        self.window_length = 1.0  # ウィンドウの長さ[s]
+        self.window_hop = 0.1  # ウィンドウをずらす間隔[s]
+        self.pedal_threshold = 0.05  # ペダルを踏んでいるとみなす踏み込み量
+        # イベント検出のしきい値（開始と終了で値を変えてヒステリシスを持たせる）
+        self.brake_on_threshold = 0.1  # ブレーキ踏み込みとみなす踏み込み量
+        self.brake_off_threshold = 0.05  # ブレーキ解放とみなす踏み込み量
+        self.gas_on_threshold = 0.1  # アクセル踏み込みとみなす踏み込み量
+        self.gas_off_threshold = 0.05  # アクセル解放とみなす踏み込み量
+        self.stop_on_velocity = 0.01  # 停止とみなす速度[m/s]
+        self.stop_off_velocity = 0.05  # 発進とみなす速度[m/s]
+        self.hard_deceleration_on = 3.0  # 急減速とみなす減速度[m/s^2]
+        self.hard_deceleration_off = 2.0  # 急減速の終了とみなす減速度[m/s^2]
+        # 距離を横軸にした補間と被験者間の集計
+        self.distance_step = 0.01  # 距離の格子の間隔[m]
+        self.band_percentiles = (10, 90)  # 帯の下側・上側パーセンタイル
+        # Trueの場合、ペダル量と加速度のPSDの要約値（卓越周波数、帯域パワー）を結果に追加する
+        self.spectral_metrics = False
+        self.welch_segment_length = 2.0  # Welch法のウィンドウの長さ[s]
+        self.welch_overlap = 0.5  # ウィンドウの重なりの割合
+        self.spectral_band = (0.5, 5.0)  # 帯域パワーを求める周波数の範囲[Hz]
+        # Trueの場合、ペダル入力から加速度の応答までの遅れ時間と相関のピークを計算する
+        self.lag_metrics = False
+        self.max_lag = 1.0  # 探索する遅れ時間の最大値[s]（Noneの場合は全範囲）
+        # Trueの場合、生データの読み込み時に信号の前処理（フィルタ、加加速度の計算）を1回だけ行い、
+        # 生データのキャッシュに保存する。イベント検出と指標はフィルタ後の信号を使う
+        self.signal_conditioning = False
+        self.conditioning_channels = ["ego_a", "Gas_Out", "Brake_Out"]  # 対象の列
+        self.conditioning_filter = "fir"  # "moving_average" または "fir"（ローパス）
+        self.moving_average_window = 0.1  # 移動平均の長さ[s]
+        self.lowpass_cutoff = 2.0  # ローパスフィルタの遮断周波数[Hz]
+        self.lowpass_length = 1.0  # ローパスフィルタの長さ[s]
+        # 図の一括出力（export_figures.py）
+        self.export_formats = ["png", "pdf"]  # 出力する画像の形式
+        self.export_dpi = 300  # 出力する画像の解像度
+        self.export_workers = min(4, os.cpu_count() or 1)  # 並列に描画するプロセス数
+        # 被験者間のDTW距離
+        self.dtw_channels = ["ego_v", "Brake_Out", "Gas_Out"]  # 比較する列
+        self.dtw_downsample = 10  # 平均して間引くサンプル数
+        self.dtw_band_fraction = 0.1  # Sakoe-Chiba帯の幅（系列長に対する割合）
+        # 寸法の感度分析（--sweep）で試す値（空の場合は現在の設定値のみ）
+        self.sweep_Ego_l: list[float] = []
+        self.sweep_PoI_y: list[float] = []
+        self.sweep_Ego_w: list[float] = []
@@ -0,0 +1,68 @@
+import argparse
+import datetime
+import os
+import warnings
+
+from config import Config
+from src.app_data import AppData
+from src.figure_exporter import FigureExporter
+
+warnings.simplefilter("ignore")
+
+
+def export_figures(
+    formats: list[str] | None = None,
+    n_workers: int | None = None,
+    incremental: bool = True,
+):
+    """
+    全ての被験者・速度・実験条件の図を画像ファイルに一括出力
+    （出力先は output/figures、出力したファイルの一覧は output/figures/manifest.json）
+    """
+    config = Config()
+    config.paths.file_manager.print_base_dir()
+
+    os.makedirs(config.paths.folder_path_model.path_folder_figures, exist_ok=True)
+
+    current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file_name = f"{current_time}_export_figures.txt"
+    log_file_path = config.paths.file_manager.get_log_path(log_file_name)
+    logger = config.logging.setting_log(log_file_path)
+
+    app_data = AppData(config)
+    figure_exporter = FigureExporter(config, logger=logger)
+    df_figures = figure_exporter.export(
+        app_data.get_simout_list(),
+        df_all_subject_results=app_data.get_results(),
+        formats=formats,
+        n_workers=n_workers,
+        incremental=incremental,
+    )
+
+    config.logging.clear_logging()
+    return df_figures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="図を並列に描画するプロセス数",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        default=None,
+        help="出力する画像の形式（例: png pdf svg）",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="入力の変更有無にかかわらず全ての図を出力する",
+    )
+    args = parser.parse_args()
+    export_figures(
+        formats=args.formats, n_workers=args.workers, incremental=not args.full
+    )
@@ -1,3 +1,4 @@
+import argparse
 import datetime
 import logging
 import os
@@ -5,6 +6,7 @@ import warnings
 
 from config import Config
 from src.data_manager import DataManager
+from src.geometry_sweep import GeometrySweep
 
 # warnings.simplefilter("ignore")
 
@@ -33,8 +35,12 @@ def setting_log(config: Config, log_file_name=None):
     return logger
 
 
-def main():
+def main(n_workers: int | None = None, incremental: bool | None = None):
     config = Config()
+    if n_workers is not None:
+        config.processing.n_workers = n_workers
+    if incremental is not None:
+        config.processing.incremental = incremental
     config.paths.file_manager.print_base_dir()
 
     os.makedirs(config.paths.folder_path_model.path_folder_output, exist_ok=True)
@@ -60,5 +66,54 @@ def main():
     return df
 
 
+def run_geometry_sweep():
+    """
+    自車の寸法の組み合わせごとに角の座標に基づく指標を計算し、csv出力
+    （候補の値は config.processing.sweep_* で設定する）
+    """
+    config = Config()
+    config.paths.file_manager.print_base_dir()
+
+    os.makedirs(config.paths.folder_path_model.path_folder_output, exist_ok=True)
+
+    current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file_name = f"{current_time}.txt"
+    log_file_path = config.paths.file_manager.get_log_path(log_file_name)
+    logger = config.logging.setting_log(log_file_path)
+
+    geometry_sweep = GeometrySweep(config, logger=logger)
+    df_parameters = geometry_sweep.make_parameter_grid(
+        Ego_l=config.processing.sweep_Ego_l,
+        PoI_y=config.processing.sweep_PoI_y,
+        Ego_w=config.processing.sweep_Ego_w,
+    )
+    df_sweep = geometry_sweep.run(df_parameters)
+    df_sweep.to_csv(config.paths.file_path_model.geometry_sweep_results, index=False)
+
+    config.logging.clear_logging()
+    return df_sweep
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="被験者ごとの処理を並列に実行するプロセス数",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="入力の変更有無にかかわらず全被験者を再計算する",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="自車の寸法の組み合わせごとに指標を計算する（config.processing.sweep_*）",
+    )
+    args = parser.parse_args()
+    if args.sweep:
+        run_geometry_sweep()
+    else:
+        main(n_workers=args.workers, incremental=False if args.full else None)
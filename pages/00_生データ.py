@@ -1,18 +1,31 @@
-import pandas as pd
+import os
+
+import numpy as np
 import plotly.express as px
 import streamlit as st
 
 from config import Config
+from schemas.df_conditioned_schema import DfConditionedSchema
 from schemas.df_simout_schema import DfSimoutSchema
+from src.app_data import AppData
+from src.decimation import DECIMATION_METHODS, decimate, select_range
+from src.simout_arrays import SimoutArrays
+from src.time_window_index import TimeWindowIndex
 
 config = Config()
 
-simout_list = config.paths.file_manager.get_simout_file_names()
-simout_list = [file for file in simout_list if ".csv" in file]
+app_data = AppData(config)
+simout_list = app_data.get_simout_list()
 
 df_simout_columns = DfSimoutSchema()
 
 
+@st.cache_resource
+def get_time_window_index(file_name: str, mtime_ns: int) -> TimeWindowIndex:
+    """ファイルごとの時間範囲指標のインデックス（ファイル更新時に作り直す）"""
+    return TimeWindowIndex.from_arrays(SimoutArrays.open(file_name, config))
+
+
 with st.expander("ファイルを選択"):
     fileplot: str = st.radio(
         label="可視化するファイルを選択してください",
@@ -21,9 +34,17 @@ with st.expander("ファイルを選択"):
         horizontal=True,
     )
 
-df_plot = pd.read_csv(config.paths.file_manager.get_simout_path(fileplot))
+simout_arrays = SimoutArrays.open(fileplot, config)
 
 options_dict = df_simout_columns.get_column_map()
+# 前処理を行う設定の場合は、キャッシュに保存されたフィルタ後の信号も選択できる
+options_dict.update(
+    {
+        name: column
+        for name, column in DfConditionedSchema.get_column_map().items()
+        if column in simout_arrays
+    }
+)
 options = list(options_dict.keys())
 x: str = st.radio(
     label="xを選択してください",
@@ -35,13 +56,53 @@ y: list[str] = st.multiselect(
     label="yを選択してください", options=options, default=options[2]
 )
 
+time = np.asarray(simout_arrays.time)
+dt = float(time[1] - time[0])
+with st.expander("表示の設定"):
+    decimation_method: str = st.radio(
+        label="間引きの方法を選択してください",
+        options=DECIMATION_METHODS,
+        index=DECIMATION_METHODS.index(config.dashboard.decimation_method),
+        horizontal=True,
+    )
+    max_points = st.number_input(
+        label="1つの系列に描画する点の数の上限",
+        min_value=100,
+        value=config.dashboard.plot_max_points,
+        step=1000,
+    )
+    # 範囲を狭めると、範囲内のサンプルから間引き直して細かく表示する
+    view_start, view_end = st.slider(
+        label="表示する時間範囲[s]を選択してください",
+        min_value=float(time[0]),
+        max_value=float(time[-1]),
+        value=(float(time[0]), float(time[-1])),
+        step=dt,
+    )
+
 x_column = options_dict[x]
+# 表示範囲のサンプルだけをメモリマップから読み込み、点の数の上限まで間引く
+view = select_range(time, view_start, view_end)
+x_values = np.asarray(simout_arrays[x_column][view])
 fig = px.scatter()
 
 for y_value in y:
-    y_column = options_dict[y_value]
+    y_values = np.asarray(simout_arrays[options_dict[y_value]][view])
+    indices = decimate(time[view], y_values, int(max_points), decimation_method)
     fig.add_scatter(
-        x=df_plot[x_column], y=df_plot[y_column], mode="markers", name=y_value
+        x=x_values[indices], y=y_values[indices], mode="markers", name=y_value
     )
 
 st.plotly_chart(fig)
+
+time_window_index = get_time_window_index(
+    fileplot, os.stat(config.paths.file_manager.get_simout_path(fileplot)).st_mtime_ns
+)
+start_time, end_time = st.slider(
+    label="指標を計算する時間範囲[s]を選択してください",
+    min_value=float(time_window_index.time[0]),
+    max_value=float(time_window_index.time[-1]),
+    value=(float(time_window_index.time[0]), float(time_window_index.time[-1])),
+    step=float(time_window_index.dt),
+)
+st.dataframe(time_window_index.query_many([start_time], [end_time]))
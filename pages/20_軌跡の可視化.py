@@ -1,10 +1,15 @@
 import datetime
 import re
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from config import Config
+from schemas.df_processed_schema import DfProcessedSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.app_data import AppData
+from src.decimation import minmax_indices, select_range
 from src.experiment_processor import ExperimentProcessor
 from src.metric_calculator import MetricCalculator
 from src.plots.plot_trajectory import plot_trajectory
@@ -13,8 +18,8 @@ config = Config()
 
 
 # simoutのファイルを格納するフォルダ名を取得
-simout_list = config.paths.file_manager.get_simout_file_names()
-simout_list = [file for file in simout_list if ".csv" in file]
+app_data = AppData(config)
+simout_list = app_data.get_simout_list()
 
 with st.sidebar:
     to_log_file = st.radio(
@@ -75,7 +80,37 @@ experiment_processor = ExperimentProcessor(
     experiment_type=experiment_type,
     experiment_condition=experiment_condition,
     logger=logger,
+    columns=ExperimentProcessor.TRAJECTORY_COLUMNS,
 )
 experiment_processor._add_ego_edge_coordinates(experiment_processor.df)
-fig = plot_trajectory(df=experiment_processor.df)
+
+df_processed_columns = DfProcessedSchema()
+df_trajectory = experiment_processor.df
+time = df_trajectory[DfSimoutSchema().time].to_numpy()
+with st.expander("表示の設定"):
+    max_points = st.number_input(
+        label="描画する点の数の上限",
+        min_value=100,
+        value=config.dashboard.plot_max_points,
+        step=1000,
+    )
+    # 範囲を狭めると、範囲内のサンプルから間引き直して細かく表示する
+    view_start, view_end = st.slider(
+        label="表示する時間範囲[s]を選択してください",
+        min_value=float(time[0]),
+        max_value=float(time[-1]),
+        value=(float(time[0]), float(time[-1])),
+        step=float(time[1] - time[0]),
+    )
+df_view = df_trajectory.iloc[select_range(time, view_start, view_end)]
+# x・yそれぞれの極値を残して間引き、カーブの頂点や折り返し点が消えないようにする
+points = df_view[
+    [df_processed_columns.Ego_front_left_x, df_processed_columns.Ego_front_left_y]
+].to_numpy()
+indices = (
+    minmax_indices(points, int(max_points))
+    if len(df_view) > max_points
+    else np.arange(len(df_view))
+)
+fig = plot_trajectory(df=df_view.iloc[indices])
 st.plotly_chart(fig)
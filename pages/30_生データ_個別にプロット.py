@@ -1,25 +1,25 @@
 import datetime
-import os
 import warnings
 
-import pandas as pd
 import streamlit as st
 
 from config import Config
-from src.plots.plot_t_v_a_gas_distance import plot_t_v_a_gas_distance_individual
+from src.app_data import AppData
+from src.figure_cache import FigureCache
+from src.figure_renderer import FigureRenderer
+from src.plots.plot_t_v_a_gas_distance import PLOT_COLUMNS
 from src.subject_manager import SubjectManager
 
 warnings.simplefilter("ignore")
 
 config = Config()
 
-simout_list = config.paths.file_manager.get_simout_file_names()
-simout_list = [file for file in simout_list if ".csv" in file]
+app_data = AppData(config)
+simout_list = app_data.get_simout_list()
 
 all_subject_results_path = config.paths.file_path_model.all_subjects_results
-if os.path.exists(all_subject_results_path):
-    df_all_subject_results = pd.read_csv(all_subject_results_path)
-else:
+df_all_subject_results = app_data.get_results()
+if df_all_subject_results is None:
     st.error(f"error：処理済ファイル '{all_subject_results_path}' は存在しません。")
     st.stop()
 
@@ -34,26 +34,48 @@ with st.sidebar:
     ids = st.multiselect(
         label="IDを選択してください", options=ids_options, default=ids_options
     )
-subject_managers = {}
-for id in ids:
-    st.write(f"{id}")
-    subject_i = SubjectManager(id, simout_list)
-    subject_i.load_raw_data(config=config)
-    subject_managers[id] = subject_i
-    fig = plot_t_v_a_gas_distance_individual(
-        config,
-        subject_i.df_dict,
-        id,
-        subject_i.experiment_type,
-        df_all_subject_results=df_all_subject_results,
-    )
-    st.pyplot(fig)
-
 current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
 log_file_name = f"{current_time}_raw_multi_plot.txt"
 log_file_path = (
-    config.paths.get_log_path(log_file_name) if to_log_file == "はい" else None
+    config.paths.file_manager.get_log_path(log_file_name)
+    if to_log_file == "はい"
+    else None
 )
 
 logger = config.logging.setting_log(log_file_path)
+
+figure_cache = FigureCache(config, logger)
+figure_renderer = FigureRenderer(config, logger)
+
+# 被験者の順に表示枠を用意し、入力ファイルが変わっていない図は保存された画像をすぐに表示する
+placeholders = {}
+keys = {}
+pending_ids = []
+for id in ids:
+    st.write(f"{id}")
+    placeholders[id] = st.empty()
+    file_names, experiment_type = (
+        SubjectManager.extract_subject_raw_file_names_and_type(simout_list, id)
+    )
+    keys[id] = figure_cache.make_key(
+        plot="t_v_a_gas_distance_individual",
+        subject_ids=[id],
+        velocity=None,
+        experiment_type=experiment_type,
+        file_names=list(file_names.values()),
+        options={"columns": PLOT_COLUMNS},
+    )
+    image = figure_cache.get(keys[id])
+    if image is None:
+        placeholders[id].text("描画中...")
+        pending_ids.append(id)
+    else:
+        placeholders[id].image(image)
+
+# 残りの図はプロセスプールで並列に描画し、描画が終わったものから被験者の順に表示する
+for id, image in figure_renderer.render_subject_images(
+    pending_ids, simout_list, df_all_subject_results=df_all_subject_results
+):
+    figure_cache.put(keys[id], image)
+    placeholders[id].image(image)
@@ -1,25 +1,25 @@
 import datetime
-import os
+import functools
 import warnings
 
-import pandas as pd
 import streamlit as st
 
 from config import Config
-from src.plots.plot_t_v_a_gas_distance import plot_t_v_a_gas_distance_by_type
-from src.subject_manager import SubjectManager
+from src.app_data import AppData
+from src.distance_resampler import DistanceResampler
+from src.figure_cache import FigureCache
+from src.plots.plot_t_v_a_gas_distance import plot_distance_bands_by_type
 
 warnings.simplefilter("ignore")
 
 config = Config()
 
-simout_list = config.paths.file_manager.get_simout_file_names()
-simout_list = [file for file in simout_list if ".csv" in file]
+app_data = AppData(config)
+simout_list = app_data.get_simout_list()
 
 all_subject_results_path = config.paths.file_path_model.all_subjects_results
-if os.path.exists(all_subject_results_path):
-    df_all_subject_results = pd.read_csv(all_subject_results_path)
-else:
+df_all_subject_results = app_data.get_results()
+if df_all_subject_results is None:
     st.error(f"error：処理済ファイル '{all_subject_results_path}' は存在しません。")
     st.stop()
 
@@ -30,12 +30,6 @@ with st.sidebar:
         index=1,
         horizontal=True,
     )
-subject_managers = {}
-for id in range(1, 11):
-    subject_i = SubjectManager(id, simout_list)
-    subject_i.load_raw_data(config=config)
-    subject_managers[id] = subject_i
-
 current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
 log_file_name = f"{current_time}_raw_multi_plot.txt"
@@ -46,16 +40,50 @@ log_file_path = (
 )
 
 logger = config.logging.setting_log(log_file_path)
+
+distance_resampler = DistanceResampler(config, logger)
+figure_cache = FigureCache(config, logger)
+
+
+@functools.cache
+def get_df_bands():
+    """
+    距離の格子に補間した結果（ファイルに保存済みのものは再利用）から被験者間の帯を計算
+    （描画し直す図がある場合だけ、1回の実行につき1回計算する）
+    """
+    return distance_resampler.aggregate(simout_list)
+
+
 velocitys = [60]
 experiment_types = ["A", "B"]
 for velocity in velocitys:
     for experiment_type in experiment_types:
         st.write(f"実験条件：{experiment_type}")
-        fig = plot_t_v_a_gas_distance_by_type(
-            config,
-            subject_managers=subject_managers,
+        # 帯は条件が同じ全ファイルから計算するため、それらのファイルをキーに含める
+        file_names = [
+            file
+            for file in simout_list
+            if file.split("_")[3] == experiment_type
+            and int(file.split("_")[2]) == velocity
+        ]
+        key = figure_cache.make_key(
+            plot="distance_bands_by_type",
+            subject_ids=[int(file.split("_")[1]) for file in file_names],
             velocity=velocity,
             experiment_type=experiment_type,
-            df_all_subject_results=df_all_subject_results,
+            file_names=file_names,
+            options={
+                "distance_step": config.processing.distance_step,
+                "band_percentiles": config.processing.band_percentiles,
+            },
+        )
+        image = figure_cache.get_or_render(
+            key,
+            lambda: plot_distance_bands_by_type(
+                config,
+                df_bands=get_df_bands(),
+                velocity=velocity,
+                experiment_type=experiment_type,
+            ),
         )
-        st.pyplot(fig)
+        st.image(image)
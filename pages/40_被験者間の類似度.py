@@ -0,0 +1,74 @@
+import datetime
+import warnings
+
+import plotly.express as px
+import streamlit as st
+
+from config import Config
+from src.app_data import AppData
+from src.dtw import DtwMatrixBuilder, cluster_order
+
+warnings.simplefilter("ignore")
+
+config = Config()
+
+app_data = AppData(config)
+simout_list = app_data.get_simout_list()
+
+with st.sidebar:
+    to_log_file = st.radio(
+        label="ログファイルを出力しますか",
+        options=("はい", "いいえ"),
+        index=1,
+        horizontal=True,
+    )
+    velocity = st.radio(
+        label="速度を選択してください", options=[60], index=0, horizontal=True
+    )
+    experiment_type = st.radio(
+        label="実験条件（コース）を選択してください",
+        options=["A", "B"],
+        index=0,
+        horizontal=True,
+    )
+
+current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+log_file_name = f"{current_time}_dtw.txt"
+log_file_path = (
+    config.paths.file_manager.get_log_path(log_file_name)
+    if to_log_file == "はい"
+    else None
+)
+
+logger = config.logging.setting_log(log_file_path)
+
+# DTWに使う列だけを読み込む（読み込み済みのものは再利用する）
+subject_managers = app_data.get_subject_managers(
+    list(range(1, 11)), columns=config.processing.dtw_channels
+)
+
+# 保存済みの距離行列があれば再利用する
+dtw_matrix_builder = DtwMatrixBuilder(config, logger)
+df_dtw = dtw_matrix_builder.get_matrix(
+    subject_managers, velocity=velocity, experiment_type=experiment_type
+)
+
+st.title("被験者間の運転の類似度（DTW距離）")
+st.text(
+    f"比較する列: {', '.join(config.processing.dtw_channels)}"
+    f"（{config.processing.dtw_downsample}サンプルごとに平均）"
+)
+
+# 似ている被験者が隣り合うように並べ替える
+order = [df_dtw.index[i] for i in cluster_order(df_dtw.to_numpy())]
+df_dtw_sorted = df_dtw.loc[order, order]
+fig = px.imshow(
+    df_dtw_sorted,
+    x=[str(id) for id in order],
+    y=[str(id) for id in order],
+    labels=dict(x="Subject ID", y="Subject ID", color="DTW distance"),
+    color_continuous_scale="viridis",
+)
+st.plotly_chart(fig)
+st.dataframe(df_dtw_sorted)
@@ -0,0 +1,26 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfConditionedSchema(BaseModel):
+    ego_a_filtered: str = "ego_a_filtered"  # フィルタ後の加速度
+    ego_v_filtered: str = "ego_v_filtered"
+    Gas_Out_filtered: str = "Gas_Out_filtered"
+    Brake_Out_filtered: str = "Brake_Out_filtered"
+    ego_jerk: str = "ego_jerk"  # 加加速度[m/s^3]
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
@@ -0,0 +1,29 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfDistanceBandSchema(BaseModel):
+    experiment_condition: str = "experiment_condition"
+    velocity: str = "velocity"  # 実験の設定速度（ファイル名の値）
+    channel: str = "channel"  # 信号（DfSimoutSchemaの変数名）
+    distance: str = "distance"  # 累積走行距離[m]
+    mean: str = "mean"
+    lower: str = "lower"  # 下側パーセンタイル
+    upper: str = "upper"  # 上側パーセンタイル
+    n_files: str = "n_files"  # その距離まで走行した実験データの数
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
@@ -0,0 +1,26 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfDistanceProfileSchema(BaseModel):
+    distance: str = "distance"  # 累積走行距離[m]
+    ego_v: str = "ego_v"
+    ego_a: str = "ego_a"
+    Brake_Out: str = "Brake_Out"
+    Gas_Out: str = "Gas_Out"
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
@@ -0,0 +1,30 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfEventSchema(BaseModel):
+    simout_file: str = "simout_file"
+    experiment_condition: str = "experiment_condition"
+    event_type: str = "event_type"
+    start_index: str = "start_index"
+    end_index: str = "end_index"  # イベントの最後の行（この行を含む）
+    start_time: str = "start_time"
+    end_time: str = "end_time"
+    duration: str = "duration"
+    value: str = "value"  # イベントごとの代表値（最大減速度など）
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
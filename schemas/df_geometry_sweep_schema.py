@@ -0,0 +1,33 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfGeometrySweepSchema(BaseModel):
+    parameter_set: str = "parameter_set"  # 寸法の組み合わせの番号
+    Ego_l: str = "Ego_l"
+    PoI_y: str = "PoI_y"
+    Ego_w: str = "Ego_w"
+    simout_file: str = "simout_file"
+    experiment_condition: str = "experiment_condition"
+    swept_x_min: str = "swept_x_min"  # 全時刻の4つの角のx座標の最小値
+    swept_x_max: str = "swept_x_max"  # 全時刻の4つの角のx座標の最大値
+    swept_y_min: str = "swept_y_min"  # 全時刻の4つの角のy座標の最小値
+    swept_y_max: str = "swept_y_max"  # 全時刻の4つの角のy座標の最大値
+    min_gap: str = "min_gap"  # 自車左前端と対象物の最短距離
+    min_gap_time: str = "min_gap_time"  # 最短距離になった時刻
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
@@ -0,0 +1,26 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfInteractionSchema(BaseModel):
+    time: str = "time"
+    box_gap: str = "box_gap"  # 自車と対象車両の矩形間の距離
+    overlap: str = "overlap"  # 矩形が重なっているか
+    closing_speed: str = "closing_speed"  # 接近速度（近づく場合に正）
+    ttc: str = "ttc"  # 衝突余裕時間
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
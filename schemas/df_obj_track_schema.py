@@ -0,0 +1,25 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfObjTrackSchema(BaseModel):
+    time: str = "time"
+    obj_x: str = "obj_x"  # 対象車両の基準点のx座標
+    obj_y: str = "obj_y"  # 対象車両の基準点のy座標
+    obj_psi: str = "obj_psi"  # 対象車両のヨー角
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
@@ -5,6 +5,12 @@ from pydantic import BaseModel
 class DfProcessedSchema(BaseModel):
     Ego_front_left_x: str = "Ego_front_left_x"
     Ego_front_left_y: str = "Ego_front_left_y"
+    Ego_rear_left_x: str = "Ego_rear_left_x"
+    Ego_rear_left_y: str = "Ego_rear_left_y"
+    Ego_rear_right_x: str = "Ego_rear_right_x"
+    Ego_rear_right_y: str = "Ego_rear_right_y"
+    Ego_front_right_x: str = "Ego_front_right_x"
+    Ego_front_right_y: str = "Ego_front_right_y"
     Velocity_times_dt: str = "Velocity_times_dt"
     Brake_Out_times_dt: str = "Brake_Out_times_dt"  # ブレーキ積分
     Gas_Out_times_dt: str = "Gas_Out_times_dt"  # アクセル積分
@@ -10,6 +10,24 @@ class DfResultSchema(BaseModel):
     total_mileage: str = "total_mileage"
     Brake_Out_sum: str = "Brake_Out_sum"
     Gas_Out_sum: str = "Gas_Out_sum"
+    velocity_std: str = "velocity_std"  # 速度の標準偏差
+    velocity_p05: str = "velocity_p05"  # 速度の5パーセンタイル
+    velocity_p50: str = "velocity_p50"  # 速度の中央値
+    velocity_p95: str = "velocity_p95"  # 速度の95パーセンタイル
+    peak_deceleration: str = "peak_deceleration"  # 最大減速度
+    peak_jerk: str = "peak_jerk"  # 加加速度の絶対値の最大値（信号の前処理を行う場合）
+    min_gap: str = "min_gap"  # 自車左前端と対象物の最短距離
+    min_gap_time: str = "min_gap_time"  # 最短距離になった時刻
+    Gas_Out_dominant_frequency: str = "Gas_Out_dominant_frequency"  # 卓越周波数
+    Gas_Out_band_power: str = "Gas_Out_band_power"  # 帯域パワー
+    Brake_Out_dominant_frequency: str = "Brake_Out_dominant_frequency"
+    Brake_Out_band_power: str = "Brake_Out_band_power"
+    ego_a_dominant_frequency: str = "ego_a_dominant_frequency"
+    ego_a_band_power: str = "ego_a_band_power"
+    Gas_Out_lag: str = "Gas_Out_lag"  # アクセルから加速度までの遅れ時間[s]
+    Gas_Out_lag_correlation: str = "Gas_Out_lag_correlation"  # 相関のピーク
+    Brake_Out_lag: str = "Brake_Out_lag"  # ブレーキから加速度までの遅れ時間[s]
+    Brake_Out_lag_correlation: str = "Brake_Out_lag_correlation"
 
     experiment_number: str = "experiment_number"
     subject_id: str = "subject_id"
@@ -0,0 +1,35 @@
+import pandas as pd
+from pydantic import BaseModel
+
+
+class DfWindowFeatureSchema(BaseModel):
+    simout_file: str = "simout_file"
+    window_start_time: str = "window_start_time"
+    window_end_time: str = "window_end_time"
+    velocity_mean: str = "velocity_mean"  # 窓内の平均速度
+    velocity_var: str = "velocity_var"  # 窓内の速度の分散
+    jerk_rms: str = "jerk_rms"  # 加加速度の二乗平均平方根
+    Gas_Out_rate: str = "Gas_Out_rate"  # アクセルを踏み込む速さ（増加分のみ）の平均
+    Brake_Out_rate: str = "Brake_Out_rate"  # ブレーキを踏み込む速さ（増加分のみ）の平均
+    brake_gas_overlap: str = (
+        "brake_gas_overlap"  # ブレーキとアクセルを同時に踏んでいる割合
+    )
+
+    experiment_number: str = "experiment_number"
+    subject_id: str = "subject_id"
+
+    @classmethod
+    def get_column_map(cls) -> dict:
+        """変数名 → 実際のカラム名 のマッピングを取得"""
+        return cls().dict()
+
+    @classmethod
+    def rename_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrameの列名をスキーマに基づいてリネーム"""
+        return df.rename(columns=cls.get_column_map())
+
+    @classmethod
+    def validate_dataframe(cls, df: pd.DataFrame) -> bool:
+        """DataFrame のカラム名がスキーマと一致しているかチェック"""
+        expected_columns = set(cls.get_column_map().values())  # 実際のカラム名
+        return set(df.columns) == expected_columns
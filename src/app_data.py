@@ -0,0 +1,258 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.simout_cache import get_simout_cache
+from src.subject_manager import SubjectManager
+
+
+def estimate_nbytes(value, _seen: set | None = None) -> int:
+    """
+    オブジェクトが保持するデータのおおよそのバイト数（DataFrameと配列を中心に数える）
+
+    Args:
+        value: 対象のオブジェクト
+    Returns:
+        nbytes (int): バイト数
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return sum(estimate_nbytes(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return estimate_nbytes(vars(value), seen)
+    return 0
+
+
+class LruCache:
+    """
+    合計バイト数に上限を持つLRUキャッシュ（複数のセッションのスレッドから使われるためロックする）。
+    値は名前ごとに1つだけ保持し、入力ファイルの状態（フィンガープリント）が変わっていれば破棄する。
+
+    Attributes:
+        max_bytes (int): 保持する値の合計バイト数の上限
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes: int = max_bytes
+        self.total_bytes: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, fingerprint):
+        """
+        キャッシュされた値を取得
+
+        Args:
+            name: 値の名前（ハッシュ可能なもの）
+            fingerprint: 入力ファイルの状態
+        Returns:
+            value: 値。無い、または入力が変わっている場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != fingerprint:
+                return None
+            self._entries.move_to_end(name)
+            return entry[1]
+
+    def put(self, name, fingerprint, value):
+        """
+        値を保持する（上限を超えた分は使われていない順に削除する）
+
+        Args:
+            name: 値の名前（ハッシュ可能なもの）
+            fingerprint: 入力ファイルの状態
+            value: 値
+        """
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            self._discard(name)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[name] = (fingerprint, value, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def get_or_load(self, name, fingerprint, loader):
+        """
+        キャッシュされた値を取得（無い、または入力が変わっている場合はloaderで読み込む）
+
+        Args:
+            name: 値の名前（ハッシュ可能なもの）
+            fingerprint: 入力ファイルの状態（変わった場合は読み込み直す）
+            loader (Callable): 値を読み込む関数
+        Returns:
+            value: 値
+        """
+        value = self.get(name, fingerprint)
+        if value is None:
+            # 読み込み中は他のセッションを待たせない（同じ値を同時に読み込んだ場合は後勝ち）
+            value = loader()
+            self.put(name, fingerprint, value)
+        return value
+
+    def clear(self):
+        """全て削除"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+
+# Streamlitは再実行のたびにページのスクリプトを実行し直すが、importしたモジュールは
+# サーバーのプロセス内で保持されるため、キャッシュは再実行・セッションをまたいで共有される
+_shared_cache: LruCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache(max_bytes: int) -> LruCache:
+    """プロセスで共有するキャッシュ（上限が変わった場合は上限だけ更新する）"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LruCache(max_bytes)
+        _shared_cache.max_bytes = max_bytes
+        return _shared_cache
+
+
+class AppData:
+    """
+    ダッシュボードの各ページが使うデータ（simoutのファイル一覧、被験者ごとの生データ、
+    全被験者の結果）を読み込み、プロセスで共有するキャッシュに保持する。
+    キャッシュは入力ファイルのサイズ・更新時刻で無効化し、合計バイト数の上限を超えた場合は
+    使われていない順に削除する。返す値はキャッシュと共有されるため、変更しないこと。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        cache (LruCache): 読み込み結果のキャッシュ
+    """
+
+    def __init__(self, config: Config, cache: LruCache | None = None):
+        self.config: Config = config
+        self.cache: LruCache = (
+            cache
+            if cache is not None
+            else get_shared_cache(config.dashboard.data_cache_max_bytes)
+        )
+
+    def get_simout_list(self) -> list[str]:
+        """
+        simoutのCSVのファイル名のリスト（フォルダの更新時刻が変わった場合は取得し直す）
+
+        Returns:
+            simout_list (list[str]): ファイル名のリスト（昇順）
+        """
+        folder = self.config.paths.folder_path_model.path_folder_simout
+        return self.cache.get_or_load(
+            ("simout_list", str(Path(folder).resolve())),
+            self._get_fingerprint(folder),
+            lambda: [
+                file
+                for file in self.config.paths.file_manager.get_simout_file_names()
+                if ".csv" in file
+            ],
+        )
+
+    def get_results(self) -> pd.DataFrame | None:
+        """
+        全被験者の結果（all_subjects_results.csv）
+
+        Returns:
+            df_all_subject_results (pd.DataFrame | None): 結果。ファイルが無い場合はNone
+        """
+        path = self.config.paths.file_path_model.all_subjects_results
+        if not os.path.exists(path):
+            return None
+        return self.cache.get_or_load(
+            ("results", str(Path(path).resolve())),
+            self._get_fingerprint(path),
+            lambda: pd.read_csv(path),
+        )
+
+    def get_subject_manager(
+        self, id: int, columns: list[str] | None = None
+    ) -> SubjectManager:
+        """
+        生データを読み込んだSubjectManager
+
+        Args:
+            id (int): 被験者ID
+            columns (list[str], optional): 読み込む列（DfSimoutSchemaの変数名）。Noneの場合は全列
+        Returns:
+            subject_manager (SubjectManager): 生データを読み込んだSubjectManager
+        """
+        simout_list = self.get_simout_list()
+        file_names, _ = SubjectManager.extract_subject_raw_file_names_and_type(
+            simout_list, id
+        )
+        file_manager = self.config.paths.file_manager
+        fingerprint = (
+            tuple(
+                self._get_fingerprint(file_manager.get_simout_path(file_name))
+                for file_name in file_names.values()
+            ),
+            # 前処理した列も読み込まれるため、前処理の設定も含める
+            repr(self._get_conditioning_settings()),
+        )
+
+        def load() -> SubjectManager:
+            subject_manager = SubjectManager(id, simout_list)
+            subject_manager.load_raw_data(config=self.config, columns=columns)
+            return subject_manager
+
+        return self.cache.get_or_load(
+            ("subject", id, None if columns is None else tuple(columns)),
+            fingerprint,
+            load,
+        )
+
+    def get_subject_managers(
+        self, ids: list[int], columns: list[str] | None = None
+    ) -> dict[int, SubjectManager]:
+        """
+        複数の被験者のSubjectManager
+
+        Args:
+            ids (list[int]): 被験者IDのリスト
+            columns (list[str], optional): 読み込む列（DfSimoutSchemaの変数名）。Noneの場合は全列
+        Returns:
+            subject_managers (dict[int, SubjectManager]): 被験者ID → SubjectManager
+        """
+        return {id: self.get_subject_manager(id, columns) for id in ids}
+
+    def _get_conditioning_settings(self) -> dict | None:
+        """前処理を行う場合はその設定（行わない場合はNone）"""
+        simout_cache = get_simout_cache(self.config)
+        if not simout_cache.is_conditioning():
+            return None
+        return simout_cache.conditioner.get_settings()
+
+    @staticmethod
+    def _get_fingerprint(path: Path) -> tuple[int, int]:
+        """ファイル・フォルダの状態（サイズ、更新時刻）"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,148 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_result_schema import DfResultSchema
+from src.signal_conditioning import SignalConditioner
+from src.simout_arrays import SimoutArrays
+
+
+class BatchMetricEngine:
+    """
+    複数の実験データを1本の配列に連結し、区間ごとの集約（np.add.reduceat など）で
+    全実験の指標をまとめて計算する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_result_columns = DfResultSchema()
+        self.signal_conditioner = SignalConditioner(config.processing)
+
+    def load(
+        self, file_names: list[str], columns: list[str]
+    ) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        実験データの指定した列を連結して読み込む
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+            columns (list[str]): 読み込む列（DfSimoutSchema・DfConditionedSchemaの変数名またはカラム名）
+        Returns:
+            buffers (dict[str, np.ndarray]): columnsの要素 → 全実験を連結した配列
+            offsets (np.ndarray): 各実験の先頭のインデックス（長さは実験数+1）
+        """
+        arrays_list = [
+            SimoutArrays.open(file_name, self.config) for file_name in file_names
+        ]
+        lengths = np.array([len(arrays) for arrays in arrays_list], dtype=np.int64)
+        if (lengths < 2).any():
+            short_files = [f for f, n in zip(file_names, lengths) if n < 2]
+            raise ValueError(f"行数が不足している実験データがあります: {short_files}")
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        buffers = {
+            column: np.concatenate([arrays[column] for arrays in arrays_list])
+            for column in columns
+        }
+        return buffers, offsets
+
+    def compute(
+        self, file_names: list[str], distribution_metrics: bool = False
+    ) -> pd.DataFrame:
+        """
+        全実験の指標をまとめて計算
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+            distribution_metrics (bool): Trueの場合は速度の標準偏差・パーセンタイル、最大減速度も計算
+        Returns:
+            df_metrics (pd.DataFrame): 実験ごとの指標（simout_file列を含む）
+        """
+        columns = ["time", "ego_v", "Gas_Out", "Brake_Out"]
+        # 前処理を行う設定の場合、最大減速度はフィルタ後の加速度から求める
+        acceleration_column = self.signal_conditioner.get_column("ego_a")
+        if distribution_metrics:
+            columns.append(acceleration_column)
+        if self.signal_conditioner.enabled:
+            columns.append("ego_jerk")
+        self.logger.debug(f"{len(file_names)} 件の実験データの指標をまとめて計算します")
+        buffers, offsets = self.load(file_names, columns)
+        starts = offsets[:-1]
+        lengths = np.diff(offsets)
+
+        time = buffers["time"]
+        velocity = buffers["ego_v"]
+        dt = time[starts + 1] - time[starts]
+        average_velocity = np.add.reduceat(velocity, starts) / lengths
+        total_mileage = np.add.reduceat(np.abs(velocity), starts) * dt
+        Brake_Out_sum = np.add.reduceat(buffers["Brake_Out"], starts) * dt
+        Gas_Out_sum = np.add.reduceat(buffers["Gas_Out"], starts) * dt
+
+        df_metrics = pd.DataFrame(
+            {
+                self.df_result_columns.simout_file: file_names,
+                self.df_result_columns.average_velocity: average_velocity,
+                self.df_result_columns.total_mileage: total_mileage,
+                self.df_result_columns.Brake_Out_sum: Brake_Out_sum,
+                self.df_result_columns.Gas_Out_sum: Gas_Out_sum,
+            }
+        )
+        if distribution_metrics:
+            distribution_dict = self._compute_distribution_metrics(
+                velocity, buffers[acceleration_column], average_velocity, offsets
+            )
+            for column, values in distribution_dict.items():
+                df_metrics[column] = values
+        if self.signal_conditioner.enabled:
+            df_metrics[self.df_result_columns.peak_jerk] = np.maximum.reduceat(
+                np.abs(buffers["ego_jerk"]), starts
+            )
+        return df_metrics
+
+    def _compute_distribution_metrics(
+        self,
+        velocity: np.ndarray,
+        acceleration: np.ndarray,
+        average_velocity: np.ndarray,
+        offsets: np.ndarray,
+    ) -> dict:
+        """
+        速度の標準偏差・パーセンタイル、最大減速度を区間ごとに計算
+
+        Returns:
+            distribution_dict (dict): カラム名 → 実験ごとの値
+        """
+        starts = offsets[:-1]
+        lengths = np.diff(offsets)
+        segment_ids = np.repeat(np.arange(len(lengths)), lengths)
+
+        deviation = velocity - average_velocity[segment_ids]
+        velocity_std = np.sqrt(np.add.reduceat(deviation**2, starts) / lengths)
+
+        # 区間ごとに昇順に並べ、np.percentile(method="linear")と同じ補間で求める
+        sorted_velocity = velocity[np.lexsort((velocity, segment_ids))]
+        percentile_columns = {
+            5: self.df_result_columns.velocity_p05,
+            50: self.df_result_columns.velocity_p50,
+            95: self.df_result_columns.velocity_p95,
+        }
+        distribution_dict = {self.df_result_columns.velocity_std: velocity_std}
+        for percentile, column in percentile_columns.items():
+            position = starts + percentile / 100 * (lengths - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, offsets[1:] - 1)
+            weight = position - lower
+            distribution_dict[column] = (
+                sorted_velocity[lower] * (1 - weight) + sorted_velocity[upper] * weight
+            )
+
+        # 減速度は正の値で表す
+        peak_deceleration = -np.minimum.reduceat(acceleration, starts)
+        distribution_dict[self.df_result_columns.peak_deceleration] = peak_deceleration
+        return distribution_dict
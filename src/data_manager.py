@@ -1,12 +1,37 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import pandas as pd
 
 from config import Config
+from schemas.df_result_schema import DfResultSchema
+from src.batch_metric_engine import BatchMetricEngine
+from src.lag_estimator import LagEstimator
 from src.master_data_manager import MasterDataManager
+from src.processing_manifest import ProcessingManifest
+from src.spectral_analyzer import SpectralAnalyzer
 from src.subject_processor import SubjectProcessor
 
 
+def process_subject(subject: dict, config: Config) -> pd.DataFrame:
+    """
+    1人の被験者のデータ処理と保存を行う（プロセスプールから呼び出すためモジュール関数にしている）
+
+    Args:
+        subject (dict): 被験者情報
+        config (Config): 設定オブジェクト
+    Returns:
+        df_index_subject (pd.DataFrame): 被験者の全実験の結果
+    """
+    logger = logging.getLogger()
+    subject_processor = SubjectProcessor(
+        subject_info=subject, config=config, logger=logger
+    )
+    df_index_subject = subject_processor.process()
+    subject_processor.save_results(df_index_subject)
+    return df_index_subject
+
+
 class DataManager:
     """
     全被験者のデータを管理し、最終的なCSV出力を行う
@@ -23,6 +48,7 @@ class DataManager:
             master_file_path, logger
         )
         self.subject_processors: list[SubjectProcessor] = []
+        self.df_result_columns = DfResultSchema()
 
     def load_data(self) -> list[dict]:
         """
@@ -52,24 +78,71 @@ class DataManager:
         df_index_all_subjects = None
         try:
             self.logger.debug("全被験者のデータ処理を開始します")
+            subjects = []
             for subject in subjects_data:
-                subject_id = subject.get("subject_id")
-                if not subject_id:
+                if not subject.get("subject_id"):
                     self.logger.warning("被験者IDが存在しないレコードをスキップします")
                     continue
-                subject_processor = SubjectProcessor(
-                    subject_info=subject, config=self.config, logger=self.logger
+                subjects.append(subject)
+
+            df_index_subjects = [None] * len(subjects)
+            manifest = None
+            fingerprints = {}
+            if self.config.processing.incremental:
+                manifest = ProcessingManifest(
+                    self.config.paths.file_path_model.processing_manifest,
+                    config=self.config,
+                    logger=self.logger,
                 )
-                df_index_subject = subject_processor.process()
-                subject_processor.save_metrics(df_index_subject)
-                self.subject_processors.append(subject_processor)
+                for i, subject in enumerate(subjects):
+                    fingerprints[i] = manifest.compute_fingerprint(subject)
+                    result_path = self._get_subject_result_path(subject)
+                    if manifest.is_up_to_date(
+                        subject.get("subject_id"), fingerprints[i], result_path
+                    ):
+                        df_index_subjects[i] = pd.read_csv(
+                            result_path, float_precision="round_trip"
+                        )
+                self.logger.info(
+                    f"{sum(df is not None for df in df_index_subjects)}/{len(subjects)}"
+                    " 件の被験者は入力に変更がないため前回の結果を使用します"
+                )
+
+            pending = [i for i, df in enumerate(df_index_subjects) if df is None]
+            pending_subjects = [subjects[i] for i in pending]
+            n_workers = self.config.processing.n_workers
+            if self.config.processing.batch_engine and pending_subjects:
+                df_index_pending = self._process_batch(pending_subjects)
+            elif n_workers > 1 and len(pending_subjects) > 1:
+                df_index_pending = self._process_parallel(pending_subjects, n_workers)
+            else:
+                df_index_pending = self._process_sequential(pending_subjects)
+            for i, df_index_subject in zip(pending, df_index_pending):
+                df_index_subjects[i] = df_index_subject
+                if manifest is not None:
+                    manifest.update(
+                        subjects[i].get("subject_id"),
+                        fingerprints[i],
+                        self._get_subject_result_path(subjects[i]),
+                    )
+            if manifest is not None:
+                manifest.save()
+
+            # 出力の行順はマスターファイルの順に揃える
+            for subject, df_index_subject in zip(subjects, df_index_subjects):
                 if df_index_all_subjects is not None:
                     df_index_all_subjects = pd.concat(
                         [df_index_all_subjects, df_index_subject], ignore_index=True
                     )
                 else:
                     df_index_all_subjects = df_index_subject
-                self.logger.debug(f"被験者 '{subject_id}' の指標を追加しました")
+                self.logger.debug(
+                    f"被験者 '{subject.get('subject_id')}' の指標を追加しました"
+                )
+            if self.config.processing.spectral_metrics:
+                df_index_all_subjects = self._join_spectral_metrics(
+                    df_index_all_subjects
+                )
             self.logger.debug("全被験者のデータ処理が完了しました")
             self.df_index_all_subjects = df_index_all_subjects
             return df_index_all_subjects
@@ -77,6 +150,140 @@ class DataManager:
             self.logger.exception("全被験者のデータ処理中にエラーが発生しました")
             raise
 
+    def _join_spectral_metrics(self, df_index_all_subjects: pd.DataFrame):
+        """
+        全実験のPSDの要約値をまとめて計算（保存済みのものは再利用）し、結果に結合
+
+        Args:
+            df_index_all_subjects (pd.DataFrame): 全被験者の結果
+        Returns:
+            df_index_all_subjects (pd.DataFrame): PSDの要約値の列を追加した結果
+        """
+        spectral_analyzer = SpectralAnalyzer(self.config, self.logger)
+        df_spectral = spectral_analyzer.get_summary(
+            df_index_all_subjects[self.df_result_columns.simout_file].tolist()
+        )
+        return df_index_all_subjects.merge(
+            df_spectral.drop_duplicates(self.df_result_columns.simout_file),
+            on=self.df_result_columns.simout_file,
+            how="left",
+        )
+
+    def _get_subject_result_path(self, subject: dict):
+        """被験者の結果ファイルのパス"""
+        file_name = SubjectProcessor.make_result_file_name(
+            subject.get("experiment_date"), subject.get("subject_id")
+        )
+        return self.config.paths.file_manager.get_subject_results_path(file_name)
+
+    def _process_sequential(self, subjects: list[dict]) -> list[pd.DataFrame]:
+        """
+        被験者ごとのデータ処理を1人ずつ行う。
+
+        Args:
+            subjects (list[dict]): 被験者情報リスト
+        Returns:
+            df_index_subjects (list[pd.DataFrame]): 被験者ごとの結果（入力と同じ順）
+        """
+        df_index_subjects = []
+        for i, subject in enumerate(subjects, start=1):
+            subject_processor = SubjectProcessor(
+                subject_info=subject, config=self.config, logger=self.logger
+            )
+            df_index_subject = subject_processor.process()
+            subject_processor.save_results(df_index_subject)
+            self.subject_processors.append(subject_processor)
+            df_index_subjects.append(df_index_subject)
+            self.logger.info(
+                f"被験者 '{subject.get('subject_id')}' の処理が完了しました"
+                f" ({i}/{len(subjects)})"
+            )
+        return df_index_subjects
+
+    def _process_batch(self, subjects: list[dict]) -> list[pd.DataFrame]:
+        """
+        全被験者の全実験の指標をBatchMetricEngineでまとめて計算する。
+
+        Args:
+            subjects (list[dict]): 被験者情報リスト
+        Returns:
+            df_index_subjects (list[pd.DataFrame]): 被験者ごとの結果（入力と同じ順）
+        """
+        subject_processors = [
+            SubjectProcessor(
+                subject_info=subject, config=self.config, logger=self.logger
+            )
+            for subject in subjects
+        ]
+        file_names = list(
+            dict.fromkeys(
+                processor.file_name
+                for subject_processor in subject_processors
+                for processor in subject_processor.experiment_processors
+            )
+        )
+        batch_metric_engine = BatchMetricEngine(self.config, self.logger)
+        df_metrics = batch_metric_engine.compute(
+            file_names,
+            distribution_metrics=self.config.processing.distribution_metrics,
+        )
+        if self.config.processing.lag_metrics:
+            # 長さが同じ実験データの相互相関をまとめて計算する
+            lag_estimator = LagEstimator(self.config, self.logger)
+            df_metrics = df_metrics.merge(
+                lag_estimator.estimate_files(file_names),
+                on=self.df_result_columns.simout_file,
+            )
+        df_metrics = df_metrics.set_index(self.df_result_columns.simout_file)
+
+        df_index_subjects = []
+        for i, subject_processor in enumerate(subject_processors, start=1):
+            df_index_subject = subject_processor.process(df_metrics=df_metrics)
+            subject_processor.save_results(df_index_subject)
+            self.subject_processors.append(subject_processor)
+            df_index_subjects.append(df_index_subject)
+            self.logger.info(
+                f"被験者 '{subject_processor.subject_id}' の処理が完了しました"
+                f" ({i}/{len(subjects)})"
+            )
+        return df_index_subjects
+
+    def _process_parallel(
+        self, subjects: list[dict], n_workers: int
+    ) -> list[pd.DataFrame]:
+        """
+        被験者ごとのデータ処理をプロセスプールで並列に行う。
+        各プロセスのSubjectProcessorは返さないため、self.subject_processorsには追加されない。
+
+        Args:
+            subjects (list[dict]): 被験者情報リスト
+            n_workers (int): プロセス数
+        Returns:
+            df_index_subjects (list[pd.DataFrame]): 被験者ごとの結果（入力と同じ順）
+        """
+        self.logger.info(f"{n_workers} プロセスで被験者のデータ処理を行います")
+        df_index_subjects = [None] * len(subjects)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                executor.submit(process_subject, subject, self.config): i
+                for i, subject in enumerate(subjects)
+            }
+            for n_done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                subject_id = subjects[i].get("subject_id")
+                try:
+                    df_index_subjects[i] = future.result()
+                except Exception as e:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise RuntimeError(
+                        f"被験者 '{subject_id}' のデータ処理中にエラーが発生しました: {e}"
+                    ) from e
+                self.logger.info(
+                    f"被験者 '{subject_id}' の処理が完了しました"
+                    f" ({n_done}/{len(subjects)})"
+                )
+        return df_index_subjects
+
     def save_metrics(self, df: pd.DataFrame):
         """
         全被験者の指標データをcsv出力。
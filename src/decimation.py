@@ -0,0 +1,117 @@
+import numpy as np
+
+DECIMATION_METHODS = ("minmax", "lttb")
+
+
+def minmax_indices(values: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    区間（バケット）ごとの最小値と最大値のサンプルを選ぶ。
+    値の極値は必ず残るため、ブレーキのスパイクのような短いピークも消えない。
+
+    Args:
+        values (np.ndarray): 値 (n,) または (n, k)。(n, k)の場合は列ごとの極値を全て残す
+        n_points (int): 選ぶ点の数の目安（1列あたりバケット数の2倍）
+    Returns:
+        indices (np.ndarray): 選んだサンプルのインデックス（昇順、先頭と末尾を含む）
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values.reshape(len(values), -1)
+    n, k = values.shape
+    n_buckets = max(n_points // (2 * k), 1)
+    bucket_size = -(-n // n_buckets)
+    n_buckets = -(-n // bucket_size)
+    # 末尾のバケットの不足分をNaNで埋めて (バケット数, バケットの長さ, k) に並べ替える
+    padded = np.full((n_buckets * bucket_size, k), np.nan)
+    padded[:n] = values
+    padded = padded.reshape(n_buckets, bucket_size, k)
+    # 全てNaNの区間でもエラーにならないように、NaNを±infに置き換えてから探す
+    offsets = np.arange(n_buckets)[:, None] * bucket_size
+    argmin = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1) + offsets
+    argmax = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1) + offsets
+    indices = np.concatenate([[0, n - 1], argmin.ravel(), argmax.ravel()])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets法で、見た目の形を保つサンプルを選ぶ。
+    各バケットから、直前に選んだ点と次のバケットの平均点とで作る三角形の面積が
+    最大になる点を1つ選ぶ。全体の最大値・最小値の点も必ず残す。
+
+    Args:
+        x (np.ndarray): 昇順の横軸の値 (n,)
+        y (np.ndarray): 値 (n,)
+        n_points (int): 選ぶ点の数（先頭と末尾を含む、3以上）
+    Returns:
+        indices (np.ndarray): 選んだサンプルのインデックス（昇順）
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= max(n_points, 3):
+        return np.arange(n)
+    # 先頭と末尾を除いたサンプルを n_points-2 個のバケットに分ける
+    n_buckets = max(n_points - 2, 1)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    edges = np.unique(edges)
+    n_buckets = len(edges) - 1
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    # 各バケットの平均点（最後のバケットの次は末尾の点）
+    mean_x = np.append(np.add.reduceat(x[:-1], starts) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], starts) / counts, y[-1])
+
+    indices = np.empty(n_buckets + 2, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    selected = 0
+    for i in range(n_buckets):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[selected] - mean_x[i + 1]) * (y[lo:hi] - y[selected])
+            - (x[selected] - x[lo:hi]) * (mean_y[i + 1] - y[selected])
+        )
+        selected = lo + int(np.argmax(area))
+        indices[i + 1] = selected
+    extremes = [int(np.nanargmin(y)), int(np.nanargmax(y))] if n else []
+    return np.unique(np.concatenate([indices, extremes]))
+
+
+def decimate(
+    x: np.ndarray, y: np.ndarray, n_points: int, method: str = "minmax"
+) -> np.ndarray:
+    """
+    描画する点の数がn_points程度になるようにサンプルを選ぶ（少ない場合は全て選ぶ）
+
+    Args:
+        x (np.ndarray): 昇順の横軸の値（時刻など） (n,)
+        y (np.ndarray): 値 (n,)
+        n_points (int): 1つのトレースで描画する点の数の上限の目安
+        method (str): "minmax"（バケットごとの最小・最大）または "lttb"
+    Returns:
+        indices (np.ndarray): 選んだサンプルのインデックス（昇順）
+    """
+    n = len(y)
+    if n <= n_points:
+        return np.arange(n)
+    if method == "minmax":
+        return minmax_indices(y, n_points)
+    if method == "lttb":
+        return lttb_indices(x, y, n_points)
+    raise ValueError(f"間引きの方法 '{method}' には対応していません")
+
+
+def select_range(time: np.ndarray, start_time: float, end_time: float) -> slice:
+    """
+    昇順の時刻から、範囲 [start_time, end_time] のサンプルを二分探索で取り出すスライス
+
+    Args:
+        time (np.ndarray): 昇順の時刻
+        start_time (float): 範囲の最初の時刻
+        end_time (float): 範囲の最後の時刻
+    Returns:
+        range_slice (slice): 範囲のサンプルのスライス
+    """
+    start = int(np.searchsorted(time, start_time, side="left"))
+    end = int(np.searchsorted(time, end_time, side="right"))
+    return slice(start, end)
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_distance_band_schema import DfDistanceBandSchema
+from schemas.df_distance_profile_schema import DfDistanceProfileSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_arrays import SimoutArrays
+from src.simout_cache import SimoutCache
+
+
+class DistanceResampler:
+    """
+    各実験データの信号を、累積走行距離を横軸とした等間隔の格子に線形補間する。
+    補間した結果は生データのパス・サイズ・更新時刻と格子の設定をキーとしてファイルに保存し、
+    被験者をまたいだ平均とパーセンタイルの帯を条件（コース・速度）ごとに計算する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # 補間する信号（DfSimoutSchemaの変数名）
+    CHANNELS = ["ego_v", "ego_a", "Brake_Out", "Gas_Out"]
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_simout_columns = DfSimoutSchema()
+        self.df_profile_columns = DfDistanceProfileSchema()
+        self.df_band_columns = DfDistanceBandSchema()
+        self.cache_dir = config.paths.folder_path_model.path_folder_distance_cache
+
+    def resample(self, arrays) -> pd.DataFrame:
+        """
+        信号を距離の格子に補間（格子は0mからdistance_step間隔で、全ファイルで共通）
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+        Returns:
+            df_profile (pd.DataFrame): 距離ごとの信号
+        """
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        velocity = np.asarray(arrays[self.df_simout_columns.ego_v])
+        dt = time[1] - time[0]
+        # add_mileage_columnと同じく |v|×dt の累積和を走行距離とする
+        distance = np.cumsum(np.abs(velocity) * dt)
+
+        # 停止中は距離が増えないため、距離が増えたサンプルだけを補間に使う
+        increasing = np.concatenate([[True], np.diff(distance) > 0])
+        step = self.config.processing.distance_step
+        grid = np.arange(0, distance[-1] + step / 2, step)
+
+        df_profile = pd.DataFrame({self.df_profile_columns.distance: grid})
+        for channel in self.CHANNELS:
+            values = np.asarray(arrays[getattr(self.df_simout_columns, channel)])
+            values = values[increasing]
+            df_profile[getattr(self.df_profile_columns, channel)] = np.interp(
+                grid, distance[increasing], values
+            )
+        return df_profile
+
+    def get_profile(self, file_name: str) -> pd.DataFrame:
+        """
+        1つの実験データの距離ごとの信号を取得（保存された結果が古い場合は補間し直す）
+
+        Args:
+            file_name (str): simoutのファイル名
+        Returns:
+            df_profile (pd.DataFrame): 距離ごとの信号
+        """
+        file_manager = self.config.paths.file_manager
+        profile_path = self.cache_dir / f"{os.path.splitext(file_name)[0]}.npz"
+        key = json.dumps(
+            {
+                "source": SimoutCache.get_source_key(
+                    file_manager.get_simout_path(file_name)
+                ),
+                "distance_step": self.config.processing.distance_step,
+                "channels": self.CHANNELS,
+            },
+            sort_keys=True,
+        )
+        try:
+            with np.load(profile_path) as npz:
+                if str(npz["key"]) == key:
+                    return pd.DataFrame(
+                        {column: npz[column] for column in npz.files if column != "key"}
+                    )
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            pass
+
+        self.logger.debug(f"'{file_name}' を距離の格子に補間します")
+        df_profile = self.resample(SimoutArrays.open(file_name, self.config))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = profile_path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            key=np.array(key),
+            **{column: df_profile[column].to_numpy() for column in df_profile.columns},
+        )
+        os.replace(tmp_path, profile_path)
+        return df_profile
+
+    def aggregate(self, file_names: list[str] | None = None) -> pd.DataFrame:
+        """
+        実験条件（コース）と速度ごとに、距離ごとの平均とパーセンタイルの帯を計算
+
+        Args:
+            file_names (list[str], optional): 対象のファイル名（Noneの場合はsimoutの全CSV）
+        Returns:
+            df_bands (pd.DataFrame): 条件・距離・信号ごとの平均と帯（縦持ち）
+        """
+        if file_names is None:
+            file_names = [
+                file
+                for file in self.config.paths.file_manager.get_simout_file_names()
+                if file.endswith(".csv")
+            ]
+        lower_percentile, upper_percentile = self.config.processing.band_percentiles
+
+        # ファイル名（output_01_60_A_...）の速度と実験条件でまとめる
+        groups: dict[tuple[str, int], list[str]] = {}
+        for file_name in file_names:
+            parts = file_name.split("_")
+            groups.setdefault((parts[3], int(parts[2])), []).append(file_name)
+
+        df_bands_list = []
+        for (experiment_condition, velocity), group_files in sorted(groups.items()):
+            profiles = [self.get_profile(file_name) for file_name in group_files]
+            # 格子は全ファイルで共通なので、短いファイルの後ろをNaNで埋めて揃える
+            n_grid = max(len(df_profile) for df_profile in profiles)
+            distance = np.arange(n_grid) * self.config.processing.distance_step
+            for channel in self.CHANNELS:
+                column = getattr(self.df_profile_columns, channel)
+                stacked = np.full((len(profiles), n_grid), np.nan)
+                for i, df_profile in enumerate(profiles):
+                    stacked[i, : len(df_profile)] = df_profile[column].to_numpy()
+                lower, upper = np.nanpercentile(
+                    stacked, [lower_percentile, upper_percentile], axis=0
+                )
+                df_bands_list.append(
+                    pd.DataFrame(
+                        {
+                            self.df_band_columns.experiment_condition: (
+                                experiment_condition
+                            ),
+                            self.df_band_columns.velocity: velocity,
+                            self.df_band_columns.channel: channel,
+                            self.df_band_columns.distance: distance,
+                            self.df_band_columns.mean: np.nanmean(stacked, axis=0),
+                            self.df_band_columns.lower: lower,
+                            self.df_band_columns.upper: upper,
+                            self.df_band_columns.n_files: (
+                                np.isfinite(stacked).sum(axis=0)
+                            ),
+                        }
+                    )
+                )
+        df_bands = pd.concat(df_bands_list, ignore_index=True)
+        return df_bands
@@ -0,0 +1,212 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_cache import SimoutCache
+
+
+def downsample(series: np.ndarray, factor: int) -> np.ndarray:
+    """
+    factor個ごとの平均で間引く（末尾の半端なサンプルは捨てる）
+
+    Args:
+        series (np.ndarray): 時系列 (n,) または (n, d)
+        factor (int): 間引く間隔
+    Returns:
+        downsampled (np.ndarray): 間引いた時系列
+    """
+    if factor <= 1:
+        return series
+    n = len(series) // factor * factor
+    return series[:n].reshape(n // factor, factor, *series.shape[1:]).mean(axis=1)
+
+
+def dtw_distance(a: np.ndarray, b: np.ndarray, band: int) -> float:
+    """
+    Sakoe-Chiba帯で経路を制限した動的時間伸縮（DTW）距離
+
+    累積コストは反対角線（i + j が一定の要素）ごとにまとめて更新する。同じ反対角線の要素は
+    1つ前と2つ前の反対角線だけに依存するため、各反対角線の帯内の要素を配列演算で計算でき、
+    保持する累積コストも3本の反対角線分で済む。
+
+    Args:
+        a (np.ndarray): 時系列 (n,) または (n, d)
+        b (np.ndarray): 時系列 (m,) または (m, d)
+        band (int): 帯の幅。長さの比で正規化した対角線 i = j×n/m からaの方向にband以内を通る
+    Returns:
+        distance (float): 対応付けた要素間のユークリッド距離の合計の最小値
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(len(a), -1)
+    b = np.asarray(b, dtype=np.float64).reshape(len(b), -1)
+    n, m = len(a), len(b)
+    # 帯が狭すぎると端点まで到達する経路がなくなる
+    band = max(band, -(-n // m), 1)
+
+    # diagonals[k % 3][i] に (i, k - i) の累積コストを持つ（インデックスは1始まり、0は境界）
+    diagonals = np.full((3, n + 1), np.inf)
+    diagonals[0, 0] = 0.0
+    previous_ranges = [(0, 0), (0, 0), (0, 0)]
+    for k in range(2, n + m + 1):
+        # |i - j×n/m| <= band を整数演算で |i×m - j×n| <= band×m として判定する
+        # （j = k - i なので -band×m <= i×(n + m) - k×n <= band×m）
+        i_lo = max(1, k - m, -((band * m - k * n) // (n + m)))
+        i_hi = min(n, k - 1, (k * n + band * m) // (n + m))
+        current = diagonals[k % 3]
+        # 3つ前の反対角線の値を消す
+        stale_lo, stale_hi = previous_ranges[k % 3]
+        current[stale_lo : stale_hi + 1] = np.inf
+        previous_ranges[k % 3] = (i_lo, i_hi)
+        if i_lo > i_hi:
+            continue
+
+        i = np.arange(i_lo, i_hi + 1)
+        j = k - i
+        cost = np.sqrt(((a[i - 1] - b[j - 1]) ** 2).sum(axis=1))
+        previous_1 = diagonals[(k - 1) % 3]
+        previous_2 = diagonals[(k - 2) % 3]
+        current[i_lo : i_hi + 1] = cost + np.minimum(
+            np.minimum(previous_1[i - 1], previous_1[i]), previous_2[i - 1]
+        )
+    return float(diagonals[(n + m) % 3][n])
+
+
+def cluster_order(distance_matrix: np.ndarray) -> list[int]:
+    """
+    群平均法の階層的クラスタリングで、似ているものが隣り合う並び順を求める
+
+    Args:
+        distance_matrix (np.ndarray): 対称な距離行列 (k, k)
+    Returns:
+        order (list[int]): 行・列の並び順
+    """
+    distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+    clusters = [[i] for i in range(len(distance_matrix))]
+    while len(clusters) > 1:
+        best = None
+        for p in range(len(clusters)):
+            for q in range(p + 1, len(clusters)):
+                linkage = distance_matrix[np.ix_(clusters[p], clusters[q])].mean()
+                if best is None or linkage < best[0]:
+                    best = (linkage, p, q)
+        _, p, q = best
+        clusters[p] = clusters[p] + clusters[q]
+        del clusters[q]
+    return clusters[0] if clusters else []
+
+
+class DtwMatrixBuilder:
+    """
+    被験者の速度・ペダル量の時系列について、被験者×被験者のDTW距離行列を計算する。
+    計算した行列は生データのパス・サイズ・更新時刻とDTWの設定をキーとしてファイルに保存し、
+    ダッシュボードから再計算せずに読み込めるようにする。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # DTW距離の計算方法を変更した場合は上げる（保存された行列が計算し直される）
+    VERSION = 2
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_simout_columns = DfSimoutSchema()
+        self.cache_dir = config.paths.folder_path_model.path_folder_dtw_cache
+
+    def get_matrix(
+        self, subject_managers: dict, velocity: int, experiment_type: str
+    ) -> pd.DataFrame:
+        """
+        実験条件（コース）と速度が同じ被験者同士のDTW距離行列を取得
+        （保存された行列が古い場合は計算し直す）
+
+        Args:
+            subject_managers (dict[int, SubjectManager]): 被験者ID → 生データを読み込んだSubjectManager
+            velocity (int): 実験の設定速度
+            experiment_type (str): 実験条件（コース）
+        Returns:
+            df_dtw (pd.DataFrame): 被験者IDを行・列とした距離行列
+        """
+        subject_managers = {
+            id: subject_manager
+            for id, subject_manager in subject_managers.items()
+            if subject_manager.experiment_type == experiment_type
+            and velocity in subject_manager.df_dict
+        }
+        key = {
+            "version": self.VERSION,
+            "sources": {
+                str(id): SimoutCache.get_source_key(
+                    subject_manager.subject_raw_data_path_dict[velocity]
+                )
+                for id, subject_manager in subject_managers.items()
+            },
+            "settings": self._get_settings(),
+        }
+        matrix_path = self.cache_dir / f"{velocity}_{experiment_type}.csv"
+        meta_path = self.cache_dir / f"{velocity}_{experiment_type}.json"
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                if json.load(f) == key and matrix_path.exists():
+                    return pd.read_csv(matrix_path, index_col=0).rename(columns=int)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        self.logger.debug(
+            f"{experiment_type}・{velocity} の被験者間のDTW距離を計算します"
+        )
+        series_dict = {
+            id: self.get_series(subject_manager.df_dict[velocity])
+            for id, subject_manager in subject_managers.items()
+        }
+        df_dtw = self.compute_matrix(series_dict)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        df_dtw.to_csv(matrix_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(key, f, ensure_ascii=False)
+        return df_dtw
+
+    def get_series(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        生データからDTWに使う列を取り出して間引く
+
+        Args:
+            df (pd.DataFrame): 生データ
+        Returns:
+            series (np.ndarray): 時系列 (n, 列数)
+        """
+        columns = [
+            getattr(self.df_simout_columns, channel)
+            for channel in self.config.processing.dtw_channels
+        ]
+        return downsample(df[columns].to_numpy(), self.config.processing.dtw_downsample)
+
+    def compute_matrix(self, series_dict: dict[int, np.ndarray]) -> pd.DataFrame:
+        """
+        全ての組のDTW距離を計算
+
+        Args:
+            series_dict (dict[int, np.ndarray]): 被験者ID → 時系列
+        Returns:
+            df_dtw (pd.DataFrame): 被験者IDを行・列とした距離行列
+        """
+        ids = list(series_dict)
+        matrix = np.zeros((len(ids), len(ids)))
+        for p in range(len(ids)):
+            for q in range(p + 1, len(ids)):
+                a, b = series_dict[ids[p]], series_dict[ids[q]]
+                band = int(
+                    np.ceil(self.config.processing.dtw_band_fraction * max(len(a), 1))
+                )
+                matrix[p, q] = matrix[q, p] = dtw_distance(a, b, band)
+        return pd.DataFrame(matrix, index=ids, columns=ids)
+
+    def _get_settings(self) -> dict:
+        """DTW距離に影響する設定値"""
+        keys = ("dtw_channels", "dtw_downsample", "dtw_band_fraction")
+        return {key: getattr(self.config.processing, key) for key in keys}
@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_event_schema import DfEventSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.signal_conditioning import SignalConditioner
+from src.simout_arrays import SimoutArrays
+from src.simout_cache import SimoutCache
+
+
+class EventDetector:
+    """
+    ペダル操作や車両挙動の離散的なイベントを検出する。
+    しきい値の判定はヒステリシス付きで、Pythonのループを使わずに配列演算で行う。
+    信号の前処理を行う設定の場合は、キャッシュに保存されたフィルタ後の信号で判定する。
+
+    検出するイベント (event_type):
+        brake: ブレーキの踏み込みから解放まで
+        gas: アクセルの踏み込みから解放まで
+        gas_to_brake: アクセル解放からブレーキ踏み込みまで（valueは切り替え時間[s]）
+        full_stop: 停止から発進まで
+        hard_deceleration: 急減速の区間（valueは最大減速度[m/s^2]）
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_simout_columns = DfSimoutSchema()
+        self.df_event_columns = DfEventSchema()
+        self.signal_conditioner = SignalConditioner(config.processing)
+
+    def detect(self, arrays, file_name: str, experiment_condition: str) -> pd.DataFrame:
+        """
+        1つの実験データから全種類のイベントを検出
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+            file_name (str): simoutのファイル名
+            experiment_condition (str): 実験条件（コース）
+        Returns:
+            df_events (pd.DataFrame): イベントの表（開始時刻順）
+        """
+        processing = self.config.processing
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        get_column = self.signal_conditioner.get_column
+        velocity = np.abs(np.asarray(arrays[get_column("ego_v")]))
+        acceleration = np.asarray(arrays[get_column("ego_a")])
+        brake = np.asarray(arrays[get_column("Brake_Out")])
+        gas = np.asarray(arrays[get_column("Gas_Out")])
+
+        brake_starts, brake_ends = self.detect_hysteresis(
+            brake > processing.brake_on_threshold,
+            brake < processing.brake_off_threshold,
+        )
+        gas_starts, gas_ends = self.detect_hysteresis(
+            gas > processing.gas_on_threshold,
+            gas < processing.gas_off_threshold,
+        )
+        stop_starts, stop_ends = self.detect_hysteresis(
+            velocity < processing.stop_on_velocity,
+            velocity > processing.stop_off_velocity,
+        )
+        hard_starts, hard_ends = self.detect_hysteresis(
+            acceleration < -processing.hard_deceleration_on,
+            acceleration > -processing.hard_deceleration_off,
+        )
+        transition_starts, transition_ends = self._match_gas_to_brake(
+            gas_ends, brake_starts, brake_ends
+        )
+
+        # 区間[start, end)の最小値（末尾に+infを付けて終端の区間も扱えるようにする）
+        padded_acceleration = np.append(acceleration, np.inf)
+        hard_bounds = np.column_stack([hard_starts, hard_ends]).ravel()
+        peak_deceleration = (
+            -np.minimum.reduceat(padded_acceleration, hard_bounds)[::2]
+            if len(hard_starts)
+            else np.empty(0)
+        )
+
+        df_events = pd.concat(
+            [
+                self._make_events(time, "brake", brake_starts, brake_ends),
+                self._make_events(time, "gas", gas_starts, gas_ends),
+                self._make_events(
+                    time,
+                    "gas_to_brake",
+                    transition_starts,
+                    transition_ends,
+                    values=time[transition_ends] - time[transition_starts],
+                    inclusive=False,
+                ),
+                self._make_events(time, "full_stop", stop_starts, stop_ends),
+                self._make_events(
+                    time,
+                    "hard_deceleration",
+                    hard_starts,
+                    hard_ends,
+                    values=peak_deceleration,
+                ),
+            ],
+            ignore_index=True,
+        )
+        df_events.insert(0, self.df_event_columns.simout_file, file_name)
+        df_events.insert(
+            1, self.df_event_columns.experiment_condition, experiment_condition
+        )
+        df_events = df_events.sort_values(
+            self.df_event_columns.start_index, kind="stable", ignore_index=True
+        )
+        return df_events
+
+    @staticmethod
+    def detect_hysteresis(
+        on_mask: np.ndarray, off_mask: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        on_maskで状態がONになり、off_maskでOFFに戻る区間を検出
+        （どちらでもないサンプルは直前の状態を保持する）
+
+        Args:
+            on_mask (np.ndarray): ONに切り替える条件
+            off_mask (np.ndarray): OFFに切り替える条件
+        Returns:
+            starts (np.ndarray): 区間の最初のインデックス
+            ends (np.ndarray): 区間の終わりのインデックス（この行を含まない）
+        """
+        n = len(on_mask)
+        # 各サンプルで最後に条件が成立したサンプルの状態を前方に伝搬させる
+        marks = np.where(on_mask, 1, np.where(off_mask, 0, -1)).astype(np.int8)
+        marked_index = np.where(marks >= 0, np.arange(n), -1)
+        last_marked = np.maximum.accumulate(marked_index)
+        state = np.where(last_marked >= 0, marks[np.maximum(last_marked, 0)], 0)
+
+        edges = np.diff(state.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return starts, ends
+
+    @staticmethod
+    def _match_gas_to_brake(
+        gas_ends: np.ndarray, brake_starts: np.ndarray, brake_ends: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        各ブレーキ踏み込みについて、直前のブレーキ解放より後の最後のアクセル解放を対応付ける
+
+        Returns:
+            starts (np.ndarray): アクセル解放のインデックス
+            ends (np.ndarray): ブレーキ踏み込みのインデックス
+        """
+        # アクセル解放のインデックスは区間の終わり（含まない）なので、解放した行は gas_ends - 1
+        gas_release = gas_ends - 1
+        last_gas = np.searchsorted(gas_release, brake_starts, side="right") - 1
+        previous_brake_end = np.concatenate([[-1], brake_ends[:-1]])
+        valid = last_gas >= 0
+        valid[valid] = gas_release[last_gas[valid]] >= previous_brake_end[valid]
+        return gas_release[last_gas[valid]], brake_starts[valid]
+
+    def _make_events(
+        self,
+        time: np.ndarray,
+        event_type: str,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        values: np.ndarray | None = None,
+        inclusive: bool = True,
+    ) -> pd.DataFrame:
+        """区間のインデックスからイベントの表を作成"""
+        end_index = ends - 1 if inclusive else ends
+        return pd.DataFrame(
+            {
+                self.df_event_columns.event_type: event_type,
+                self.df_event_columns.start_index: starts,
+                self.df_event_columns.end_index: end_index,
+                self.df_event_columns.start_time: time[starts],
+                self.df_event_columns.end_time: time[end_index],
+                self.df_event_columns.duration: time[end_index] - time[starts],
+                self.df_event_columns.value: (
+                    np.full(len(starts), np.nan) if values is None else values
+                ),
+            }
+        )
+
+
+class EventIndex:
+    """
+    実験データごとのイベントの表をファイルに保存し、生データを再走査せずに検索できるようにする。
+    保存した表は生データのパス・サイズ・更新時刻と検出の設定をキーとし、変更があれば再作成する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_event_columns = DfEventSchema()
+        self.event_detector = EventDetector(config, logger)
+        self.cache_dir = config.paths.folder_path_model.path_folder_event_cache
+
+    def get_events(self, file_name: str) -> pd.DataFrame:
+        """
+        1つの実験データのイベントを取得（保存された表が古い場合は検出し直す）
+
+        Args:
+            file_name (str): simoutのファイル名
+        Returns:
+            df_events (pd.DataFrame): イベントの表
+        """
+        file_manager = self.config.paths.file_manager
+        stem = os.path.splitext(file_name)[0]
+        events_path = self.cache_dir / f"{stem}.csv"
+        meta_path = self.cache_dir / f"{stem}.json"
+        key = {
+            "source": SimoutCache.get_source_key(
+                file_manager.get_simout_path(file_name)
+            ),
+            "settings": self._get_settings(),
+        }
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                if json.load(f) == key and events_path.exists():
+                    return pd.read_csv(events_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        self.logger.debug(f"'{file_name}' のイベントを検出します")
+        df_events = self.event_detector.detect(
+            SimoutArrays.open(file_name, self.config),
+            file_name=file_name,
+            experiment_condition=self.get_experiment_condition(file_name),
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        df_events.to_csv(events_path, index=False)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(key, f, ensure_ascii=False)
+        return df_events
+
+    def query(
+        self,
+        event_type: str | None = None,
+        experiment_condition: str | None = None,
+        file_names: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        保存されたイベントの表から条件に合うイベントを取得
+
+        Args:
+            event_type (str, optional): イベントの種類（Noneの場合は全て）
+            experiment_condition (str, optional): 実験条件（コース）（Noneの場合は全て）
+            file_names (list[str], optional): 対象のファイル名（Noneの場合はsimoutの全CSV）
+        Returns:
+            df_events (pd.DataFrame): 条件に合うイベントの表
+        """
+        if file_names is None:
+            file_names = [
+                file
+                for file in self.config.paths.file_manager.get_simout_file_names()
+                if file.endswith(".csv")
+            ]
+        if experiment_condition is not None:
+            file_names = [
+                file
+                for file in file_names
+                if self.get_experiment_condition(file) == experiment_condition
+            ]
+        if not file_names:
+            return pd.DataFrame(columns=list(DfEventSchema.get_column_map().values()))
+        df_events = pd.concat(
+            [self.get_events(file_name) for file_name in file_names],
+            ignore_index=True,
+        )
+        if event_type is not None:
+            df_events = df_events[
+                df_events[self.df_event_columns.event_type] == event_type
+            ].reset_index(drop=True)
+        return df_events
+
+    @staticmethod
+    def get_experiment_condition(file_name: str) -> str:
+        """ファイル名（output_01_60_A_...）から実験条件（コース）を取得"""
+        return file_name.split("_")[3]
+
+    def _get_settings(self) -> dict:
+        """イベント検出に影響する設定値"""
+        keys = (
+            "brake_on_threshold",
+            "brake_off_threshold",
+            "gas_on_threshold",
+            "gas_off_threshold",
+            "stop_on_velocity",
+            "stop_off_velocity",
+            "hard_deceleration_on",
+            "hard_deceleration_off",
+        )
+        settings = {key: getattr(self.config.processing, key) for key in keys}
+        if self.event_detector.signal_conditioner.enabled:
+            settings["conditioning"] = (
+                self.event_detector.signal_conditioner.get_settings()
+            )
+        return settings
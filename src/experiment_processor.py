@@ -7,7 +7,15 @@ from config import Config
 from schemas.df_processed_schema import DfProcessedSchema
 from schemas.df_result_schema import DfResultSchema
 from schemas.df_simout_schema import DfSimoutSchema
+from src.event_detector import EventIndex
+from src.lag_estimator import LagEstimator
 from src.metric_calculator import MetricCalculator
+from src.simout_arrays import SimoutArrays
+from src.simout_cache import read_simout
+from src.spatial_index import densify_polyline, find_minimum_distance
+from src.vehicle_geometry import CORNER_NAMES, VehicleGeometry
+from src.window_features import WindowFeatureExtractor
+from src.zone_metrics import ZoneMetricCalculator
 
 
 class ExperimentProcessor:
@@ -20,8 +28,12 @@ class ExperimentProcessor:
         experiment_type (str): 実験条件（タイプ）
         experiment_condition (str): 実験条件（コース）
         logger (logging.Logge): ロガー
+        columns (list[str] | None): 読み込む列（DfSimoutSchemaの変数名）。Noneの場合は全列
     """
 
+    # 軌跡の計算に必要な列（DfSimoutSchemaの変数名）
+    TRAJECTORY_COLUMNS = ["time", "ego_x", "ego_y", "psi"]
+
     def __init__(
         self,
         config: Config,
@@ -30,6 +42,7 @@ class ExperimentProcessor:
         experiment_type: str,
         experiment_condition: str,
         logger: logging.Logger,
+        columns: list[str] | None = None,
     ):
         self.config: Config = config
         self.df_processed_columns = DfProcessedSchema()
@@ -37,20 +50,49 @@ class ExperimentProcessor:
         self.df_simout_columns = DfSimoutSchema()
         self.metric_calculator: MetricCalculator = metric_calculator
         self.logger: logging.Logger = logger
+        self.vehicle_geometry = VehicleGeometry(config, logger)
 
         self.file_name: str = file_name
         self.experiment_type: str = experiment_type
         self.experiment_condition: str = experiment_condition
-        df = pd.read_csv(
-            self.config.paths.file_manager.get_simout_path(file_name=file_name)
-        )
-        self.df = self._add_ego_edge_coordinates(df)
+        self.columns: list[str] | None = columns
+        self._df: pd.DataFrame | None = None
+        self._arrays: SimoutArrays | None = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """生データ（初回アクセス時に読み込む）"""
+        if self._df is None:
+            self._df = self._load_df()
+        return self._df
+
+    @property
+    def arrays(self) -> SimoutArrays:
+        """メモリマップされた生データの列（初回アクセス時に開く）"""
+        if self._arrays is None:
+            self._arrays = SimoutArrays.open(self.file_name, self.config)
+        return self._arrays
 
-        self.dt = (
+    @property
+    def dt(self) -> float:
+        """サンプリング周期"""
+        return (
             self.df[self.df_simout_columns.time].iloc[1]
             - self.df[self.df_simout_columns.time].iloc[0]
         )
 
+    def _load_df(self) -> pd.DataFrame:
+        """生データを読み込み、座標の列がある場合は自車左前端の座標を追加"""
+        df = read_simout(self.config, file_name=self.file_name, columns=self.columns)
+        coordinate_columns = [
+            self.df_simout_columns.ego_x,
+            self.df_simout_columns.ego_y,
+            self.df_simout_columns.psi,
+        ]
+        if set(coordinate_columns).issubset(df.columns):
+            df = self._add_ego_edge_coordinates(df)
+        return df
+
     def process(self) -> pd.DataFrame:
         """
         核実験で様々な指標を計算(今回は単純に平均速度、総走行距離、ペダル量積分値にする)
@@ -58,27 +100,168 @@ class ExperimentProcessor:
         Returns:
             df_index_experiment (pd.DataFrame): 実験の結果
         """
-        dt = self.dt
-        df = self.df
+        if self.config.processing.streaming:
+            # 生データ全体を読み込まず、分割して集計する
+            summary_dict = self.metric_calculator.calculate_summary_streaming(
+                path=self.config.paths.file_manager.get_simout_path(self.file_name),
+                chunk_size=self.config.processing.chunk_size,
+            )
+            # 以降の指標は生データ全体のキャッシュが必要なため、分割読み込み時は計算しない
+            skipped_metrics = self.get_full_recording_metrics()
+            if skipped_metrics:
+                self.logger.warning(
+                    f"'{self.file_name}' は分割読み込みのため、生データ全体が必要な指標"
+                    f"（{', '.join(skipped_metrics)}）を計算しません"
+                )
+            return self.make_index_experiment(summary_dict)
+
+        # 必要な列だけをメモリマップから1回走査して集計する
+        arrays = self.arrays
+        dt = arrays.time[1] - arrays.time[0]
+        summary_dict = self.metric_calculator.compute_summary(arrays=arrays, dt=dt)
+        if self.config.processing.signal_conditioning:
+            # 加加速度はキャッシュ作成時に前処理した列を使う
+            summary_dict[self.df_result_columns.peak_jerk] = float(
+                np.abs(arrays.ego_jerk).max()
+            )
+        summary_dict.update(self.calculate_min_gap())
+        summary_dict.update(self.calculate_zone_metrics())
+        if self.config.processing.lag_metrics:
+            summary_dict.update(self.estimate_lags())
+        return self.make_index_experiment(summary_dict)
+
+    def get_full_recording_metrics(self) -> list[str]:
+        """
+        設定で有効になっている指標のうち、生データ全体（メモリマップのキャッシュ）が必要なもの
+
+        Returns:
+            metrics (list[str]): 指標の名前
+        """
+        metrics = []
+        if self.config.processing.signal_conditioning:
+            metrics.append(self.df_result_columns.peak_jerk)
+        if self.config.experiment.obj_polylines.get(self.experiment_condition):
+            metrics.append(self.df_result_columns.min_gap)
+        if self.config.experiment.zones.get(self.experiment_condition):
+            metrics.append("zone_metrics")
+        if self.config.processing.lag_metrics:
+            metrics.append("lag_metrics")
+        return metrics
+
+    def estimate_lags(self) -> dict:
+        """
+        アクセル・ブレーキから加速度の応答までの遅れ時間と相関のピークを計算
+
+        Returns:
+            lag_dict (dict): 入力ごとの遅れ時間[s]と相関のピーク
+        """
+        lag_estimator = LagEstimator(self.config, self.logger)
+        return lag_estimator.estimate(self.arrays)
+
+    def calculate_zone_metrics(self) -> dict:
+        """
+        コースの区間ごとの走行距離、平均速度、ペダル量積分値を計算
+        （実験条件の区間が設定されていない場合は空のdictを返す）
 
-        average_velocity = self.metric_calculator.calculate_average_velocity(df=df)
-        total_mileage = self.metric_calculator.calculate_total_mileage(dt=dt, df=df)
+        Returns:
+            zone_dict (dict): 「区間名_指標名」のカラム名 → 指標の値
+        """
+        zone_metric_calculator = ZoneMetricCalculator(self.config, self.logger)
+        # 区間が無い場合は生データのキャッシュを作らない（分割読み込み時に全体を読み込まないため）
+        if not zone_metric_calculator.get_zones(self.experiment_condition):
+            return {}
+        return zone_metric_calculator.compute(self.arrays, self.experiment_condition)
+
+    def calculate_min_gap(self) -> dict:
+        """
+        自車左前端の軌跡と対象物の折れ線の最短距離を計算
+        （実験条件の折れ線が設定されていない場合は空のdictを返す）
+
+        Returns:
+            min_gap_dict (dict): 最短距離とその時刻
+        """
+        polyline = self.config.experiment.obj_polylines.get(self.experiment_condition)
+        if not polyline:
+            return {}
+
+        df_trajectory = self._add_ego_edge_coordinates(
+            self.arrays.to_dataframe(columns=self.TRAJECTORY_COLUMNS)
+        )
+        ego_points = df_trajectory[
+            [
+                self.df_processed_columns.Ego_front_left_x,
+                self.df_processed_columns.Ego_front_left_y,
+            ]
+        ].to_numpy()
+        obj_points = densify_polyline(
+            np.asarray(polyline), self.config.experiment.obj_polyline_resolution
+        )
+        min_gap, ego_index, _ = find_minimum_distance(ego_points, obj_points)
+        return {
+            self.df_result_columns.min_gap: min_gap,
+            self.df_result_columns.min_gap_time: float(
+                df_trajectory[self.df_simout_columns.time].iloc[ego_index]
+            ),
+        }
+
+    def extract_window_features(self) -> pd.DataFrame:
+        """
+        スライディングウィンドウごとの特徴量を計算
+
+        Returns:
+            df_window_features (pd.DataFrame): ウィンドウごとの特徴量
+        """
+        window_feature_extractor = WindowFeatureExtractor(self.config, self.logger)
+        return window_feature_extractor.extract(self.arrays, file_name=self.file_name)
+
+    def detect_events(self) -> pd.DataFrame:
+        """
+        ブレーキ・アクセル操作、停止、急減速のイベントを取得（保存済みのイベントの表を再利用する）
+
+        Returns:
+            df_events (pd.DataFrame): イベントの表
+        """
+        event_index = EventIndex(self.config, self.logger)
+        return event_index.get_events(self.file_name)
+
+    def make_index_experiment(self, summary_dict: dict) -> pd.DataFrame:
+        """
+        計算済みの指標から実験の結果を作成
+
+        Args:
+            summary_dict (dict): カラム名 → 指標の値
+        Returns:
+            df_index_experiment (pd.DataFrame): 実験の結果
+        """
         index_dict = {
             self.df_result_columns.simout_file: self.file_name,
             self.df_result_columns.experiment_condition: self.experiment_condition,
-            self.df_result_columns.average_velocity: average_velocity,
-            self.df_result_columns.total_mileage: total_mileage,
         }
-
-        brake_and_gas_dict = self.metric_calculator.sum_brake_and_gas(dt=dt, df=df)
-        index_dict = dict(**index_dict, **brake_and_gas_dict)
+        index_dict = dict(**index_dict, **summary_dict)
 
         df_index_experiment = pd.DataFrame({k: [v] for k, v in index_dict.items()})
         return df_index_experiment
 
+    def calculate_interaction(self, df_obj_track: pd.DataFrame) -> pd.DataFrame:
+        """
+        自車と対象車両の矩形間の距離・重なり・TTCを時刻ごとに計算
+
+        Args:
+            df_obj_track (pd.DataFrame): 対象車両の軌跡（DfObjTrackSchemaの列）
+        Returns:
+            df_interaction (pd.DataFrame): 時刻ごとの距離・重なり・接近速度・TTC
+        """
+        arrays = self.arrays
+        ego_corners = self.vehicle_geometry.get_ego_corners(
+            arrays.ego_x, arrays.ego_y, arrays.psi
+        )
+        return self.vehicle_geometry.compute_interaction(
+            np.asarray(arrays.time), ego_corners, df_obj_track
+        )
+
     def _add_ego_edge_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        dfに自車直進車両左前端の座標の列を追加
+        dfに自車直進車両の4つの角（左前端など）の座標の列を追加
 
         Args:
             df (pd.Dataframe): 生データ
@@ -86,22 +269,17 @@ class ExperimentProcessor:
         Returns:
             df (pd.Dataframe): 新しい座標の列が追加されたdf
         """
-
-        # 自車直進車両左前端の座標
-        Ego_front_left_x = (
-            df[self.df_simout_columns.ego_x]
-            + (self.config.experiment.Ego_l - self.config.experiment.PoI_y)
-            * np.cos(df[self.df_simout_columns.psi])
-            - self.config.experiment.Ego_w / 2 * np.sin(df[self.df_simout_columns.psi])
-        )
-        Ego_front_left_y = (
-            df[self.df_simout_columns.ego_y]
-            + (self.config.experiment.Ego_l - self.config.experiment.PoI_y)
-            * np.sin(df[self.df_simout_columns.psi])
-            + self.config.experiment.Ego_w / 2 * np.cos(df[self.df_simout_columns.psi])
+        ego_corners = self.vehicle_geometry.get_ego_corners(
+            df[self.df_simout_columns.ego_x].to_numpy(),
+            df[self.df_simout_columns.ego_y].to_numpy(),
+            df[self.df_simout_columns.psi].to_numpy(),
         )
-
-        df[self.df_processed_columns.Ego_front_left_x] = Ego_front_left_x
-        df[self.df_processed_columns.Ego_front_left_y] = Ego_front_left_y
+        for i, corner_name in enumerate(CORNER_NAMES):
+            df[getattr(self.df_processed_columns, f"Ego_{corner_name}_x")] = (
+                ego_corners[:, i, 0]
+            )
+            df[getattr(self.df_processed_columns, f"Ego_{corner_name}_y")] = (
+                ego_corners[:, i, 1]
+            )
 
         return df
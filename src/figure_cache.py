@@ -0,0 +1,179 @@
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Callable
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from config import Config
+from src.app_data import LruCache
+from src.simout_cache import SimoutCache
+
+
+def render_figure(fig: Figure, fmt: str = "png", dpi: int = 100) -> bytes:
+    """
+    図を画像のバイト列に変換して閉じる（st.pyplotと同じく余白を詰める）
+
+    Args:
+        fig (Figure): matplotlibの図
+        fmt (str): 画像の形式（"png"、"svg"、"pdf"など）
+        dpi (int): 解像度
+    Returns:
+        image (bytes): 画像のバイト列
+    """
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """
+    描画済みの図の画像（PNG/SVGなど）をメモリとファイルに保存し、入力が変わっていない図は
+    matplotlibを使わずに返す。キーは図の種類、被験者ID、速度、実験条件、
+    入力ファイルのパス・サイズ・更新時刻、描画の設定をまとめたもののハッシュとする。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # 図の描画方法を変更した場合は上げる（保存された全ての図が描画し直される）
+    VERSION = 1
+
+    # メモリ上のキャッシュはプロセスで共有する（Streamlitの再実行・セッションをまたいで使う）
+    _memory_cache: LruCache | None = None
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.cache_dir = config.paths.folder_path_model.path_folder_figure_cache
+        if FigureCache._memory_cache is None:
+            FigureCache._memory_cache = LruCache(
+                config.dashboard.figure_cache_max_bytes
+            )
+        self.memory_cache: LruCache = FigureCache._memory_cache
+
+    def make_key(
+        self,
+        plot: str,
+        subject_ids: list[int],
+        velocity: int | None,
+        experiment_type: str | None,
+        file_names: list[str],
+        options: dict | None = None,
+    ) -> dict:
+        """
+        図のキー
+
+        Args:
+            plot (str): 図の種類（描画する関数の名前など）
+            subject_ids (list[int]): 図に含まれる被験者ID
+            velocity (int, optional): 実験の設定速度
+            experiment_type (str, optional): 実験条件（コース）
+            file_names (list[str]): 図の入力となるsimoutのファイル名
+            options (dict, optional): 描画の設定（軸の範囲など）
+        Returns:
+            key (dict): 図のキー
+        """
+        file_manager = self.config.paths.file_manager
+        return {
+            "plot": plot,
+            "subject_ids": sorted(subject_ids),
+            "velocity": velocity,
+            "experiment_type": experiment_type,
+            "sources": {
+                file_name: SimoutCache.get_source_key(
+                    file_manager.get_simout_path(file_name)
+                )
+                for file_name in sorted(file_names)
+            },
+            "options": options or {},
+            # 単位の変換など、図に影響する実験設定
+            "experiment": vars(self.config.experiment),
+        }
+
+    def get(self, key: dict, fmt: str | None = None) -> bytes | None:
+        """
+        保存された図の画像を取得（メモリに無い場合はファイルから読み込む）
+
+        Args:
+            key (dict): make_keyで作成した図のキー
+            fmt (str, optional): 画像の形式。Noneの場合は設定値
+        Returns:
+            image (bytes | None): 画像のバイト列。保存されていない場合はNone
+        """
+        fmt = fmt or self.config.dashboard.figure_format
+        digest = self.get_digest(key, fmt)
+        image = self.memory_cache.get(("figure", digest), None)
+        if image is None:
+            path = self._get_path(key, digest, fmt)
+            if not path.exists():
+                return None
+            image = path.read_bytes()
+            self.memory_cache.put(("figure", digest), None, image)
+        return image
+
+    def put(self, key: dict, image: bytes, fmt: str | None = None):
+        """
+        図の画像をメモリとファイルに保存
+
+        Args:
+            key (dict): make_keyで作成した図のキー
+            image (bytes): 画像のバイト列
+            fmt (str, optional): 画像の形式。Noneの場合は設定値
+        """
+        fmt = fmt or self.config.dashboard.figure_format
+        digest = self.get_digest(key, fmt)
+        path = self._get_path(key, digest, fmt)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(image)
+        os.replace(tmp_path, path)
+        self.memory_cache.put(("figure", digest), None, image)
+
+    def get_or_render(
+        self, key: dict, render: Callable[[], Figure], fmt: str | None = None
+    ) -> bytes:
+        """
+        保存された図の画像を取得（無い場合はrenderで描画して保存する）
+
+        Args:
+            key (dict): make_keyで作成した図のキー
+            render (Callable[[], Figure]): 図を描画する関数（データの読み込みも含める）
+            fmt (str, optional): 画像の形式。Noneの場合は設定値
+        Returns:
+            image (bytes): 画像のバイト列
+        """
+        fmt = fmt or self.config.dashboard.figure_format
+        image = self.get(key, fmt)
+        if image is None:
+            self.logger.debug(f"図 '{key['plot']}' を描画します")
+            image = render_figure(
+                render(), fmt=fmt, dpi=self.config.dashboard.figure_dpi
+            )
+            self.put(key, image, fmt)
+        return image
+
+    def get_digest(self, key: dict, fmt: str, dpi: int | None = None) -> str:
+        """キー、画像の形式、解像度（Noneの場合は設定値）のハッシュ"""
+        key_json = json.dumps(
+            {
+                "version": self.VERSION,
+                "format": fmt,
+                "dpi": self.config.dashboard.figure_dpi if dpi is None else dpi,
+                "key": key,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key: dict, digest: str, fmt: str):
+        return self.cache_dir / f"{key['plot']}_{digest[:16]}.{fmt}"
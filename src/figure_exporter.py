@@ -0,0 +1,373 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.figure import Figure
+
+from config import Config
+from src.distance_resampler import DistanceResampler
+from src.figure_cache import FigureCache
+from src.figure_renderer import use_agg_backend
+from src.plots.plot_t_v_a_gas_distance import (
+    PLOT_COLUMNS,
+    plot_distance_bands_by_type,
+    plot_t_v_a_gas_distance_by_type,
+    plot_t_v_a_gas_distance_individual,
+)
+from src.subject_manager import SubjectManager
+
+
+def build_figure(
+    job: dict, config: Config, df_all_subject_results: pd.DataFrame | None = None
+) -> Figure:
+    """
+    出力する図を描画する（データの読み込みも含める）
+
+    Args:
+        job (dict): FigureExporter.make_jobsで作成した図の情報
+        config (Config): 設定オブジェクト
+        df_all_subject_results (pd.DataFrame, optional): 全被験者の結果
+    Returns:
+        fig (Figure): matplotlibの図
+    """
+    plot = job["plot"]
+    if plot == "t_v_a_gas_distance_individual":
+        (id,) = job["subject_ids"]
+        subject_manager = SubjectManager(id, job["simout_list"])
+        subject_manager.load_raw_data(config=config, columns=PLOT_COLUMNS)
+        return plot_t_v_a_gas_distance_individual(
+            config,
+            subject_manager.df_dict,
+            id,
+            subject_manager.experiment_type,
+            df_all_subject_results=df_all_subject_results,
+        )
+    if plot == "t_v_a_gas_distance_by_type":
+        subject_managers = {}
+        for id in job["subject_ids"]:
+            subject_manager = SubjectManager(id, job["simout_list"])
+            subject_manager.load_raw_data(config=config, columns=PLOT_COLUMNS)
+            subject_managers[id] = subject_manager
+        return plot_t_v_a_gas_distance_by_type(
+            config,
+            subject_managers,
+            job["velocity"],
+            job["experiment_type"],
+            df_all_subject_results,
+        )
+    if plot == "distance_bands_by_type":
+        distance_resampler = DistanceResampler(config, logging.getLogger(__name__))
+        return plot_distance_bands_by_type(
+            config,
+            df_bands=distance_resampler.aggregate(job["file_names"]),
+            velocity=job["velocity"],
+            experiment_type=job["experiment_type"],
+        )
+    raise ValueError(f"図の種類 '{plot}' には対応していません")
+
+
+def export_figure(
+    job: dict,
+    paths: dict[str, str],
+    config: Config,
+    df_all_subject_results: pd.DataFrame | None = None,
+) -> dict[str, str]:
+    """
+    図を1回だけ描画し、形式ごとのファイルに保存する（プロセスプールから呼び出すためモジュール関数にしている）
+
+    Args:
+        job (dict): FigureExporter.make_jobsで作成した図の情報
+        paths (dict[str, str]): 画像の形式 → 保存先のパス
+        config (Config): 設定オブジェクト
+        df_all_subject_results (pd.DataFrame, optional): 全被験者の結果
+    Returns:
+        paths (dict[str, str]): 画像の形式 → 保存したパス
+    """
+    fig = build_figure(job, config, df_all_subject_results)
+    try:
+        for fmt, path in paths.items():
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 書き込み途中のファイルが残らないように、一時ファイルに保存してから置き換える
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.{fmt}")
+            fig.savefig(
+                tmp_path,
+                format=fmt,
+                dpi=config.processing.export_dpi,
+                bbox_inches="tight",
+            )
+            os.replace(tmp_path, path)
+    finally:
+        plt.close(fig)
+    return paths
+
+
+class FigureExporter:
+    """
+    全ての被験者・速度・実験条件の図を画面を使わずに描画し、画像ファイルに出力する。
+    図のキーはダッシュボードの図のキャッシュ（FigureCache）と同じものを使い、
+    前回の出力から入力ファイルと設定が変わっていない図は描画し直さない。
+    出力したファイルとキーのハッシュはマニフェストに記録する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+        manifest_path (Path): マニフェストファイルのパス
+    """
+
+    # 出力するファイルの構成を変更した場合は上げる（全ての図が出力し直される）
+    VERSION = 1
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.output_dir: Path = config.paths.folder_path_model.path_folder_figures
+        self.manifest_path: Path = config.paths.file_path_model.figure_export_manifest
+        self.figure_cache = FigureCache(config, logger)
+        self.figures: dict = self.load()
+
+    def load(self) -> dict:
+        """
+        マニフェストを読み込む。存在しない、またはバージョンが異なる場合は空とする。
+
+        Returns:
+            figures (dict): 出力先の相対パス → 記録内容
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if manifest.get("version") != self.VERSION:
+            self.logger.info("マニフェストのバージョンが異なるため全ての図を出力します")
+            return {}
+        return manifest.get("figures", {})
+
+    def save(self):
+        """マニフェストを保存"""
+        manifest = {"version": self.VERSION, "figures": self.figures}
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def make_jobs(self, simout_list: list[str]) -> list[dict]:
+        """
+        出力する図の一覧（被験者ごとの図、速度・実験条件ごとの重ね描きと帯の図）
+
+        Args:
+            simout_list (list[str]): 生データのファイル名リスト
+        Returns:
+            jobs (list[dict]): 図の情報（種類、出力名、被験者ID、速度、実験条件、入力ファイル、キー）
+        """
+        # ファイル名（output_01_60_A_...）の被験者ID、速度、実験条件でまとめる
+        ids: set[int] = set()
+        group_files: dict[tuple[int, str], list[str]] = {}
+        for file_name in simout_list:
+            parts = file_name.split("_")
+            ids.add(int(parts[1]))
+            group_files.setdefault((int(parts[2]), parts[3]), []).append(file_name)
+
+        jobs = []
+        for id in sorted(ids):
+            file_names, experiment_type = (
+                SubjectManager.extract_subject_raw_file_names_and_type(simout_list, id)
+            )
+            jobs.append(
+                self._make_job(
+                    plot="t_v_a_gas_distance_individual",
+                    name=f"subject_{id:02d}",
+                    subject_ids=[id],
+                    velocity=None,
+                    experiment_type=experiment_type,
+                    file_names=list(file_names.values()),
+                    simout_list=simout_list,
+                    options={"columns": PLOT_COLUMNS},
+                )
+            )
+        for (velocity, experiment_type), file_names in sorted(group_files.items()):
+            subject_ids = [int(file_name.split("_")[1]) for file_name in file_names]
+            jobs.append(
+                self._make_job(
+                    plot="t_v_a_gas_distance_by_type",
+                    name=f"{velocity}_{experiment_type}",
+                    subject_ids=subject_ids,
+                    velocity=velocity,
+                    experiment_type=experiment_type,
+                    file_names=file_names,
+                    simout_list=simout_list,
+                    options={"columns": PLOT_COLUMNS},
+                )
+            )
+            jobs.append(
+                self._make_job(
+                    plot="distance_bands_by_type",
+                    name=f"{velocity}_{experiment_type}",
+                    subject_ids=subject_ids,
+                    velocity=velocity,
+                    experiment_type=experiment_type,
+                    file_names=file_names,
+                    simout_list=simout_list,
+                    options={
+                        "distance_step": self.config.processing.distance_step,
+                        "band_percentiles": self.config.processing.band_percentiles,
+                    },
+                )
+            )
+        return jobs
+
+    def export(
+        self,
+        simout_list: list[str],
+        df_all_subject_results: pd.DataFrame | None = None,
+        formats: list[str] | None = None,
+        n_workers: int | None = None,
+        incremental: bool = True,
+    ) -> pd.DataFrame:
+        """
+        全ての図を出力し、マニフェストを保存する
+
+        Args:
+            simout_list (list[str]): 生データのファイル名リスト
+            df_all_subject_results (pd.DataFrame, optional): 全被験者の結果
+            formats (list[str], optional): 画像の形式。Noneの場合は設定値
+            n_workers (int, optional): プロセス数。Noneの場合は設定値
+            incremental (bool): Trueの場合、入力が変わっていない図は出力しない
+        Returns:
+            df_figures (pd.DataFrame): 出力した（またはスキップした）ファイルの一覧
+        """
+        formats = formats or self.config.processing.export_formats
+        n_workers = n_workers or self.config.processing.export_workers
+        jobs = self.make_jobs(simout_list)
+
+        pending = []
+        for job in jobs:
+            paths = {}
+            for fmt in formats:
+                relative_path = self._get_relative_path(job, fmt)
+                digest = self._get_digest(job, fmt)
+                if incremental and self._is_up_to_date(relative_path, digest):
+                    continue
+                paths[fmt] = relative_path
+            if paths:
+                pending.append((job, paths))
+        self.logger.info(
+            f"{len(jobs)} 枚の図のうち {len(pending)} 枚を出力します"
+            f"（形式: {', '.join(formats)}）"
+        )
+
+        n_workers = min(n_workers, len(pending))
+        if n_workers <= 1:
+            for n_done, (job, paths) in enumerate(pending, start=1):
+                export_figure(
+                    job,
+                    self._to_output_paths(paths),
+                    self.config,
+                    df_all_subject_results,
+                )
+                self._update(job, paths, n_done, len(pending))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=use_agg_backend
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        export_figure,
+                        job,
+                        self._to_output_paths(paths),
+                        self.config,
+                        df_all_subject_results,
+                    ): (job, paths)
+                    for job, paths in pending
+                }
+                for n_done, future in enumerate(as_completed(futures), start=1):
+                    job, paths = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        # 出力済みの図は次回スキップできるように記録しておく
+                        self.save()
+                        raise RuntimeError(
+                            f"図 '{job['plot']}/{job['name']}' の出力中にエラーが発生しました: {e}"
+                        ) from e
+                    self._update(job, paths, n_done, len(pending))
+        self.save()
+
+        return pd.DataFrame(
+            [
+                {"path": relative_path, **entry}
+                for relative_path, entry in sorted(self.figures.items())
+            ]
+        )
+
+    def _make_job(
+        self,
+        plot: str,
+        name: str,
+        subject_ids: list[int],
+        velocity: int | None,
+        experiment_type: str | None,
+        file_names: list[str],
+        simout_list: list[str],
+        options: dict,
+    ) -> dict:
+        return {
+            "plot": plot,
+            "name": name,
+            "subject_ids": sorted(subject_ids),
+            "velocity": velocity,
+            "experiment_type": experiment_type,
+            "file_names": sorted(file_names),
+            "simout_list": simout_list,
+            "key": self.figure_cache.make_key(
+                plot=plot,
+                subject_ids=subject_ids,
+                velocity=velocity,
+                experiment_type=experiment_type,
+                file_names=file_names,
+                options=options,
+            ),
+        }
+
+    def _get_digest(self, job: dict, fmt: str) -> str:
+        return self.figure_cache.get_digest(
+            job["key"], fmt, dpi=self.config.processing.export_dpi
+        )
+
+    def _get_relative_path(self, job: dict, fmt: str) -> str:
+        return f"{job['plot']}/{job['name']}.{fmt}"
+
+    def _to_output_paths(self, paths: dict[str, str]) -> dict[str, str]:
+        return {
+            fmt: str(self.output_dir / relative_path)
+            for fmt, relative_path in paths.items()
+        }
+
+    def _is_up_to_date(self, relative_path: str, digest: str) -> bool:
+        """前回の出力から図のキーが変わっておらず、ファイルが存在するか"""
+        entry = self.figures.get(relative_path)
+        if entry is None or entry.get("digest") != digest:
+            return False
+        return (self.output_dir / relative_path).exists()
+
+    def _update(self, job: dict, paths: dict[str, str], n_done: int, n_total: int):
+        """出力した図の記録を更新"""
+        for fmt, relative_path in paths.items():
+            self.figures[relative_path] = {
+                "plot": job["plot"],
+                "subject_ids": job["subject_ids"],
+                "velocity": job["velocity"],
+                "experiment_type": job["experiment_type"],
+                "format": fmt,
+                "digest": self._get_digest(job, fmt),
+                "input_files": job["file_names"],
+            }
+        self.logger.info(
+            f"図 '{job['plot']}/{job['name']}' を出力しました ({n_done}/{n_total})"
+        )
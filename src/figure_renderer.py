@@ -0,0 +1,154 @@
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator
+
+import matplotlib
+import pandas as pd
+
+from config import Config
+from src.figure_cache import render_figure
+from src.plots.plot_t_v_a_gas_distance import (
+    PLOT_COLUMNS,
+    plot_t_v_a_gas_distance_individual,
+)
+from src.subject_manager import SubjectManager
+
+
+def use_agg_backend():
+    """画面を使わないAggバックエンドに切り替える（描画用のプロセスの初期化で呼ぶ）"""
+    matplotlib.use("Agg", force=True)
+
+
+def render_subject_image(
+    id: int,
+    simout_list: list[str],
+    config: Config,
+    df_all_subject_results: pd.DataFrame | None = None,
+    fmt: str = "png",
+) -> bytes:
+    """
+    1人の被験者の図を描画して画像のバイト列を返す（プロセスプールから呼び出すためモジュール関数にしている）
+
+    Args:
+        id (int): 被験者ID
+        simout_list (list[str]): 生データのファイル名リスト
+        config (Config): 設定オブジェクト
+        df_all_subject_results (pd.DataFrame, optional): 全被験者の結果
+        fmt (str): 画像の形式
+    Returns:
+        image (bytes): 画像のバイト列
+    """
+    subject_manager = SubjectManager(id, simout_list)
+    subject_manager.load_raw_data(config=config, columns=PLOT_COLUMNS)
+    fig = plot_t_v_a_gas_distance_individual(
+        config,
+        subject_manager.df_dict,
+        id,
+        subject_manager.experiment_type,
+        df_all_subject_results=df_all_subject_results,
+    )
+    return render_figure(fig, fmt=fmt, dpi=config.dashboard.figure_dpi)
+
+
+# プロセスの起動に時間がかかるため、プールはStreamlitの再実行をまたいで使い回す
+_executor: ProcessPoolExecutor | None = None
+_executor_workers: int = 0
+_executor_lock = threading.Lock()
+
+
+def get_render_executor(n_workers: int) -> ProcessPoolExecutor:
+    """
+    描画用のプロセスプール（プロセス数が変わった場合は作り直す）。
+    Streamlitはページのスクリプトを__main__として実行するため、spawnで起動すると
+    子プロセスがページを実行し直してしまう。そのためDataManagerと同じく既定の方法で起動する。
+
+    Args:
+        n_workers (int): プロセス数
+    Returns:
+        executor (ProcessPoolExecutor): プロセスプール
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != n_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=n_workers, initializer=use_agg_backend
+            )
+            _executor_workers = n_workers
+        return _executor
+
+
+def reset_render_executor():
+    """描画用のプロセスプールを破棄する（プロセスが異常終了した場合に次回作り直すため）"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class FigureRenderer:
+    """
+    被験者ごとの図をプロセスプールで並列に描画し、画像のバイト列を被験者の順に返す。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+
+    def render_subject_images(
+        self,
+        ids: list[int],
+        simout_list: list[str],
+        df_all_subject_results: pd.DataFrame | None = None,
+        fmt: str | None = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        被験者ごとの図を描画し、描画が終わったものから被験者の順に返す
+
+        Args:
+            ids (list[int]): 被験者IDのリスト
+            simout_list (list[str]): 生データのファイル名リスト
+            df_all_subject_results (pd.DataFrame, optional): 全被験者の結果
+            fmt (str, optional): 画像の形式。Noneの場合は設定値
+        Returns:
+            images (Iterator[tuple[int, bytes]]): (被験者ID, 画像のバイト列)
+        """
+        fmt = fmt or self.config.dashboard.figure_format
+        n_workers = min(self.config.dashboard.render_workers, len(ids))
+        if n_workers <= 1:
+            for id in ids:
+                yield id, render_subject_image(
+                    id, simout_list, self.config, df_all_subject_results, fmt
+                )
+            return
+
+        self.logger.debug(f"{len(ids)} 人の図を {n_workers} プロセスで描画します")
+        executor = get_render_executor(self.config.dashboard.render_workers)
+        futures: dict[int, Future] = {}
+        try:
+            for id in ids:
+                futures[id] = executor.submit(
+                    render_subject_image,
+                    id,
+                    simout_list,
+                    self.config,
+                    df_all_subject_results,
+                    fmt,
+                )
+            for id, future in futures.items():
+                yield id, future.result()
+        except BrokenProcessPool:
+            reset_render_executor()
+            raise
+        finally:
+            # 途中で打ち切られた場合（ページの再実行など）は未着手の描画を取り消す
+            for future in futures.values():
+                future.cancel()
@@ -0,0 +1,189 @@
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_geometry_sweep_schema import DfGeometrySweepSchema
+from src.event_detector import EventIndex
+from src.simout_arrays import SimoutArrays
+from src.spatial_index import densify_polyline, find_minimum_distances
+from src.vehicle_geometry import CORNER_NAMES, compute_box_corners
+from src.zone_metrics import ZoneMetricCalculator
+
+
+class GeometrySweep:
+    """
+    自車の寸法（Ego_l, PoI_y, Ego_w）の組み合わせごとに、角の座標とそれに基づく指標
+    （車両が通過した範囲、対象物との最短距離、左前端で判定した区間ごとの指標）を計算する。
+    各実験データは1回だけ読み込み、ヨー角のsin・cosも1回だけ計算して、
+    パラメータの軸でブロードキャストして全ての組み合わせの角の座標をまとめて求める。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # 一度に角の座標を計算する要素数（パラメータの組数×行数）の上限
+    MAX_BLOCK_SIZE = 5_000_000
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_sweep_columns = DfGeometrySweepSchema()
+
+    def make_parameter_grid(
+        self,
+        Ego_l: list[float] | None = None,
+        PoI_y: list[float] | None = None,
+        Ego_w: list[float] | None = None,
+    ) -> pd.DataFrame:
+        """
+        寸法の全ての組み合わせの表を作成（指定しない寸法は現在の設定値を使う）
+
+        Args:
+            Ego_l (list[float], optional): 車両の全長の候補
+            PoI_y (list[float], optional): 後端から基準点までの距離の候補
+            Ego_w (list[float], optional): 車両の全幅の候補
+        Returns:
+            df_parameters (pd.DataFrame): parameter_setをインデックスとした寸法の組み合わせ
+        """
+        experiment = self.config.experiment
+        values = {
+            self.df_sweep_columns.Ego_l: Ego_l or [experiment.Ego_l],
+            self.df_sweep_columns.PoI_y: PoI_y or [experiment.PoI_y],
+            self.df_sweep_columns.Ego_w: Ego_w or [experiment.Ego_w],
+        }
+        df_parameters = pd.DataFrame(
+            list(itertools.product(*values.values())), columns=list(values)
+        )
+        df_parameters.index.name = self.df_sweep_columns.parameter_set
+        return df_parameters
+
+    def run(
+        self, df_parameters: pd.DataFrame, file_names: list[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        全ての寸法の組み合わせ・実験データについて指標を計算
+
+        Args:
+            df_parameters (pd.DataFrame): make_parameter_gridで作成した寸法の組み合わせ
+            file_names (list[str], optional): 対象のファイル名（Noneの場合はsimoutの全CSV）
+        Returns:
+            df_sweep (pd.DataFrame): 寸法の組み合わせ×実験データごとの指標
+        """
+        if file_names is None:
+            file_names = [
+                file
+                for file in self.config.paths.file_manager.get_simout_file_names()
+                if file.endswith(".csv")
+            ]
+        if not self.config.experiment.obj_polylines:
+            self.logger.warning(
+                "対象物の折れ線（obj_polylines）が設定されていないため、最短距離は計算されません"
+            )
+        if not self.config.experiment.zones:
+            self.logger.info(
+                "区間（zones）が設定されていないため、区間ごとの指標は計算されません"
+            )
+
+        df_sweep_list = []
+        for file_name in file_names:
+            self.logger.debug(f"'{file_name}' の寸法の感度を計算します")
+            df_sweep_list.append(self.run_file(file_name, df_parameters))
+        df_sweep = pd.concat(df_sweep_list, ignore_index=True)
+        metric_columns = df_sweep.columns.difference(
+            [
+                *df_parameters.columns,
+                self.df_sweep_columns.parameter_set,
+                self.df_sweep_columns.simout_file,
+                self.df_sweep_columns.experiment_condition,
+            ]
+        )
+        if df_sweep[metric_columns].isna().all().all():
+            raise ValueError("寸法の組み合わせごとに計算できた指標がありません")
+        return df_sweep
+
+    def run_file(self, file_name: str, df_parameters: pd.DataFrame) -> pd.DataFrame:
+        """
+        1つの実験データについて、全ての寸法の組み合わせの指標を計算
+
+        Args:
+            file_name (str): simoutのファイル名
+            df_parameters (pd.DataFrame): 寸法の組み合わせ
+        Returns:
+            df_sweep (pd.DataFrame): 寸法の組み合わせごとの指標
+        """
+        experiment_condition = EventIndex.get_experiment_condition(file_name)
+        arrays = SimoutArrays.open(file_name, self.config)
+        time = np.asarray(arrays.time)
+        x = np.asarray(arrays.ego_x)
+        y = np.asarray(arrays.ego_y)
+        psi = np.asarray(arrays.psi)
+        sin_psi = np.sin(psi)
+        cos_psi = np.cos(psi)
+
+        polyline = self.config.experiment.obj_polylines.get(experiment_condition)
+        obj_points = (
+            densify_polyline(
+                np.asarray(polyline), self.config.experiment.obj_polyline_resolution
+            )
+            if polyline
+            else None
+        )
+        # 左前端で判定する多角形の区間がある場合だけ、寸法によって区間の指標が変わる
+        zone_metric_calculator = ZoneMetricCalculator(self.config, self.logger)
+        has_swept_zones = self.config.experiment.zone_reference == "front_left" and any(
+            "polygon" in zone
+            for zone in zone_metric_calculator.get_zones(experiment_condition)
+        )
+
+        # (パラメータの組数, 1) の配列にして時刻の軸とブロードキャストする
+        length = df_parameters[self.df_sweep_columns.Ego_l].to_numpy()[:, None]
+        poi_y = df_parameters[self.df_sweep_columns.PoI_y].to_numpy()[:, None]
+        width = df_parameters[self.df_sweep_columns.Ego_w].to_numpy()[:, None]
+        front_left_index = CORNER_NAMES.index("front_left")
+
+        metrics: dict[str, list[np.ndarray]] = {}
+        block = max(self.MAX_BLOCK_SIZE // max(len(time), 1), 1)
+        for start in range(0, len(df_parameters), block):
+            block_slice = slice(start, start + block)
+            corners = compute_box_corners(
+                x,
+                y,
+                sin_psi,
+                cos_psi,
+                length=length[block_slice],
+                width=width[block_slice],
+                poi_y=poi_y[block_slice],
+            )
+            # 全時刻・4つの角の座標の範囲（車両が通過した範囲）
+            block_metrics = {
+                self.df_sweep_columns.swept_x_min: corners[..., 0].min(axis=(1, 2)),
+                self.df_sweep_columns.swept_x_max: corners[..., 0].max(axis=(1, 2)),
+                self.df_sweep_columns.swept_y_min: corners[..., 1].min(axis=(1, 2)),
+                self.df_sweep_columns.swept_y_max: corners[..., 1].max(axis=(1, 2)),
+            }
+            front_left = corners[:, :, front_left_index, :]
+            if obj_points is not None:
+                min_gap, ego_index, _ = find_minimum_distances(front_left, obj_points)
+                block_metrics[self.df_sweep_columns.min_gap] = min_gap
+                block_metrics[self.df_sweep_columns.min_gap_time] = time[ego_index]
+            if has_swept_zones:
+                block_metrics.update(
+                    zone_metric_calculator.compute(
+                        arrays, experiment_condition, reference_points=front_left
+                    )
+                )
+            for column, values in block_metrics.items():
+                metrics.setdefault(column, []).append(values)
+
+        df_sweep = df_parameters.reset_index()
+        df_sweep[self.df_sweep_columns.simout_file] = file_name
+        df_sweep[self.df_sweep_columns.experiment_condition] = experiment_condition
+        df_sweep[self.df_sweep_columns.min_gap] = np.nan
+        df_sweep[self.df_sweep_columns.min_gap_time] = np.nan
+        for column, values in metrics.items():
+            df_sweep[column] = np.concatenate(values)
+        return df_sweep
@@ -0,0 +1,146 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_result_schema import DfResultSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_arrays import SimoutArrays
+
+
+def cross_correlate_fft(inputs: np.ndarray, responses: np.ndarray) -> np.ndarray:
+    """
+    FFTで全てのずれ（ラグ）の正規化相互相関をまとめて計算
+
+    Args:
+        inputs (np.ndarray): 入力の信号 (k, n)
+        responses (np.ndarray): 応答の信号 (k, n)
+    Returns:
+        correlation (np.ndarray): (k, 2n-1) の相関係数。列lはラグ l-(n-1) サンプル
+            （正のラグは応答が入力より遅れていることを表す）
+    """
+    inputs = inputs - inputs.mean(axis=1, keepdims=True)
+    responses = responses - responses.mean(axis=1, keepdims=True)
+    n = inputs.shape[1]
+    # 循環相関が重ならないように 2n-1 以上の2のべき乗までゼロ埋めする
+    n_fft = 1 << int(2 * n - 1).bit_length()
+    spectrum = np.conj(np.fft.rfft(inputs, n_fft, axis=1)) * np.fft.rfft(
+        responses, n_fft, axis=1
+    )
+    circular = np.fft.irfft(spectrum, n_fft, axis=1)
+    # 負のラグは末尾に並んでいるので、ラグの昇順に並べ替える
+    correlation = np.concatenate(
+        [circular[:, n_fft - (n - 1) :], circular[:, :n]], axis=1
+    )
+    norm = np.sqrt((inputs**2).sum(axis=1) * (responses**2).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return correlation / norm[:, None]
+
+
+class LagEstimator:
+    """
+    運転者の入力（アクセル・ブレーキ）から車両の応答（加速度）までの遅れ時間を、
+    相互相関が最大（絶対値）になるラグとして推定する。
+    相互相関はFFTで計算し、長さが同じ実験データはまとめて1回のFFTで処理する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # 入力の信号（DfSimoutSchemaの変数名）。応答は全てego_a
+    INPUT_CHANNELS = ["Gas_Out", "Brake_Out"]
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_result_columns = DfResultSchema()
+        self.df_simout_columns = DfSimoutSchema()
+
+    def estimate(self, arrays) -> dict:
+        """
+        1つの実験データの遅れ時間と相関のピークを計算
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+        Returns:
+            lag_dict (dict): 入力ごとの遅れ時間[s]と相関のピーク
+        """
+        return self._estimate_group([arrays])[0]
+
+    def estimate_files(self, file_names: list[str]) -> pd.DataFrame:
+        """
+        複数の実験データの遅れ時間と相関のピークを、長さが同じファイルごとにまとめて計算
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+        Returns:
+            df_lags (pd.DataFrame): simout_file列と入力ごとの遅れ時間・相関のピーク
+        """
+        arrays_dict = {
+            file_name: SimoutArrays.open(file_name, self.config)
+            for file_name in dict.fromkeys(file_names)
+        }
+        groups: dict[int, list[str]] = {}
+        for file_name, arrays in arrays_dict.items():
+            groups.setdefault(len(arrays), []).append(file_name)
+
+        lag_dicts = {}
+        for group_files in groups.values():
+            self.logger.debug(
+                f"{len(group_files)} 件の実験データの遅れ時間をまとめて計算します"
+            )
+            group_lags = self._estimate_group([arrays_dict[f] for f in group_files])
+            lag_dicts.update(zip(group_files, group_lags))
+
+        df_lags = pd.DataFrame(
+            [
+                {self.df_result_columns.simout_file: file_name, **lag_dicts[file_name]}
+                for file_name in arrays_dict
+            ]
+        )
+        return df_lags
+
+    def _estimate_group(self, arrays_list: list) -> list[dict]:
+        """長さが同じ実験データの遅れ時間と相関のピークを計算"""
+        time = np.asarray(arrays_list[0][self.df_simout_columns.time])
+        dt = time[1] - time[0]
+        n = len(time)
+        lags = np.arange(-(n - 1), n)
+        # 探索するラグの範囲（max_lagがNoneの場合は全て）
+        max_lag = self.config.processing.max_lag
+        searched = (
+            np.abs(lags) <= int(round(max_lag / dt))
+            if max_lag is not None
+            else np.ones(len(lags), dtype=bool)
+        )
+
+        responses = np.stack(
+            [np.asarray(arrays[self.df_simout_columns.ego_a]) for arrays in arrays_list]
+        )
+        lag_dicts = [{} for _ in arrays_list]
+        for channel in self.INPUT_CHANNELS:
+            inputs = np.stack(
+                [
+                    np.asarray(arrays[getattr(self.df_simout_columns, channel)])
+                    for arrays in arrays_list
+                ]
+            )
+            correlation = cross_correlate_fft(inputs, responses)[:, searched]
+            # ブレーキは負の加速度として現れるため、絶対値が最大のラグを探す
+            peak_index = np.argmax(np.nan_to_num(np.abs(correlation)), axis=1)
+            peak = correlation[np.arange(len(arrays_list)), peak_index]
+            peak_lag = lags[searched][peak_index] * dt
+            # 一定の信号（全く踏まなかった場合など）は相関が定義できないため、遅れ時間もNaNとする
+            undefined = np.isnan(correlation).all(axis=1)
+            peak = np.where(undefined, np.nan, peak)
+            peak_lag = np.where(undefined, np.nan, peak_lag)
+            for i, lag_dict in enumerate(lag_dicts):
+                lag_dict[getattr(self.df_result_columns, f"{channel}_lag")] = float(
+                    peak_lag[i]
+                )
+                lag_dict[
+                    getattr(self.df_result_columns, f"{channel}_lag_correlation")
+                ] = float(peak[i])
+        return lag_dicts
@@ -1,11 +1,14 @@
 import logging
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from config import Config
 from schemas.df_processed_schema import DfProcessedSchema
 from schemas.df_result_schema import DfResultSchema
 from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_reader import read_simout_csv
 
 
 class MetricCalculator:
@@ -13,6 +16,9 @@ class MetricCalculator:
     指標の計算を行う。
     """
 
+    # 指標計算に必要な列（DfSimoutSchemaの変数名）
+    REQUIRED_COLUMNS = ["time", "ego_v", "Gas_Out", "Brake_Out"]
+
     def __init__(self, config: Config, logger: logging.Logger):
         """
         指標計算クラス
@@ -40,8 +46,11 @@ class MetricCalculator:
         Returns:
             filtered_df (pd.Dataframe): 時刻抽出されたdf
         """
-        filtered_df = df[df[self.df_simout_columns.time] >= start_time]
-        filtered_df = filtered_df[filtered_df[self.df_simout_columns.time] <= end_time]
+        # 時刻は昇順のため、二分探索で範囲の行を求めて1回だけ切り出す
+        time = df[self.df_simout_columns.time].to_numpy()
+        i0 = np.searchsorted(time, start_time, side="left")
+        i1 = np.searchsorted(time, end_time, side="right")
+        filtered_df = df.iloc[i0:i1]
 
         return filtered_df
 
@@ -126,4 +135,70 @@ class MetricCalculator:
         }
 
         return brake_and_gas_dict
-        return brake_and_gas_dict
+
+    def compute_summary(self, arrays, dt: float) -> dict:
+        """
+        平均速度、走行距離、ペダル量積分値を1回の走査でまとめて計算する。
+        DataFrameに列を追加しないため、呼び出し元のデータは変更されない。
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+            dt (float): サンプリング周期
+        Returns:
+            summary_dict (dict): 平均速度、走行距離、ブレーキ・アクセル量の積分
+        """
+        sums = self._reduce_sums(arrays)
+        return self._summary_from_sums(sums, dt)
+
+    def calculate_summary_streaming(self, path: Path, chunk_size: int) -> dict:
+        """
+        生データを分割して読み込み、平均速度、走行距離、ペダル量積分値を計算する。
+        使用メモリは分割の行数分に抑えられ、結果は一括計算と同じ値になる。
+
+        Args:
+            path (Path): simoutのCSVのパス
+            chunk_size (int): 一度に読み込む行数
+        Returns:
+            summary_dict (dict): 平均速度、走行距離、ブレーキ・アクセル量の積分
+        """
+        sums = None
+        first_times = []
+
+        for chunk in read_simout_csv(
+            path, columns=self.REQUIRED_COLUMNS, chunksize=chunk_size
+        ):
+            if len(first_times) < 2:
+                first_times.extend(
+                    chunk[self.df_simout_columns.time].iloc[: 2 - len(first_times)]
+                )
+            chunk_sums = self._reduce_sums(chunk)
+            if sums is None:
+                sums = chunk_sums
+            else:
+                sums = {key: sums[key] + value for key, value in chunk_sums.items()}
+
+        if len(first_times) < 2:
+            raise ValueError(f"'{path}' の行数が不足しているため指標を計算できません")
+        dt = first_times[1] - first_times[0]
+        return self._summary_from_sums(sums, dt)
+
+    def _reduce_sums(self, arrays) -> dict:
+        """指標計算に必要な合計値"""
+        velocity = np.asarray(arrays[self.df_simout_columns.ego_v])
+        return {
+            "n_rows": len(velocity),
+            "velocity": velocity.sum(),
+            "abs_velocity": np.abs(velocity).sum(),
+            "Brake_Out": np.asarray(arrays[self.df_simout_columns.Brake_Out]).sum(),
+            "Gas_Out": np.asarray(arrays[self.df_simout_columns.Gas_Out]).sum(),
+        }
+
+    def _summary_from_sums(self, sums: dict, dt: float) -> dict:
+        """合計値から指標を計算"""
+        summary_dict = {
+            self.df_result_columns.average_velocity: sums["velocity"] / sums["n_rows"],
+            self.df_result_columns.total_mileage: sums["abs_velocity"] * dt,
+            self.df_result_columns.Brake_Out_sum: sums["Brake_Out"] * dt,
+            self.df_result_columns.Gas_Out_sum: sums["Gas_Out"] * dt,
+        }
+        return summary_dict
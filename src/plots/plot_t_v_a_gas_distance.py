@@ -5,6 +5,7 @@ import seaborn as sns
 from matplotlib.figure import Figure
 
 from config import Config
+from schemas.df_distance_band_schema import DfDistanceBandSchema
 from schemas.df_processed_schema import DfProcessedSchema
 from schemas.df_simout_schema import DfSimoutSchema
 from src.metric_calculator import MetricCalculator
@@ -17,6 +18,9 @@ metric_calculator: MetricCalculator = MetricCalculator(config=config, logger=Non
 df_processed_columns = DfProcessedSchema()
 df_simout_columns = DfSimoutSchema()
 
+# プロットに必要な列（DfSimoutSchemaの変数名）
+PLOT_COLUMNS = ["time", "ego_a", "ego_v", "Brake_Out"]
+
 
 def plot_t_v_a_gas_distance_by_type(
     config,
@@ -116,6 +120,78 @@ def plot_t_v_a_gas_distance_by_type(
     return fig
 
 
+def plot_distance_bands_by_type(
+    config,
+    df_bands: pd.DataFrame,
+    velocity: int,
+    experiment_type: str,
+) -> Figure:
+    """
+    距離を横軸にして、被験者間の平均とパーセンタイルの帯を実験パターンごとにプロットする関数。
+
+    Args:
+        df_bands (pd.DataFrame): DistanceResampler.aggregateの結果
+        velocity (int): 実験の設定速度
+        experiment_type (str): 実験条件（コース）
+
+    Returns:
+        fig (Figure): プロットした図のオブジェクト。
+    """
+    label_font_size = 20
+    df_band_columns = DfDistanceBandSchema()
+    df_bands = df_bands[
+        (df_bands[df_band_columns.velocity] == velocity)
+        & (df_bands[df_band_columns.experiment_condition] == experiment_type)
+    ]
+    # 信号ごとの表示倍率（速度はkm/hに変換）
+    channel_scales = {
+        "ego_v": config.experiment.ms_to_kmh,
+        "ego_a": 1,
+        "Brake_Out": 1,
+    }
+
+    fig, axes = plt.subplots(nrows=3, figsize=(12, 12))
+    for ax, (channel, scale) in zip(axes, channel_scales.items()):
+        df_channel = df_bands[df_bands[df_band_columns.channel] == channel]
+        distance = df_channel[df_band_columns.distance]
+        ax.fill_between(
+            distance,
+            df_channel[df_band_columns.lower] * scale,
+            df_channel[df_band_columns.upper] * scale,
+            color=palette_20[0],
+            alpha=0.3,
+            label="{}-{} percentile".format(*config.processing.band_percentiles),
+        )
+        ax.plot(
+            distance,
+            df_channel[df_band_columns.mean] * scale,
+            color=palette_20[0],
+            label="mean",
+            linewidth=3,
+        )
+        ax.set_xlabel("Distance [m]")
+        ax.set_xlim(0, 1)
+        ax.tick_params(axis="y", which="both", pad=10)
+
+    axes[0].set_ylabel("Velocity [km/h]", fontsize=label_font_size)
+    axes[0].set_yticks(np.arange(0, 3, 1))
+    axes[0].set_ylim(0, 3)
+
+    axes[1].set_ylabel("Acceleration [m/s$^2$]", fontsize=label_font_size)
+    axes[1].set_yticks(np.arange(-1, 1, 0.5))
+    axes[1].set_ylim(-1, 1)
+
+    axes[2].set_ylabel("Amount of Manual Brake[-]", fontsize=label_font_size)
+    axes[2].set_yticks(np.arange(0, 1.1, 0.25))
+    axes[2].set_ylim(0, 1)
+
+    handles, labels = axes[0].get_legend_handles_labels()
+    fig.legend(handles, labels, loc="upper left", bbox_to_anchor=(1.0, 0.95))
+    plt.tight_layout()
+
+    return fig
+
+
 def plot_t_v_a_gas_distance_individual(
     config,
     df_dict: dict[pd.DataFrame],
@@ -1,5 +1,3 @@
-from itertools import product
-
 import numpy as np
 import plotly.graph_objects as go
 
@@ -8,7 +6,7 @@ from schemas.df_processed_schema import DfProcessedSchema
 df_processed_columns = DfProcessedSchema()
 
 
-# 最短距離を計算する関数
+# 軌跡を可視化する関数
 def plot_trajectory(
     df,
     ego_x_column=df_processed_columns.Ego_front_left_x,
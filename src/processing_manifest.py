@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from config import Config
+from schemas.df_subject_master import DfSubjectMasterSchema
+
+
+class ProcessingManifest:
+    """
+    被験者ごとの入力（生データの内容、マスターの行、実験設定）のハッシュを記録し、
+    前回の処理から変更があった被験者だけを再計算できるようにする。
+
+    Attributes:
+        manifest_path (Path): マニフェストファイルのパス
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # 指標の計算方法を変更した場合は上げる（全被験者が再計算される）
+    VERSION = 2
+
+    def __init__(self, manifest_path: Path, config: Config, logger: logging.Logger):
+        self.manifest_path: Path = Path(manifest_path)
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_subject_master = DfSubjectMasterSchema()
+        self.subjects: dict = self.load()
+        self._file_hash_cache: dict = {}
+
+    def load(self) -> dict:
+        """
+        マニフェストを読み込む。存在しない、またはバージョンが異なる場合は空とする。
+
+        Returns:
+            subjects (dict): 被験者ID → 記録内容
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if manifest.get("version") != self.VERSION:
+            self.logger.info(
+                "マニフェストのバージョンが異なるため全被験者を再計算します"
+            )
+            return {}
+        return manifest.get("subjects", {})
+
+    def save(self):
+        """マニフェストを保存"""
+        manifest = {"version": self.VERSION, "subjects": self.subjects}
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def compute_fingerprint(self, subject: dict) -> dict:
+        """
+        被験者の入力のハッシュを計算
+
+        Args:
+            subject (dict): 被験者情報（マスターファイルの1行）
+        Returns:
+            fingerprint (dict): 入力ファイルごとのハッシュと、入力全体のハッシュ
+        """
+        input_files = {}
+        for key in (
+            self.df_subject_master.file_name_60,
+            self.df_subject_master.file_name_50,
+            self.df_subject_master.file_name_40,
+        ):
+            file_name = subject.get(key)
+            if not isinstance(file_name, str):
+                continue
+            input_files[file_name] = self._hash_file(
+                self.config.paths.file_manager.get_simout_path(file_name)
+            )
+
+        master_row = {
+            key: None if pd.isnull(value) else str(value)
+            for key, value in subject.items()
+        }
+        inputs = {
+            "input_files": input_files,
+            "master_row": master_row,
+            "experiment_config": self._get_config_values(),
+        }
+        inputs_json = json.dumps(
+            inputs, sort_keys=True, ensure_ascii=False, default=str
+        )
+        digest = hashlib.sha256(inputs_json.encode("utf-8")).hexdigest()
+        return {"input_files": input_files, "digest": digest}
+
+    def is_up_to_date(self, subject_id, fingerprint: dict, result_path: Path) -> bool:
+        """
+        前回の処理から入力が変わっておらず、結果ファイルが存在するか
+
+        Args:
+            subject_id: 被験者ID
+            fingerprint (dict): compute_fingerprintの結果
+            result_path (Path): 被験者の結果ファイルのパス
+        Returns:
+            is_up_to_date (bool): 再計算が不要ならTrue
+        """
+        entry = self.subjects.get(str(subject_id))
+        if entry is None or entry.get("digest") != fingerprint["digest"]:
+            return False
+        if entry.get("result_file") != Path(result_path).name:
+            return False
+        return os.path.exists(result_path)
+
+    def update(self, subject_id, fingerprint: dict, result_path: Path):
+        """被験者の記録を更新"""
+        self.subjects[str(subject_id)] = {
+            "digest": fingerprint["digest"],
+            "input_files": fingerprint["input_files"],
+            "result_file": Path(result_path).name,
+        }
+
+    def _get_config_values(self) -> dict:
+        """指標に影響する設定値"""
+        return {
+            "experiment": vars(self.config.experiment),
+            "metric_stages": self._get_metric_stages(),
+            "window_features": {
+                key: getattr(self.config.processing, key)
+                for key in (
+                    "window_features",
+                    "window_length",
+                    "window_hop",
+                    "pedal_threshold",
+                )
+            },
+            "signal_conditioning": {
+                key: getattr(self.config.processing, key)
+                for key in (
+                    "signal_conditioning",
+                    "conditioning_channels",
+                    "conditioning_filter",
+                    "moving_average_window",
+                    "lowpass_cutoff",
+                    "lowpass_length",
+                )
+            },
+            "lag_metrics": {
+                key: getattr(self.config.processing, key)
+                for key in ("lag_metrics", "max_lag")
+            },
+        }
+
+    def _get_metric_stages(self) -> list[str]:
+        """
+        設定で実際に計算される指標の段階（分割読み込み・まとめて計算の有無で変わる）
+
+        Returns:
+            stages (list[str]): 指標の段階の名前
+        """
+        processing = self.config.processing
+        stages = ["summary"]
+        if processing.batch_engine:
+            stages.append("batch_engine")
+            if processing.distribution_metrics:
+                stages.append("distribution_metrics")
+        elif processing.streaming:
+            # 分割読み込み時は生データ全体が必要な指標を計算しない
+            return stages
+        if processing.signal_conditioning:
+            stages.append("peak_jerk")
+        stages.extend(["min_gap", "zone_metrics"])
+        if processing.lag_metrics:
+            stages.append("lag_metrics")
+        return stages
+
+    def _hash_file(self, path: Path) -> str | None:
+        """ファイルの内容のハッシュ（存在しない場合はNone）"""
+        if path in self._file_hash_cache:
+            return self._file_hash_cache[path]
+        try:
+            with open(path, "rb") as f:
+                file_hash = hashlib.file_digest(f, "sha256").hexdigest()
+        except FileNotFoundError:
+            file_hash = None
+        self._file_hash_cache[path] = file_hash
+        return file_hash
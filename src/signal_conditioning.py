@@ -0,0 +1,172 @@
+import numpy as np
+
+from schemas.df_conditioned_schema import DfConditionedSchema
+from schemas.df_simout_schema import DfSimoutSchema
+
+# タップ数がこれより多いFIRフィルタはFFTで畳み込む（少ない場合はnp.convolveの方が速い）
+FFT_CONVOLUTION_MIN_TAPS = 64
+
+
+def moving_average_taps(n_taps: int) -> np.ndarray:
+    """
+    移動平均のフィルタ係数
+
+    Args:
+        n_taps (int): 平均するサンプル数（偶数の場合は1を足して奇数にする）
+    Returns:
+        taps (np.ndarray): 係数 (n_taps,)
+    """
+    n_taps = max(int(n_taps), 1) | 1
+    return np.full(n_taps, 1 / n_taps)
+
+
+def lowpass_fir_taps(cutoff: float, dt: float, n_taps: int) -> np.ndarray:
+    """
+    窓関数法（ハミング窓）で設計したローパスFIRフィルタの係数（直流のゲインは1）
+
+    Args:
+        cutoff (float): 遮断周波数[Hz]
+        dt (float): サンプリング周期[s]
+        n_taps (int): タップ数（偶数の場合は1を足して奇数にする）
+    Returns:
+        taps (np.ndarray): 係数 (n_taps,)
+    """
+    n_taps = max(int(n_taps), 1) | 1
+    # ナイキスト周波数に対する遮断周波数の比
+    normalized_cutoff = min(2 * cutoff * dt, 1.0)
+    n = np.arange(n_taps) - (n_taps - 1) / 2
+    taps = normalized_cutoff * np.sinc(normalized_cutoff * n) * np.hamming(n_taps)
+    return taps / taps.sum()
+
+
+def fir_filter(values: np.ndarray, taps: np.ndarray) -> np.ndarray:
+    """
+    左右対称なFIRフィルタを位相ずれなしでかける。
+    両端は端の値で延長してから畳み込むため、出力は入力と同じ長さになる。
+
+    Args:
+        values (np.ndarray): 信号 (n,)
+        taps (np.ndarray): 左右対称で長さが奇数の係数
+    Returns:
+        filtered (np.ndarray): フィルタ後の信号 (n,)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    half = len(taps) // 2
+    padded = np.pad(values, half, mode="edge")
+    if len(taps) <= FFT_CONVOLUTION_MIN_TAPS:
+        return np.convolve(padded, taps, mode="valid")
+    # 循環畳み込みが重ならないように 全長+タップ数-1 以上の2のべき乗までゼロ埋めする
+    n_fft = 1 << int(len(padded) + len(taps) - 2).bit_length()
+    full = np.fft.irfft(np.fft.rfft(padded, n_fft) * np.fft.rfft(taps, n_fft), n_fft)
+    return full[len(taps) - 1 : len(padded)]
+
+
+def differentiate(values: np.ndarray, dt: float) -> np.ndarray:
+    """
+    中心差分で微分（両端は片側差分）
+
+    Args:
+        values (np.ndarray): 信号 (n,)
+        dt (float): サンプリング周期[s]
+    Returns:
+        derivative (np.ndarray): 微分 (n,)
+    """
+    return np.gradient(np.asarray(values, dtype=np.float64), dt)
+
+
+class SignalConditioner:
+    """
+    生データの信号の前処理（移動平均またはローパスFIRフィルタ、加加速度の計算）を行う。
+    前処理はSimoutCacheが生データのキャッシュを作成した後に1回だけ行い、
+    結果は生データと同じキャッシュフォルダに列ごとの.npyとして保存される。
+    設定値は毎回ProcessingConfigから読むため、設定を変更するとキャッシュが作り直される。
+
+    Attributes:
+        processing (ProcessingConfig): 処理の設定
+    """
+
+    def __init__(self, processing):
+        self.processing = processing
+        self.df_simout_columns = DfSimoutSchema()
+        self.df_conditioned_columns = DfConditionedSchema()
+
+    @property
+    def enabled(self) -> bool:
+        """前処理を行うか"""
+        return self.processing.signal_conditioning
+
+    def get_settings(self) -> dict:
+        """前処理の結果に影響する設定値（キャッシュのキー）"""
+        keys = (
+            "conditioning_channels",
+            "conditioning_filter",
+            "moving_average_window",
+            "lowpass_cutoff",
+            "lowpass_length",
+        )
+        return {key: getattr(self.processing, key) for key in keys}
+
+    def get_column(self, channel: str) -> str:
+        """
+        信号を読む列のカラム名（前処理を行う信号はフィルタ後の列、それ以外は生データの列）
+
+        Args:
+            channel (str): DfSimoutSchemaの変数名
+        Returns:
+            column (str): カラム名
+        """
+        if self.enabled and channel in self.processing.conditioning_channels:
+            return getattr(self.df_conditioned_columns, f"{channel}_filtered")
+        return getattr(self.df_simout_columns, channel)
+
+    def get_taps(self, dt: float) -> np.ndarray:
+        """
+        設定に応じたフィルタ係数
+
+        Args:
+            dt (float): サンプリング周期[s]
+        Returns:
+            taps (np.ndarray): 係数
+        """
+        processing = self.processing
+        if processing.conditioning_filter == "moving_average":
+            return moving_average_taps(round(processing.moving_average_window / dt))
+        if processing.conditioning_filter == "fir":
+            return lowpass_fir_taps(
+                processing.lowpass_cutoff, dt, round(processing.lowpass_length / dt)
+            )
+        raise ValueError(
+            f"conditioning_filter '{processing.conditioning_filter}' には対応していません"
+        )
+
+    def apply(self, arrays) -> dict[str, np.ndarray]:
+        """
+        フィルタ後の信号と加加速度を計算
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame | dict): カラム名で各列の配列を取得できるもの
+        Returns:
+            conditioned (dict[str, np.ndarray]): カラム名 → 前処理後の信号
+        """
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        dt = time[1] - time[0]
+        taps = self.get_taps(dt)
+
+        conditioned = {}
+        for channel in self.processing.conditioning_channels:
+            values = np.asarray(arrays[getattr(self.df_simout_columns, channel)])
+            conditioned[getattr(self.df_conditioned_columns, f"{channel}_filtered")] = (
+                fir_filter(values, taps)
+            )
+
+        # 微分はノイズを増幅するため、加加速度は必ずフィルタ後の加速度から求める
+        acceleration_column = self.df_conditioned_columns.ego_a_filtered
+        acceleration = conditioned.get(acceleration_column)
+        if acceleration is None:
+            acceleration = fir_filter(
+                np.asarray(arrays[self.df_simout_columns.ego_a]), taps
+            )
+        conditioned[self.df_conditioned_columns.ego_jerk] = differentiate(
+            acceleration, dt
+        )
+        return conditioned
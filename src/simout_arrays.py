@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_conditioned_schema import DfConditionedSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_cache import get_simout_cache
+
+
+class SimoutArrays:
+    """
+    simoutのキャッシュ（列ごとの.npy）を読み取り専用でメモリマップし、各列をNumPy配列として提供する。
+    列は最初にアクセスされた時点でマップされるため、使用しない列はメモリに読み込まれない。
+
+    `arrays.ego_v` のようにスキーマの変数名で、または `arrays["simout3"]` のように
+    実際のカラム名でアクセスできる。前処理を行う設定の場合は `arrays.ego_jerk` のように
+    前処理した列（DfConditionedSchema）にもアクセスできる。
+
+    Attributes:
+        entry_dir (Path): キャッシュフォルダ
+        columns (list[str]): 利用可能なカラム名
+        n_rows (int): 行数
+    """
+
+    def __init__(self, entry_dir: Path, columns: list[str], n_rows: int):
+        self.entry_dir: Path = Path(entry_dir)
+        self.columns: list[str] = list(columns)
+        self.n_rows: int = n_rows
+        self._column_map: dict = {
+            **DfSimoutSchema.get_column_map(),
+            **DfConditionedSchema.get_column_map(),
+        }
+        self._arrays: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, file_name: str, config: Config | None = None):
+        """
+        simoutのファイル名を指定して開く。キャッシュが無い、または古い場合は作成する。
+
+        Args:
+            file_name (str): simoutのファイル名
+            config (Config, optional): 設定オブジェクト
+        Returns:
+            arrays (SimoutArrays): メモリマップされた列へのアクセサ
+        """
+        config = config or Config()
+        simout_cache = get_simout_cache(config)
+        entry_dir = simout_cache.ensure(
+            config.paths.file_manager.get_simout_path(file_name)
+        )
+        meta = simout_cache.load_meta(entry_dir)
+        return cls(
+            entry_dir, columns=simout_cache.get_columns(meta), n_rows=meta["n_rows"]
+        )
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        column = self._column_map.get(column, column)
+        if column not in self._arrays:
+            if column not in self.columns:
+                raise KeyError(column)
+            self._arrays[column] = np.load(
+                self.entry_dir / f"{column}.npy", mmap_mode="r"
+            )
+        return self._arrays[column]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name.startswith("_") or name not in self._column_map:
+            raise AttributeError(name)
+        return self[name]
+
+    def __contains__(self, column: str) -> bool:
+        return self._column_map.get(column, column) in self.columns
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def keys(self) -> list[str]:
+        return list(self.columns)
+
+    def to_dataframe(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        指定した列だけをDataFrameとして取得（値はコピーされる）
+
+        Args:
+            columns (list[str], optional): カラム名のリスト。Noneの場合は全列
+        Returns:
+            df (pd.DataFrame): 指定した列のdf
+        """
+        columns = self.columns if columns is None else columns
+        columns = [self._column_map.get(column, column) for column in columns]
+        return pd.DataFrame({column: np.array(self[column]) for column in columns})
@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_conditioned_schema import DfConditionedSchema
+from src.signal_conditioning import SignalConditioner
+from src.simout_reader import read_simout_csv, resolve_simout_columns
+
+logger = logging.getLogger(__name__)
+
+
+class SimoutCache:
+    """
+    simoutのCSVを列ごとの.npyファイルに変換してキャッシュする。
+    キャッシュはCSVのパス・サイズ・更新時刻をキーとし、CSVが更新された場合は自動で再作成する。
+    conditionerが設定されている場合は、前処理（フィルタ、微分）した信号も同じフォルダに保存する。
+
+    Attributes:
+        cache_dir (Path): キャッシュを格納するフォルダ
+        conditioner (SignalConditioner | None): 信号の前処理
+    """
+
+    META_FILE_NAME = "meta.json"
+
+    def __init__(self, cache_dir: Path, conditioner=None):
+        self.cache_dir: Path = Path(cache_dir)
+        self.conditioner = conditioner
+
+    def get_entry_dir(self, source_path: Path) -> Path:
+        """
+        CSVに対応するキャッシュフォルダのパスを取得
+
+        Args:
+            source_path (Path): simoutのCSVのパス
+        Returns:
+            entry_dir (Path): キャッシュフォルダのパス
+        """
+        return self.cache_dir / Path(source_path).stem
+
+    def read(
+        self,
+        source_path: Path,
+        columns: list[str] | None = None,
+        float32: bool = False,
+    ) -> pd.DataFrame:
+        """
+        CSVをキャッシュ経由で読み込む。キャッシュが無い、または古い場合は作成する。
+
+        Args:
+            source_path (Path): simoutのCSVのパス
+            columns (list[str], optional): 読み込む列（変数名またはカラム名）。
+                Noneの場合は全列（前処理を行う場合は前処理した列も含む）
+            float32 (bool): Trueの場合はfloat32に変換する
+        Returns:
+            df (pd.DataFrame): 生データ
+        """
+        entry_dir = self.ensure(source_path)
+        meta = self.load_meta(entry_dir)
+        columns = (
+            self.get_columns(meta)
+            if columns is None
+            else self._resolve_columns(columns, meta)
+        )
+        arrays = {column: np.load(entry_dir / f"{column}.npy") for column in columns}
+        if float32:
+            arrays = {
+                column: array.astype(np.float32) for column, array in arrays.items()
+            }
+        df = pd.DataFrame(arrays)
+        return df
+
+    def ensure(self, source_path: Path) -> Path:
+        """
+        有効なキャッシュが存在することを保証し、そのフォルダを返す。
+        前処理を行う場合は、前処理した列が現在の設定で作成されていることも保証する。
+
+        Args:
+            source_path (Path): simoutのCSVのパス
+        Returns:
+            entry_dir (Path): キャッシュフォルダのパス
+        """
+        source_path = Path(source_path)
+        entry_dir = self.get_entry_dir(source_path)
+        if not self.is_valid(source_path):
+            self._build(source_path, entry_dir)
+        if self.is_conditioning() and not self.is_conditioned(entry_dir):
+            self._build_conditioned(entry_dir)
+        return entry_dir
+
+    def is_conditioning(self) -> bool:
+        """前処理を行う設定か"""
+        return self.conditioner is not None and self.conditioner.enabled
+
+    def is_conditioned(self, entry_dir: Path) -> bool:
+        """
+        前処理した列が現在の設定で作成済みかチェック
+
+        Args:
+            entry_dir (Path): キャッシュフォルダのパス
+        Returns:
+            is_conditioned (bool): 前処理した列が使用可能ならTrue
+        """
+        meta = self.load_meta(entry_dir)
+        if meta is None or meta.get("conditioning") != self.conditioner.get_settings():
+            return False
+        return all(
+            (entry_dir / f"{column}.npy").exists()
+            for column in meta["conditioned_columns"]
+        )
+
+    def get_columns(self, meta: dict) -> list[str]:
+        """
+        利用可能なカラム名（前処理を行う場合は前処理した列も含む）
+
+        Args:
+            meta (dict): キャッシュのメタ情報
+        Returns:
+            columns (list[str]): カラム名のリスト
+        """
+        if not self.is_conditioning():
+            return list(meta["columns"])
+        return list(meta["columns"]) + list(meta.get("conditioned_columns", []))
+
+    def is_valid(self, source_path: Path) -> bool:
+        """
+        キャッシュがCSVの現在の状態と一致しているかチェック
+
+        Args:
+            source_path (Path): simoutのCSVのパス
+        Returns:
+            is_valid (bool): キャッシュが使用可能ならTrue
+        """
+        entry_dir = self.get_entry_dir(source_path)
+        meta = self.load_meta(entry_dir)
+        if meta is None or meta.get("source") != self.get_source_key(source_path):
+            return False
+        return all((entry_dir / f"{column}.npy").exists() for column in meta["columns"])
+
+    def clear(self):
+        """キャッシュを全て削除"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _resolve_columns(self, columns: list[str], meta: dict) -> list[str]:
+        """変数名またはカラム名を、生データの列と前処理した列に分けてカラム名に変換"""
+        conditioned_map = DfConditionedSchema.get_column_map()
+        raw_columns = []
+        conditioned_columns = []
+        for column in columns:
+            column = conditioned_map.get(column, column)
+            if column in conditioned_map.values():
+                conditioned_columns.append(column)
+            else:
+                raw_columns.append(column)
+        missing = set(conditioned_columns) - set(self.get_columns(meta))
+        if missing:
+            raise KeyError(f"前処理した列 {sorted(missing)} がキャッシュにありません")
+        if raw_columns:
+            raw_columns = resolve_simout_columns(raw_columns)
+        return raw_columns + conditioned_columns
+
+    def _build(self, source_path: Path, entry_dir: Path):
+        """
+        CSVを読み込み、列ごとに.npyとして保存する。
+        meta.jsonは最後に書き込むため、途中で失敗したキャッシュは無効として扱われる。
+        """
+        logger.debug(f"'{source_path}' のキャッシュを作成します")
+        source_key = self.get_source_key(source_path)
+        df = read_simout_csv(source_path)
+
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        meta_path = entry_dir / self.META_FILE_NAME
+        if meta_path.exists():
+            meta_path.unlink()
+        for column in df.columns:
+            self._atomic_save_npy(entry_dir / f"{column}.npy", df[column].to_numpy())
+
+        meta = {
+            "source": source_key,
+            "columns": list(df.columns),
+            "n_rows": len(df),
+        }
+        self._write_meta(entry_dir, meta)
+
+    def _build_conditioned(self, entry_dir: Path):
+        """
+        キャッシュ済みの生データの列から前処理した列を作成し、同じフォルダに保存する。
+        meta.jsonは最後に書き込むため、途中で失敗した場合は次回も作成し直す。
+        """
+        logger.debug(f"'{entry_dir.name}' の前処理した列を作成します")
+        meta = self.load_meta(entry_dir)
+        arrays = {
+            column: np.load(entry_dir / f"{column}.npy", mmap_mode="r")
+            for column in meta["columns"]
+        }
+        conditioned = self.conditioner.apply(arrays)
+        for column, array in conditioned.items():
+            self._atomic_save_npy(entry_dir / f"{column}.npy", array)
+        meta["conditioned_columns"] = list(conditioned)
+        meta["conditioning"] = self.conditioner.get_settings()
+        self._write_meta(entry_dir, meta)
+
+    @classmethod
+    def _write_meta(cls, entry_dir: Path, meta: dict):
+        """メタ情報を一時ファイルに書き込んでから置き換える"""
+        meta_path = entry_dir / cls.META_FILE_NAME
+        tmp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _atomic_save_npy(path: Path, array: np.ndarray):
+        """一時ファイルに書き込んでから置き換える（読み込み中のプロセスを壊さないため）"""
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_meta(cls, entry_dir: Path) -> dict | None:
+        """キャッシュのメタ情報を読み込む。存在しない場合はNone"""
+        meta_path = entry_dir / cls.META_FILE_NAME
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def get_source_key(source_path: Path) -> dict:
+        """キャッシュのキー（パス・サイズ・更新時刻）"""
+        stat = os.stat(source_path)
+        return {
+            "path": str(Path(source_path).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+
+def get_simout_cache(config: Config) -> SimoutCache:
+    """
+    設定に対応する生データのキャッシュ（キャッシュ作成時に、現在の前処理の設定で信号を前処理する）
+
+    Args:
+        config (Config): 設定オブジェクト
+    Returns:
+        simout_cache (SimoutCache): 生データのキャッシュ
+    """
+    return SimoutCache(
+        config.paths.folder_path_model.path_folder_simout_cache,
+        conditioner=SignalConditioner(config.processing),
+    )
+
+
+def read_simout(
+    config: Config,
+    file_name: str,
+    columns: list[str] | None = None,
+    float32: bool = False,
+) -> pd.DataFrame:
+    """
+    simoutのCSVをキャッシュ経由で、必要な列だけ読み込む
+
+    Args:
+        config (Config): 設定オブジェクト
+        file_name (str): simoutのファイル名
+        columns (list[str], optional): 読み込む列（変数名またはカラム名）。Noneの場合は全列
+        float32 (bool): Trueの場合はfloat32に変換する
+    Returns:
+        df (pd.DataFrame): 生データ
+    """
+    return get_simout_cache(config).read(
+        config.paths.file_manager.get_simout_path(file_name),
+        columns=columns,
+        float32=float32,
+    )
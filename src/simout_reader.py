@@ -0,0 +1,77 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from schemas.df_simout_schema import DfSimoutSchema
+
+
+def get_csv_engine(chunked: bool = False) -> str:
+    """
+    利用可能な最速のCSVパーサを返す（pyarrowはchunksize非対応のため分割読み込み時はC）
+
+    Args:
+        chunked (bool): 分割読み込みを行うか
+    Returns:
+        engine (str): pd.read_csvのengine
+    """
+    if not chunked and importlib.util.find_spec("pyarrow") is not None:
+        return "pyarrow"
+    return "c"
+
+
+def resolve_simout_columns(columns: list[str] | None = None) -> list[str]:
+    """
+    スキーマの変数名（ego_v など）または実際のカラム名（simout3 など）をカラム名に変換
+
+    Args:
+        columns (list[str], optional): 変数名またはカラム名のリスト。Noneの場合はスキーマの全列
+    Returns:
+        resolved_columns (list[str]): カラム名のリスト（スキーマの列順）
+    """
+    column_map = DfSimoutSchema.get_column_map()
+    if columns is None:
+        return list(column_map.values())
+    resolved = set()
+    for column in columns:
+        if column in column_map:
+            resolved.add(column_map[column])
+        elif column in column_map.values():
+            resolved.add(column)
+        else:
+            raise KeyError(f"'{column}' はDfSimoutSchemaに存在しない列です")
+    return [column for column in column_map.values() if column in resolved]
+
+
+def get_simout_dtypes(columns: list[str], float32: bool = False) -> dict:
+    """スキーマの列に対する明示的なdtype"""
+    dtype = np.float32 if float32 else np.float64
+    return {column: dtype for column in columns}
+
+
+def read_simout_csv(
+    path: Path,
+    columns: list[str] | None = None,
+    float32: bool = False,
+    chunksize: int | None = None,
+):
+    """
+    DfSimoutSchemaに基づいて、必要な列だけを型指定して読み込む
+
+    Args:
+        path (Path): simoutのCSVのパス
+        columns (list[str], optional): 読み込む列（変数名またはカラム名）。Noneの場合は全列
+        float32 (bool): Trueの場合はfloat32で読み込む
+        chunksize (int, optional): 指定した場合は行数ごとに分割して読み込むイテレータを返す
+    Returns:
+        df (pd.DataFrame | TextFileReader): 生データ
+    """
+    usecols = resolve_simout_columns(columns)
+    return pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype=get_simout_dtypes(usecols, float32=float32),
+        engine=get_csv_engine(chunked=chunksize is not None),
+        chunksize=chunksize,
+    )
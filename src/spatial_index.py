@@ -0,0 +1,310 @@
+import numpy as np
+
+
+class GridIndex:
+    """
+    2次元の点群を一様グリッドに登録し、近傍の点を二分探索で取り出す空間インデックス。
+    セルの大きさ以下の距離にある点は、必ず隣接する3×3セルのどこかに含まれる。
+
+    Attributes:
+        points (np.ndarray): 登録した点 (m, 2)
+        cell_size (float): セルの一辺の長さ
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        self.points: np.ndarray = np.asarray(points, dtype=np.float64)
+        self.cell_size: float = float(cell_size)
+        self.origin: np.ndarray = self.points.min(axis=0)
+
+        cells = self._to_cells(self.points)
+        self.n_cells_y: int = int(cells[:, 1].max()) + 3
+        keys = self._to_keys(cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def query_pairs(self, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        各クエリ点について、隣接する3×3セルに含まれる登録点の組を列挙
+
+        Args:
+            queries (np.ndarray): クエリ点 (n, 2)
+        Returns:
+            query_indices (np.ndarray): 組のクエリ点のインデックス
+            point_indices (np.ndarray): 組の登録点のインデックス
+        """
+        query_cells = self._to_cells(np.asarray(queries, dtype=np.float64))
+        query_indices_list = []
+        point_indices_list = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                neighbor_cells = query_cells + (dx, dy)
+                # グリッドの外側のセルには点が無い
+                inside = (
+                    (neighbor_cells[:, 0] >= 0)
+                    & (neighbor_cells[:, 1] >= 0)
+                    & (neighbor_cells[:, 1] < self.n_cells_y)
+                )
+                query_index = np.flatnonzero(inside)
+                keys = self._to_keys(neighbor_cells[query_index])
+                lo = np.searchsorted(self._sorted_keys, keys, side="left")
+                hi = np.searchsorted(self._sorted_keys, keys, side="right")
+                counts = hi - lo
+                has_points = counts > 0
+                query_index = query_index[has_points]
+                lo = lo[has_points]
+                counts = counts[has_points]
+
+                # 各クエリの [lo, hi) を連結したインデックスを作る
+                total = counts.sum()
+                if total == 0:
+                    continue
+                group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+                positions = np.repeat(lo, counts) + np.arange(total) - group_starts
+                query_indices_list.append(np.repeat(query_index, counts))
+                point_indices_list.append(self._order[positions])
+
+        if not query_indices_list:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(query_indices_list), np.concatenate(point_indices_list)
+
+    def _to_cells(self, points: np.ndarray) -> np.ndarray:
+        # グリッドの外周に1セルの余白を持たせる
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64) + 1
+
+    def _to_keys(self, cells: np.ndarray) -> np.ndarray:
+        return cells[:, 0] * self.n_cells_y + cells[:, 1]
+
+
+def densify_polyline(vertices: np.ndarray, resolution: float) -> np.ndarray:
+    """
+    折れ線の各区間を間隔resolution以下の点列に分割
+
+    Args:
+        vertices (np.ndarray): 折れ線の頂点 (k, 2)
+        resolution (float): 点の最大間隔
+    Returns:
+        points (np.ndarray): 分割した点列
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if len(vertices) < 2:
+        return vertices
+    segment_lengths = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+    n_divisions = np.maximum(np.ceil(segment_lengths / resolution), 1).astype(np.int64)
+    segment_index = np.repeat(np.arange(len(segment_lengths)), n_divisions)
+    # 区間内での何番目の点か
+    step_index = np.arange(n_divisions.sum()) - np.repeat(
+        np.cumsum(n_divisions) - n_divisions, n_divisions
+    )
+    fraction = step_index / n_divisions[segment_index]
+    points = (
+        vertices[segment_index]
+        + (vertices[segment_index + 1] - vertices[segment_index]) * fraction[:, None]
+    )
+    return np.vstack([points, vertices[-1:]])
+
+
+def find_minimum_distance(
+    points_a: np.ndarray,
+    points_b: np.ndarray,
+    max_coarse_points: int = 1000,
+    n_subdivisions: int = 8,
+    max_pairs_per_batch: int = 1_000_000,
+) -> tuple[float, int, int]:
+    """
+    2つの点群間の最短距離と、その点の組を求める（find_minimum_distancesの1組版）
+
+    Args:
+        points_a (np.ndarray): 点群 (n, 2)
+        points_b (np.ndarray): 点群 (m, 2)
+        max_coarse_points (int): 上限の計算に使う各点群の最大点数
+        n_subdivisions (int): 上限Uに対するセルの分割数
+        max_pairs_per_batch (int): 一度に距離を計算する点の組の最大数（メモリ使用量の上限）
+    Returns:
+        min_distance (float): 最短距離
+        index_a (int): points_aの点のインデックス
+        index_b (int): points_bの点のインデックス
+    """
+    min_distance, index_a, index_b = find_minimum_distances(
+        np.asarray(points_a, dtype=np.float64)[None],
+        points_b,
+        max_coarse_points=max_coarse_points,
+        n_subdivisions=n_subdivisions,
+        max_pairs_per_batch=max_pairs_per_batch,
+    )
+    return float(min_distance[0]), int(index_a[0]), int(index_b[0])
+
+
+def find_minimum_distances(
+    points_a: np.ndarray,
+    points_b: np.ndarray,
+    max_coarse_points: int = 1000,
+    n_subdivisions: int = 8,
+    max_pairs_per_batch: int = 1_000_000,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    複数の点群（グループ）それぞれについて、共通の点群points_bとの最短距離と、その点の組を求める。
+
+    間引いた点同士の総当たりでグループごとに最短距離の上限Uを求め、points_bを囲む矩形から
+    U以上離れた点を除いた後、残りの点とpoints_bをmax(U)/n_subdivisionsのセルにまとめ、GridIndexで距離max(U)以内にあるセルの組だけを
+    列挙する。セル同士の距離の下限が小さい組から点同士の距離を計算し、下限がそのグループの
+    現在の最短距離以上になった組は計算しないため、全組（p×n×m）の距離は計算しない。
+
+    Args:
+        points_a (np.ndarray): グループごとの点群 (p, n, 2)
+        points_b (np.ndarray): 点群 (m, 2)
+        max_coarse_points (int): 上限の計算に使う各点群の最大点数
+        n_subdivisions (int): 上限Uに対するセルの分割数
+        max_pairs_per_batch (int): 一度に距離を計算する点の組の最大数（メモリ使用量の上限）
+    Returns:
+        min_distance (np.ndarray): グループごとの最短距離 (p,)
+        index_a (np.ndarray): グループ内のpoints_aの点のインデックス (p,)
+        index_b (np.ndarray): points_bの点のインデックス (p,)
+    """
+    points_a = np.asarray(points_a, dtype=np.float64)
+    points_b = np.asarray(points_b, dtype=np.float64)
+    n_groups, n_points_a = points_a.shape[:2]
+
+    # 間引いた点同士の総当たりでグループごとの最短距離の上限を求める
+    step_a = max(n_points_a // max_coarse_points, 1)
+    step_b = max(len(points_b) // max_coarse_points, 1)
+    coarse_a = points_a[:, ::step_a]
+    coarse_b = points_b[::step_b]
+    best_distance = np.empty(n_groups)
+    best_a = np.empty(n_groups, dtype=np.int64)
+    best_b = np.empty(n_groups, dtype=np.int64)
+    group_block = max(max_pairs_per_batch // (coarse_a.shape[1] * len(coarse_b)), 1)
+    for start in range(0, n_groups, group_block):
+        coarse_distance = _pairwise_distance(
+            coarse_a[start : start + group_block], coarse_b
+        )
+        flat_index = np.argmin(coarse_distance.reshape(len(coarse_distance), -1), 1)
+        coarse_a_index, coarse_b_index = np.unravel_index(
+            flat_index, coarse_distance.shape[1:]
+        )
+        block_slice = slice(start, start + len(coarse_distance))
+        best_distance[block_slice] = coarse_distance[
+            np.arange(len(coarse_distance)), coarse_a_index, coarse_b_index
+        ]
+        best_a[block_slice] = coarse_a_index * step_a
+        best_b[block_slice] = coarse_b_index * step_b
+    upper_bound = best_distance.max()
+    if upper_bound == 0:
+        return best_distance, best_a, best_b
+
+    # points_bを囲む矩形までの距離が上限以上の点は最短距離にならないため除く
+    flat_a = points_a.reshape(-1, 2)
+    groups = np.repeat(np.arange(n_groups), n_points_a)
+    box_gap = np.maximum(
+        np.maximum(points_b.min(axis=0) - flat_a, flat_a - points_b.max(axis=0)), 0
+    )
+    near = np.flatnonzero(np.sqrt((box_gap**2).sum(axis=1)) < best_distance[groups])
+    if len(near) == 0:
+        return best_distance, best_a, best_b
+    flat_a = flat_a[near]
+    groups = groups[near]
+
+    # 残りの点とpoints_bを共通のグリッドのセルにまとめる（points_aのセルはグループごと）
+    cell_size = upper_bound / n_subdivisions
+    origin = np.minimum(flat_a.min(axis=0), points_b.min(axis=0))
+    cells_a, order_a, offsets_a, cell_groups_a = _group_by_cell(
+        flat_a, origin, cell_size, groups
+    )
+    cells_b, order_b, offsets_b, _ = _group_by_cell(points_b, origin, cell_size)
+    counts_a = np.diff(offsets_a)
+    counts_b = np.diff(offsets_b)
+
+    # セルの中心間の距離が U + セルの対角線長 以下の組が候補になる
+    grid_index = GridIndex(cells_b + 0.5, cell_size=n_subdivisions + np.sqrt(2))
+    cell_index_a, cell_index_b = grid_index.query_pairs(cells_a + 0.5)
+    gap = np.clip(np.abs(cells_a[cell_index_a] - cells_b[cell_index_b]) - 1, 0, None)
+    lower_bound = np.sqrt((gap**2).sum(axis=1)) * cell_size
+    candidate = lower_bound < best_distance[cell_groups_a[cell_index_a]]
+    order = np.argsort(lower_bound[candidate], kind="stable")
+    cell_index_a = cell_index_a[candidate][order]
+    cell_index_b = cell_index_b[candidate][order]
+    lower_bound = lower_bound[candidate][order]
+
+    # 下限の小さいセルの組から、点の組の数がmax_pairs_per_batch以下になるようにまとめて計算
+    while len(lower_bound) > 0:
+        n_pairs = counts_a[cell_index_a] * counts_b[cell_index_b]
+        n_batch = max(
+            int(np.searchsorted(np.cumsum(n_pairs), max_pairs_per_batch, "right")), 1
+        )
+        batch_a = cell_index_a[:n_batch]
+        batch_b = cell_index_b[:n_batch]
+        batch_pairs = n_pairs[:n_batch]
+
+        # セルの組ごとに (na×nb) 個の点の組を展開する
+        local_index = np.arange(batch_pairs.sum()) - np.repeat(
+            np.cumsum(batch_pairs) - batch_pairs, batch_pairs
+        )
+        repeated_count_b = np.repeat(counts_b[batch_b], batch_pairs)
+        index_a = order_a[
+            np.repeat(offsets_a[batch_a], batch_pairs) + local_index // repeated_count_b
+        ]
+        index_b = order_b[
+            np.repeat(offsets_b[batch_b], batch_pairs) + local_index % repeated_count_b
+        ]
+        difference = flat_a[index_a] - points_b[index_b]
+        distance = np.sqrt(difference[:, 0] ** 2 + difference[:, 1] ** 2)
+
+        # グループごとに、距離が最小の点の組（同じ距離なら先に計算した組）を選ぶ
+        pair_groups = groups[index_a]
+        batch_min = np.full(n_groups, np.inf)
+        np.minimum.at(batch_min, pair_groups, distance)
+        is_min = np.flatnonzero(distance <= batch_min[pair_groups])
+        nearest_groups, first = np.unique(pair_groups[is_min], return_index=True)
+        nearest = is_min[first]
+        improved = distance[nearest] < best_distance[nearest_groups]
+        nearest = nearest[improved]
+        nearest_groups = nearest_groups[improved]
+        best_distance[nearest_groups] = distance[nearest]
+        best_a[nearest_groups] = near[index_a[nearest]] - nearest_groups * n_points_a
+        best_b[nearest_groups] = index_b[nearest]
+
+        remaining = (
+            lower_bound[n_batch:] < best_distance[cell_groups_a[cell_index_a[n_batch:]]]
+        )
+        cell_index_a = cell_index_a[n_batch:][remaining]
+        cell_index_b = cell_index_b[n_batch:][remaining]
+        lower_bound = lower_bound[n_batch:][remaining]
+    return best_distance, best_a, best_b
+
+
+def _group_by_cell(
+    points: np.ndarray,
+    origin: np.ndarray,
+    cell_size: float,
+    groups: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    点をセルごと（groupsを指定した場合はグループとセルの組ごと）にまとめる
+
+    Returns:
+        cells (np.ndarray): 点を含むセルの座標 (k, 2)
+        order (np.ndarray): セルの順に並べた点のインデックス
+        offsets (np.ndarray): 各セルの点がorderの中で始まる位置（長さはk+1）
+        cell_groups (np.ndarray): 各セルのグループ (k,)
+    """
+    point_cells = np.floor((points - origin) / cell_size).astype(np.int64)
+    if groups is None:
+        groups = np.zeros(len(points), dtype=np.int64)
+    # グループと2次元のセル座標を1次元のキーにしてまとめる
+    n_cells_x = int(point_cells[:, 0].max()) + 1
+    n_cells_y = int(point_cells[:, 1].max()) + 1
+    keys = (groups * n_cells_x + point_cells[:, 0]) * n_cells_y + point_cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    is_first = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+    cell_starts = np.flatnonzero(is_first)
+    cells = point_cells[order[cell_starts]]
+    offsets = np.append(cell_starts, len(points))
+    return cells, order, offsets, groups[order[cell_starts]]
+
+
+def _pairwise_distance(points_a: np.ndarray, points_b: np.ndarray) -> np.ndarray:
+    """全ての点の組の距離 (..., n, m)"""
+    dx = points_a[..., :, 0, None] - points_b[None, :, 0]
+    dy = points_a[..., :, 1, None] - points_b[None, :, 1]
+    return np.sqrt(dx**2 + dy**2)
@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_result_schema import DfResultSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.simout_arrays import SimoutArrays
+from src.simout_cache import SimoutCache
+
+
+class SpectralAnalyzer:
+    """
+    ペダル量と加速度のパワースペクトル密度（PSD）をWelch法で計算する。
+    全ての実験データを重なりのあるウィンドウに分割して1つの行列に積み、
+    np.fft.rfft を1回だけ呼び出した後、ファイルごとに np.add.reduceat で平均する。
+    ファイルごとのPSDと要約値は生データのパス・サイズ・更新時刻と設定をキーとして保存する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    # PSDを計算する信号（DfSimoutSchemaの変数名）
+    CHANNELS = ["Gas_Out", "Brake_Out", "ego_a"]
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_result_columns = DfResultSchema()
+        self.df_simout_columns = DfSimoutSchema()
+        self.cache_dir = config.paths.folder_path_model.path_folder_spectrum_cache
+
+    def get_summary(self, file_names: list[str]) -> pd.DataFrame:
+        """
+        ファイルごとの卓越周波数と帯域パワーを取得（保存された結果が古いファイルだけ計算する）
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+        Returns:
+            df_spectral (pd.DataFrame): simout_file列と信号ごとの要約値
+        """
+        spectra = self.get_spectra(file_names)
+        rows = []
+        for file_name in file_names:
+            row = {self.df_result_columns.simout_file: file_name}
+            row.update(spectra[file_name]["summary"])
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def get_spectra(self, file_names: list[str]) -> dict[str, dict]:
+        """
+        ファイルごとのPSDを取得（保存された結果が古いファイルだけまとめて計算する）
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+        Returns:
+            spectra (dict[str, dict]): ファイル名 → {"frequency", 信号名のPSD, "summary"}
+        """
+        spectra = {}
+        keys = {}
+        for file_name in dict.fromkeys(file_names):
+            keys[file_name] = self._get_key(file_name)
+            cached = self._load(file_name, keys[file_name])
+            if cached is not None:
+                spectra[file_name] = cached
+
+        pending = [file_name for file_name in keys if file_name not in spectra]
+        if pending:
+            self.logger.debug(f"{len(pending)} 件の実験データのPSDを計算します")
+            computed = self.compute(pending)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for file_name, spectrum in computed.items():
+                self._save(file_name, keys[file_name], spectrum)
+            spectra.update(computed)
+        return spectra
+
+    def compute(self, file_names: list[str]) -> dict[str, dict]:
+        """
+        Welch法でPSDを計算（サンプリング周期とウィンドウ長が同じファイルをまとめて1回のFFTで処理する）
+
+        Args:
+            file_names (list[str]): simoutのファイル名のリスト
+        Returns:
+            spectra (dict[str, dict]): ファイル名 → {"frequency", 信号名のPSD, "summary"}
+        """
+        arrays_dict = {
+            file_name: SimoutArrays.open(file_name, self.config)
+            for file_name in file_names
+        }
+        groups: dict[tuple[float, int], list[str]] = {}
+        for file_name, arrays in arrays_dict.items():
+            dt = float(arrays.time[1] - arrays.time[0])
+            # ウィンドウはデータ長を超えないようにする
+            nperseg = min(
+                int(round(self.config.processing.welch_segment_length / dt)),
+                len(arrays),
+            )
+            groups.setdefault((dt, nperseg), []).append(file_name)
+
+        spectra = {}
+        for (dt, nperseg), group_files in groups.items():
+            spectra.update(
+                self._compute_group(
+                    [arrays_dict[f] for f in group_files], group_files, dt, nperseg
+                )
+            )
+        return spectra
+
+    def _compute_group(
+        self,
+        arrays_list: list[SimoutArrays],
+        file_names: list[str],
+        dt: float,
+        nperseg: int,
+    ) -> dict[str, dict]:
+        """サンプリング周期とウィンドウ長が同じファイルのPSDを計算"""
+        processing = self.config.processing
+        fs = 1 / dt
+        lengths = [len(arrays) for arrays in arrays_list]
+        step = max(int(round(nperseg * (1 - processing.welch_overlap))), 1)
+        # 各ファイルのウィンドウの開始位置（全ファイルを連結した配列上の位置）
+        file_offsets = np.concatenate([[0], np.cumsum(lengths)])
+        window_starts = [
+            file_offsets[i] + np.arange(0, n - nperseg + 1, step)
+            for i, n in enumerate(lengths)
+        ]
+        n_windows = np.array([len(starts) for starts in window_starts])
+        window_starts = np.concatenate(window_starts)
+        window_offsets = np.concatenate([[0], np.cumsum(n_windows)])[:-1]
+
+        taper = np.hanning(nperseg)
+        # 片側PSD [単位^2/Hz] への換算係数
+        scale = 1 / (fs * (taper**2).sum())
+        frequency = np.fft.rfftfreq(nperseg, d=dt)
+        one_sided = np.full(len(frequency), 2.0)
+        one_sided[0] = 1.0
+        if nperseg % 2 == 0:
+            one_sided[-1] = 1.0
+
+        psd_dict = {}
+        for channel in self.CHANNELS:
+            column = getattr(self.df_simout_columns, channel)
+            buffer = np.concatenate(
+                [np.asarray(arrays[column]) for arrays in arrays_list]
+            )
+            windows = np.lib.stride_tricks.sliding_window_view(buffer, nperseg)[
+                window_starts
+            ]
+            # ウィンドウごとに平均を引いてから窓関数をかける
+            windows = (windows - windows.mean(axis=1, keepdims=True)) * taper
+            power = np.abs(np.fft.rfft(windows, axis=1)) ** 2 * scale * one_sided
+            psd_dict[channel] = (
+                np.add.reduceat(power, window_offsets, axis=0) / n_windows[:, None]
+            )
+
+        band_low, band_high = processing.spectral_band
+        in_band = (frequency >= band_low) & (frequency <= band_high)
+        df = frequency[1] - frequency[0] if len(frequency) > 1 else 0.0
+        spectra = {}
+        for i, file_name in enumerate(file_names):
+            spectrum = {"frequency": frequency}
+            summary = {}
+            for channel in self.CHANNELS:
+                psd = psd_dict[channel][i]
+                spectrum[channel] = psd
+                # 直流成分を除いた最大のピーク
+                dominant = np.argmax(psd[1:]) + 1 if len(psd) > 1 else 0
+                summary[
+                    getattr(self.df_result_columns, f"{channel}_dominant_frequency")
+                ] = float(frequency[dominant])
+                summary[getattr(self.df_result_columns, f"{channel}_band_power")] = (
+                    float(psd[in_band].sum() * df)
+                )
+            spectrum["summary"] = summary
+            spectra[file_name] = spectrum
+        return spectra
+
+    def _get_key(self, file_name: str) -> str:
+        """保存した結果のキー（生データのパス・サイズ・更新時刻とPSDの設定）"""
+        file_manager = self.config.paths.file_manager
+        processing = self.config.processing
+        return json.dumps(
+            {
+                "source": SimoutCache.get_source_key(
+                    file_manager.get_simout_path(file_name)
+                ),
+                "channels": self.CHANNELS,
+                "welch_segment_length": processing.welch_segment_length,
+                "welch_overlap": processing.welch_overlap,
+                "spectral_band": list(processing.spectral_band),
+            },
+            sort_keys=True,
+        )
+
+    def _get_path(self, file_name: str):
+        return self.cache_dir / f"{os.path.splitext(file_name)[0]}.npz"
+
+    def _load(self, file_name: str, key: str) -> dict | None:
+        """保存した結果を読み込む（キーが一致しない場合はNone）"""
+        try:
+            with np.load(self._get_path(file_name)) as npz:
+                if str(npz["key"]) != key:
+                    return None
+                spectrum = {"frequency": npz["frequency"]}
+                for channel in self.CHANNELS:
+                    spectrum[channel] = npz[channel]
+                spectrum["summary"] = json.loads(str(npz["summary"]))
+                return spectrum
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+
+    def _save(self, file_name: str, key: str, spectrum: dict):
+        """結果を一時ファイルに書いてから置き換える"""
+        path = self._get_path(file_name)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            key=np.array(key),
+            summary=np.array(json.dumps(spectrum["summary"])),
+            frequency=spectrum["frequency"],
+            **{channel: spectrum[channel] for channel in self.CHANNELS},
+        )
+        os.replace(tmp_path, path)
@@ -1,6 +1,7 @@
 import pandas as pd
 
 from config import Config
+from src.simout_cache import read_simout
 
 
 class SubjectManager:
@@ -20,7 +21,7 @@ class SubjectManager:
         self.raw_df_dict: dict[pd.DataFrame] = pd.DataFrame()
         self.simout_list = simout_list
 
-    def load_raw_data(self, config: Config):
+    def load_raw_data(self, config: Config, columns: list[str] | None = None):
         subject_raw_data_file_dict, experiment_type = (
             self.extract_subject_raw_file_names_and_type(self.simout_list, self.id)
         )
@@ -31,7 +32,9 @@ class SubjectManager:
         )
         self.subject_raw_data_path_dict = subject_raw_data_path_dict
         raw_df_dict, df_dict = self.get_id_data(
-            config, subject_raw_data_path_dict=subject_raw_data_path_dict
+            config,
+            subject_raw_data_path_dict=subject_raw_data_path_dict,
+            columns=columns,
         )
         self.raw_df_dict = raw_df_dict
         self.df_dict = df_dict
@@ -60,11 +63,11 @@ class SubjectManager:
         return subject_raw_data_path_dict
 
     @staticmethod
-    def get_id_data(config, subject_raw_data_path_dict):
+    def get_id_data(config, subject_raw_data_path_dict, columns=None):
         raw_df_dict = {}
         df_dict = {}
         for velocity, raw_data_path in subject_raw_data_path_dict.items():
-            df = pd.read_csv(raw_data_path)
+            df = read_simout(config, raw_data_path.name, columns=columns)
             if velocity == 40 or velocity == 50 or velocity == 60:
                 raw_df_dict[velocity] = df
                 df_dict[velocity] = df
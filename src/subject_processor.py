@@ -6,6 +6,7 @@ import pandas as pd
 from config import Config
 from schemas.df_result_schema import DfResultSchema
 from schemas.df_subject_master import DfSubjectMasterSchema
+from schemas.df_window_feature_schema import DfWindowFeatureSchema
 from src.experiment_processor import ExperimentProcessor
 from src.metric_calculator import MetricCalculator
 
@@ -22,6 +23,7 @@ class SubjectProcessor:
     def __init__(self, subject_info: dict, config: Config, logger: logging.Logger):
         self.df_result_columns = DfResultSchema()
         self.df_subject_master = DfSubjectMasterSchema()
+        self.df_window_feature_columns = DfWindowFeatureSchema()
 
         self.subject_id: str = subject_info.get(
             self.df_subject_master.subject_id, "None"
@@ -88,6 +90,7 @@ class SubjectProcessor:
                 experiment_type=experiment,
                 experiment_condition=self.experiment_condition,
                 logger=self.logger,
+                columns=MetricCalculator.REQUIRED_COLUMNS,
             )
             for experiment in self.experiments.values()
         ]
@@ -99,10 +102,13 @@ class SubjectProcessor:
                 return key
         return None
 
-    def process(self) -> pd.DataFrame:
+    def process(self, df_metrics: pd.DataFrame | None = None) -> pd.DataFrame:
         """
         被験者の全実験（3回）のデータ処理を行う。
 
+        Args:
+            df_metrics (pd.DataFrame, optional): simout_fileをインデックスとした計算済みの指標。
+                指定した場合は各実験の指標を計算せずにこの表から取得する
         Returns:
             df_index_subject (pd.DataFrame): 被験者の全実験（3回）の結果
         """
@@ -110,7 +116,13 @@ class SubjectProcessor:
             self.logger.debug(f"被験者 '{self.subject_id}' のデータ処理を開始します")
             df_index_subject = None
             for processor in self.experiment_processors:
-                df_index_experiment = processor.process()
+                if df_metrics is None:
+                    df_index_experiment = processor.process()
+                else:
+                    summary_dict = df_metrics.loc[processor.file_name].to_dict()
+                    summary_dict.update(processor.calculate_min_gap())
+                    summary_dict.update(processor.calculate_zone_metrics())
+                    df_index_experiment = processor.make_index_experiment(summary_dict)
                 df_index_experiment[self.df_result_columns.experiment_number] = (
                     self.get_experiment_number(processor.experiment_type)
                 )
@@ -135,6 +147,64 @@ class SubjectProcessor:
             )
             raise
 
+    def process_window_features(self) -> pd.DataFrame:
+        """
+        被験者の全実験のスライディングウィンドウ特徴量を計算する。
+
+        Returns:
+            df_window_features (pd.DataFrame): 全実験のウィンドウごとの特徴量
+        """
+        df_window_features_list = []
+        for processor in self.experiment_processors:
+            df_window_features = processor.extract_window_features()
+            df_window_features[self.df_window_feature_columns.experiment_number] = (
+                self.get_experiment_number(processor.experiment_type)
+            )
+            df_window_features_list.append(df_window_features)
+        df_window_features = pd.concat(df_window_features_list, ignore_index=True)
+        df_window_features[self.df_window_feature_columns.subject_id] = self.subject_id
+        return df_window_features
+
+    def save_results(self, df: pd.DataFrame):
+        """
+        被験者の指標データと、設定で有効にした追加の出力を保存する。
+
+        Args:
+            df (pd.DataFrame): 被験者の全実験の結果
+        """
+        self.save_metrics(df)
+        if self.config.processing.window_features:
+            self.save_window_features(self.process_window_features())
+
+    def save_window_features(self, df: pd.DataFrame):
+        """
+        被験者のスライディングウィンドウ特徴量をcsv出力。
+
+        Args:
+            df (pd.DataFrame): 全実験のウィンドウごとの特徴量
+        """
+        try:
+            self.logger.debug("ウィンドウ特徴量を保存します")
+            file_name = self.make_result_file_name(
+                self.experiment_date, self.subject_id
+            )
+            path = self.config.paths.file_manager.get_subject_window_features_path(
+                file_name
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(path, index=False)
+            self.logger.debug("ウィンドウ特徴量の保存が完了しました")
+        except Exception as e:
+            self.logger.exception(
+                f"ウィンドウ特徴量の保存中にエラーが発生しました: {e}"
+            )
+            raise
+
+    @staticmethod
+    def make_result_file_name(experiment_date, subject_id) -> str:
+        """被験者の結果ファイル名"""
+        return f"{str(int(experiment_date))}_{subject_id :02}.csv"
+
     def save_metrics(self, df: pd.DataFrame):
         """
         被験者の指標データをcsv出力。
@@ -144,7 +214,9 @@ class SubjectProcessor:
         """
         try:
             self.logger.debug("指標データを保存します")
-            file_name = f"{str(int(self.experiment_date))}_{self.subject_id :02}.csv"
+            file_name = self.make_result_file_name(
+                self.experiment_date, self.subject_id
+            )
             df.to_csv(
                 self.config.paths.file_manager.get_subject_results_path(file_name),
                 index=False,
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from schemas.df_result_schema import DfResultSchema
+from schemas.df_simout_schema import DfSimoutSchema
+
+
+class TimeWindowIndex:
+    """
+    1つの実験データについて、時刻と「速度・ペダル量×dt」の累積和を保持し、
+    任意の時間範囲 [start_time, end_time] の指標を二分探索と累積和の差分で求める。
+
+    Attributes:
+        time (np.ndarray): 昇順の時刻
+        dt (float): サンプリング周期
+    """
+
+    def __init__(
+        self,
+        time: np.ndarray,
+        velocity: np.ndarray,
+        Brake_Out: np.ndarray,
+        Gas_Out: np.ndarray,
+    ):
+        self.df_result_columns = DfResultSchema()
+        self.time: np.ndarray = np.asarray(time, dtype=np.float64)
+        self.dt: float = self.time[1] - self.time[0]
+
+        # 先頭に0を付けた累積和: 区間[i0, i1)の合計は cumsum[i1] - cumsum[i0]
+        self._cumsum_velocity = self._cumsum(velocity)
+        self._cumsum_mileage = self._cumsum(np.abs(velocity) * self.dt)
+        self._cumsum_Brake_Out = self._cumsum(np.asarray(Brake_Out) * self.dt)
+        self._cumsum_Gas_Out = self._cumsum(np.asarray(Gas_Out) * self.dt)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        SimoutArraysまたは生データのdfから作成
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+        Returns:
+            time_window_index (TimeWindowIndex)
+        """
+        df_simout_columns = DfSimoutSchema()
+        return cls(
+            time=arrays[df_simout_columns.time],
+            velocity=arrays[df_simout_columns.ego_v],
+            Brake_Out=arrays[df_simout_columns.Brake_Out],
+            Gas_Out=arrays[df_simout_columns.Gas_Out],
+        )
+
+    def query(self, start_time: float, end_time: float) -> dict:
+        """
+        時間範囲の平均速度、走行距離、ペダル量積分値を計算（filtering_df_timeと同じく両端を含む）
+
+        Args:
+            start_time (float): 範囲の最初の時刻
+            end_time (float): 範囲の最後の時刻
+        Returns:
+            summary_dict (dict): 平均速度、走行距離、ブレーキ・アクセル量の積分
+        """
+        df_summary = self.query_many([start_time], [end_time])
+        return df_summary.iloc[0].to_dict()
+
+    def query_many(self, start_times, end_times) -> pd.DataFrame:
+        """
+        複数の時間範囲の指標をまとめて計算
+
+        Args:
+            start_times (array-like): 範囲の最初の時刻
+            end_times (array-like): 範囲の最後の時刻
+        Returns:
+            df_summary (pd.DataFrame): 範囲ごとの平均速度、走行距離、ブレーキ・アクセル量の積分
+        """
+        i0 = np.searchsorted(self.time, np.asarray(start_times), side="left")
+        i1 = np.searchsorted(self.time, np.asarray(end_times), side="right")
+        i1 = np.maximum(i1, i0)
+        n_rows = i1 - i0
+
+        velocity_sum = self._cumsum_velocity[i1] - self._cumsum_velocity[i0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average_velocity = np.where(n_rows > 0, velocity_sum / n_rows, np.nan)
+
+        df_summary = pd.DataFrame(
+            {
+                self.df_result_columns.average_velocity: average_velocity,
+                self.df_result_columns.total_mileage: (
+                    self._cumsum_mileage[i1] - self._cumsum_mileage[i0]
+                ),
+                self.df_result_columns.Brake_Out_sum: (
+                    self._cumsum_Brake_Out[i1] - self._cumsum_Brake_Out[i0]
+                ),
+                self.df_result_columns.Gas_Out_sum: (
+                    self._cumsum_Gas_Out[i1] - self._cumsum_Gas_Out[i0]
+                ),
+            }
+        )
+        return df_summary
+
+    @staticmethod
+    def _cumsum(values: np.ndarray) -> np.ndarray:
+        cumsum = np.empty(len(values) + 1, dtype=np.float64)
+        cumsum[0] = 0.0
+        np.cumsum(values, out=cumsum[1:])
+        return cumsum
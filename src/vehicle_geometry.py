@@ -0,0 +1,224 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_interaction_schema import DfInteractionSchema
+from schemas.df_obj_track_schema import DfObjTrackSchema
+
+# compute_box_cornersが返す角の順番（反時計回り）
+CORNER_NAMES = ("front_left", "rear_left", "rear_right", "front_right")
+
+
+def compute_box_corners(
+    x: np.ndarray,
+    y: np.ndarray,
+    sin_psi: np.ndarray,
+    cos_psi: np.ndarray,
+    length,
+    width,
+    poi_y,
+) -> np.ndarray:
+    """
+    車両の矩形の4つの角の座標を全時刻まとめて計算
+
+    length, width, poi_y に (p, 1) のような配列を渡すと、パラメータの軸でブロードキャストして
+    (p, n, 4, 2) の座標を返す。
+
+    Args:
+        x (np.ndarray): 基準点のx座標 (n,)
+        y (np.ndarray): 基準点のy座標 (n,)
+        sin_psi (np.ndarray): ヨー角のsin (n,)
+        cos_psi (np.ndarray): ヨー角のcos (n,)
+        length (float | np.ndarray): 車両の全長
+        width (float | np.ndarray): 車両の全幅
+        poi_y (float | np.ndarray): 後端から基準点までの距離
+    Returns:
+        corners (np.ndarray): CORNER_NAMESの順の角の座標 (..., n, 4, 2)
+    """
+    front = np.asarray(length) - poi_y
+    rear = -np.asarray(poi_y, dtype=np.float64)
+    half_width = np.asarray(width) / 2
+    # 車両座標系での各角の前後方向・左右方向の位置 (..., 4)
+    forward = np.stack(np.broadcast_arrays(front, rear, rear, front), axis=-1)
+    lateral = np.stack(
+        np.broadcast_arrays(half_width, half_width, -half_width, -half_width), axis=-1
+    )
+
+    sin_psi = np.asarray(sin_psi)[:, None]
+    cos_psi = np.asarray(cos_psi)[:, None]
+    corners_x = np.asarray(x)[:, None] + forward * cos_psi - lateral * sin_psi
+    corners_y = np.asarray(y)[:, None] + forward * sin_psi + lateral * cos_psi
+    return np.stack([corners_x, corners_y], axis=-1)
+
+
+def compute_box_gap(
+    corners_a: np.ndarray, corners_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    2つの矩形の距離と重なりを時刻ごとに計算
+
+    重なりは分離軸定理（各矩形の2辺の方向への投影）で判定し、重なっていない場合の距離は
+    一方の角と他方の辺の距離の最小値とする。
+
+    Args:
+        corners_a (np.ndarray): 矩形Aの角の座標 (..., 4, 2)
+        corners_b (np.ndarray): 矩形Bの角の座標 (..., 4, 2)
+    Returns:
+        gap (np.ndarray): 矩形間の距離（重なっている場合は0）
+        overlap (np.ndarray): 重なっているか
+    """
+    edges_a = np.roll(corners_a, -1, axis=-2) - corners_a
+    edges_b = np.roll(corners_b, -1, axis=-2) - corners_b
+
+    # 分離軸定理: いずれかの軸で投影が離れていれば重なっていない
+    axes = np.concatenate([edges_a[..., :2, :], edges_b[..., :2, :]], axis=-2)
+    projection_a = np.einsum("...kd,...cd->...kc", axes, corners_a)
+    projection_b = np.einsum("...kd,...cd->...kc", axes, corners_b)
+    separated = (projection_a.max(axis=-1) < projection_b.min(axis=-1)) | (
+        projection_b.max(axis=-1) < projection_a.min(axis=-1)
+    )
+    overlap = ~separated.any(axis=-1)
+
+    gap = np.minimum(
+        _min_point_to_edges_distance(corners_a, corners_b, edges_b),
+        _min_point_to_edges_distance(corners_b, corners_a, edges_a),
+    )
+    gap = np.where(overlap, 0.0, gap)
+    return gap, overlap
+
+
+def compute_time_to_collision(
+    time: np.ndarray, gap: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    距離の時間変化からTTC（衝突余裕時間）を計算
+
+    Args:
+        time (np.ndarray): 時刻 (n,)
+        gap (np.ndarray): 矩形間の距離 (..., n)
+    Returns:
+        closing_speed (np.ndarray): 接近速度（距離の減少率、近づく場合に正）
+        ttc (np.ndarray): TTC（近づいていない場合はinf、重なっている場合は0）
+    """
+    closing_speed = -np.gradient(gap, time, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ttc = np.where(closing_speed > 0, gap / closing_speed, np.inf)
+    ttc = np.where(gap == 0, 0.0, ttc)
+    return closing_speed, ttc
+
+
+def _min_point_to_edges_distance(
+    points: np.ndarray, starts: np.ndarray, edges: np.ndarray
+) -> np.ndarray:
+    """各時刻で、点 (..., 4, 2) と辺 (..., 4, 2) の距離の最小値を計算"""
+    relative = points[..., :, None, :] - starts[..., None, :, :]
+    edge_length_sq = (edges**2).sum(axis=-1)[..., None, :]
+    t = np.clip(
+        np.einsum("...pkd,...kd->...pk", relative, edges) / edge_length_sq, 0, 1
+    )
+    closest = relative - t[..., None] * edges[..., None, :, :]
+    return np.sqrt((closest**2).sum(axis=-1)).min(axis=(-2, -1))
+
+
+class VehicleGeometry:
+    """
+    自車と対象車両の矩形を全時刻まとめて計算し、矩形間の距離・重なり・TTCを求める。
+    ヨー角のsin・cosは1回だけ計算し、全ての角の計算で使い回す。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_obj_track_columns = DfObjTrackSchema()
+        self.df_interaction_columns = DfInteractionSchema()
+
+    def get_ego_corners(
+        self, x: np.ndarray, y: np.ndarray, psi: np.ndarray
+    ) -> np.ndarray:
+        """
+        自車の矩形の角の座標を計算
+
+        Args:
+            x (np.ndarray): 自車のx座標
+            y (np.ndarray): 自車のy座標
+            psi (np.ndarray): 自車のヨー角
+        Returns:
+            corners (np.ndarray): CORNER_NAMESの順の角の座標 (n, 4, 2)
+        """
+        return compute_box_corners(
+            x,
+            y,
+            np.sin(psi),
+            np.cos(psi),
+            length=self.config.experiment.Ego_l,
+            width=self.config.experiment.Ego_w,
+            poi_y=self.config.experiment.PoI_y,
+        )
+
+    def get_obj_corners(
+        self, x: np.ndarray, y: np.ndarray, psi: np.ndarray
+    ) -> np.ndarray:
+        """
+        対象車両の矩形の角の座標を計算
+
+        Args:
+            x (np.ndarray): 対象車両のx座標
+            y (np.ndarray): 対象車両のy座標
+            psi (np.ndarray): 対象車両のヨー角
+        Returns:
+            corners (np.ndarray): CORNER_NAMESの順の角の座標 (n, 4, 2)
+        """
+        return compute_box_corners(
+            x,
+            y,
+            np.sin(psi),
+            np.cos(psi),
+            length=self.config.experiment.Obj_l,
+            width=self.config.experiment.Obj_w,
+            poi_y=self.config.experiment.Obj_PoI_y,
+        )
+
+    def compute_interaction(
+        self,
+        time: np.ndarray,
+        ego_corners: np.ndarray,
+        df_obj_track: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """
+        自車と対象車両の矩形間の距離・重なり・TTCを時刻ごとに計算
+
+        Args:
+            time (np.ndarray): 自車の時刻 (n,)
+            ego_corners (np.ndarray): 自車の角の座標 (n, 4, 2)
+            df_obj_track (pd.DataFrame): 対象車両の軌跡（DfObjTrackSchemaの列）。
+                自車の時刻に線形補間する
+        Returns:
+            df_interaction (pd.DataFrame): 時刻ごとの距離・重なり・接近速度・TTC
+        """
+        obj_time = df_obj_track[self.df_obj_track_columns.time].to_numpy()
+        obj_x = np.interp(time, obj_time, df_obj_track[self.df_obj_track_columns.obj_x])
+        obj_y = np.interp(time, obj_time, df_obj_track[self.df_obj_track_columns.obj_y])
+        # ヨー角は±πの不連続を除いてから補間する
+        obj_psi = np.interp(
+            time, obj_time, np.unwrap(df_obj_track[self.df_obj_track_columns.obj_psi])
+        )
+        obj_corners = self.get_obj_corners(obj_x, obj_y, obj_psi)
+
+        gap, overlap = compute_box_gap(ego_corners, obj_corners)
+        closing_speed, ttc = compute_time_to_collision(time, gap)
+        df_interaction = pd.DataFrame(
+            {
+                self.df_interaction_columns.time: time,
+                self.df_interaction_columns.box_gap: gap,
+                self.df_interaction_columns.overlap: overlap,
+                self.df_interaction_columns.closing_speed: closing_speed,
+                self.df_interaction_columns.ttc: ttc,
+            }
+        )
+        return df_interaction
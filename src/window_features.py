@@ -0,0 +1,89 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from schemas.df_simout_schema import DfSimoutSchema
+from schemas.df_window_feature_schema import DfWindowFeatureSchema
+
+
+class WindowFeatureExtractor:
+    """
+    スライディングウィンドウごとの特徴量を計算する。
+    各量の累積和を1回だけ計算し、ウィンドウの合計は累積和の差分で求めるため、
+    ウィンドウ数に関わらず計算量はデータ長に比例する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_simout_columns = DfSimoutSchema()
+        self.df_window_feature_columns = DfWindowFeatureSchema()
+
+    def extract(self, arrays, file_name: str) -> pd.DataFrame:
+        """
+        ウィンドウごとの特徴量を計算
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+            file_name (str): simoutのファイル名
+        Returns:
+            df_window_features (pd.DataFrame): ウィンドウごとの特徴量
+        """
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        velocity = np.asarray(arrays[self.df_simout_columns.ego_v])
+        acceleration = np.asarray(arrays[self.df_simout_columns.ego_a])
+        gas = np.asarray(arrays[self.df_simout_columns.Gas_Out])
+        brake = np.asarray(arrays[self.df_simout_columns.Brake_Out])
+        dt = time[1] - time[0]
+
+        window_size = max(int(round(self.config.processing.window_length / dt)), 2)
+        hop_size = max(int(round(self.config.processing.window_hop / dt)), 1)
+        starts = np.arange(0, len(time) - window_size + 1, hop_size)
+        ends = starts + window_size
+
+        # 微分量はサンプル間で定義されるため、ウィンドウ内のwindow_size-1個の差分を使う
+        jerk = np.diff(acceleration) / dt
+        gas_rate = np.clip(np.diff(gas), 0, None) / dt
+        brake_rate = np.clip(np.diff(brake), 0, None) / dt
+        threshold = self.config.processing.pedal_threshold
+        overlap = (brake > threshold) & (gas > threshold)
+
+        velocity_mean = self._window_sum(velocity, starts, ends) / window_size
+        velocity_square_mean = self._window_sum(velocity**2, starts, ends) / window_size
+        velocity_var = np.clip(velocity_square_mean - velocity_mean**2, 0, None)
+
+        n_diff = window_size - 1
+        df_window_features = pd.DataFrame(
+            {
+                self.df_window_feature_columns.simout_file: file_name,
+                self.df_window_feature_columns.window_start_time: time[starts],
+                self.df_window_feature_columns.window_end_time: time[ends - 1],
+                self.df_window_feature_columns.velocity_mean: velocity_mean,
+                self.df_window_feature_columns.velocity_var: velocity_var,
+                self.df_window_feature_columns.jerk_rms: (
+                    np.sqrt(self._window_sum(jerk**2, starts, ends - 1) / n_diff)
+                ),
+                self.df_window_feature_columns.Gas_Out_rate: (
+                    self._window_sum(gas_rate, starts, ends - 1) / n_diff
+                ),
+                self.df_window_feature_columns.Brake_Out_rate: (
+                    self._window_sum(brake_rate, starts, ends - 1) / n_diff
+                ),
+                self.df_window_feature_columns.brake_gas_overlap: (
+                    self._window_sum(overlap, starts, ends) / window_size
+                ),
+            }
+        )
+        return df_window_features
+
+    @staticmethod
+    def _window_sum(values: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        """区間[starts, ends)の合計を累積和の差分で求める"""
+        cumsum = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+        return cumsum[ends] - cumsum[starts]
@@ -0,0 +1,197 @@
+import logging
+
+import numpy as np
+
+from config import Config
+from schemas.df_result_schema import DfResultSchema
+from schemas.df_simout_schema import DfSimoutSchema
+from src.vehicle_geometry import CORNER_NAMES, compute_box_corners
+
+
+def points_in_polygon(
+    points: np.ndarray, polygon: np.ndarray, chunk_size: int = 100_000
+) -> np.ndarray:
+    """
+    各点が多角形の内側にあるかを判定（偶奇規則のレイキャスティング）
+
+    Args:
+        points (np.ndarray): 点 (n, 2)
+        polygon (np.ndarray): 多角形の頂点 (k, 2)（始点と終点を同じにする必要はない）
+        chunk_size (int): 一度に判定する点の数（メモリ使用量の上限）
+    Returns:
+        inside (np.ndarray): 内側にあればTrue (n,)
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    x_i, y_i = polygon[:, 0], polygon[:, 1]
+    x_j, y_j = np.roll(x_i, -1), np.roll(y_i, -1)
+
+    inside = np.empty(len(points), dtype=bool)
+    for start in range(0, len(points), chunk_size):
+        px = points[start : start + chunk_size, 0, None]
+        py = points[start : start + chunk_size, 1, None]
+        # 点から+x方向に伸ばした半直線と交差する辺の数が奇数なら内側
+        crosses_y = (y_i > py) != (y_j > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = (x_j - x_i) * (py - y_i) / (y_j - y_i) + x_i
+        n_crossings = (crosses_y & (px < x_cross)).sum(axis=1)
+        inside[start : start + chunk_size] = n_crossings % 2 == 1
+    return inside
+
+
+class ZoneMetricCalculator:
+    """
+    コースの区間（アプローチ、カーブ、停止エリアなど）ごとの指標を計算する。
+    区間は実験条件（コース）ごとに多角形または走行距離の範囲で定義し、
+    全サンプルを配列演算でいずれかの区間に割り当ててから np.bincount で区間ごとに集計する。
+
+    Attributes:
+        config (Config): 設定オブジェクト
+        logger (logging.Logger): ロガー
+    """
+
+    def __init__(self, config: Config, logger: logging.Logger):
+        self.config: Config = config
+        self.logger: logging.Logger = logger
+        self.df_result_columns = DfResultSchema()
+        self.df_simout_columns = DfSimoutSchema()
+
+    def get_zones(self, experiment_condition: str) -> list[dict]:
+        """実験条件の区間の定義（設定されていない場合は空のリスト）"""
+        return self.config.experiment.zones.get(experiment_condition, [])
+
+    def assign_zones(
+        self, arrays, zones: list[dict], reference_points: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        各サンプルを区間に割り当てる（複数の区間に含まれる場合は先に定義した区間を優先）
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+            zones (list[dict]): 区間の定義
+            reference_points (np.ndarray, optional): 多角形の判定に使う座標 (n, 2) または
+                寸法の組み合わせごとの座標 (p, n, 2)。Noneの場合は設定の基準点
+        Returns:
+            zone_index (np.ndarray): サンプルごとの区間の番号 (n,) または (p, n)
+                （どの区間にも含まれない場合は-1）
+        """
+        n = len(arrays[self.df_simout_columns.time])
+        shape = (n,) if reference_points is None else reference_points.shape[:-1]
+        zone_index = np.full(shape, -1, dtype=np.int64)
+        points = reference_points
+        distance = None
+        # 後の区間から順に上書きし、先に定義した区間が優先されるようにする
+        for i, zone in reversed(list(enumerate(zones))):
+            if "polygon" in zone:
+                if points is None:
+                    points = self._get_reference_points(arrays)
+                in_zone = points_in_polygon(
+                    points.reshape(-1, 2), zone["polygon"]
+                ).reshape(points.shape[:-1])
+            else:
+                if distance is None:
+                    distance = self._get_distance(arrays)
+                start, end = zone["distance"]
+                in_zone = (distance >= start) & (distance < end)
+            zone_index = np.where(in_zone, i, zone_index)
+        return zone_index
+
+    def compute(
+        self,
+        arrays,
+        experiment_condition: str,
+        reference_points: np.ndarray | None = None,
+    ) -> dict:
+        """
+        区間ごとの走行距離、平均速度、ペダル量積分値を計算
+
+        Args:
+            arrays (SimoutArrays | pd.DataFrame): カラム名で各列の配列を取得できるもの
+            experiment_condition (str): 実験条件（コース）
+            reference_points (np.ndarray, optional): 多角形の判定に使う座標 (n, 2) または
+                寸法の組み合わせごとの座標 (p, n, 2)。Noneの場合は設定の基準点
+        Returns:
+            zone_dict (dict): 「区間名_指標名」のカラム名 → 指標の値
+                （reference_pointsが (p, n, 2) の場合は組み合わせごとの値 (p,)）
+        """
+        zones = self.get_zones(experiment_condition)
+        if not zones:
+            return {}
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        velocity = np.asarray(arrays[self.df_simout_columns.ego_v])
+        brake = np.asarray(arrays[self.df_simout_columns.Brake_Out])
+        gas = np.asarray(arrays[self.df_simout_columns.Gas_Out])
+        dt = time[1] - time[0]
+
+        zone_index = self.assign_zones(arrays, zones, reference_points)
+        batched = zone_index.ndim == 2
+        zone_index = zone_index.reshape(-1, len(time))
+        # 区間外（-1）のサンプルを各組の最後の要素に集めてから、組・区間ごとに合計する
+        n_bins = len(zones) + 1
+        bins = np.where(zone_index >= 0, zone_index, len(zones))
+        bins = (bins + np.arange(len(zone_index))[:, None] * n_bins).ravel()
+
+        def zone_sum(values=None) -> np.ndarray:
+            weights = (
+                None
+                if values is None
+                else np.broadcast_to(values, zone_index.shape).ravel()
+            )
+            return np.bincount(
+                bins, weights=weights, minlength=len(zone_index) * n_bins
+            ).reshape(len(zone_index), n_bins)[:, :-1]
+
+        n_samples = zone_sum()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average_velocity = np.where(
+                n_samples > 0, zone_sum(velocity) / n_samples, np.nan
+            )
+        zone_metrics = {
+            "average_velocity": average_velocity,
+            "total_mileage": zone_sum(np.abs(velocity)) * dt,
+            "Brake_Out_sum": zone_sum(brake) * dt,
+            "Gas_Out_sum": zone_sum(gas) * dt,
+        }
+
+        zone_dict = {}
+        for i, zone in enumerate(zones):
+            for metric, values in zone_metrics.items():
+                zone_dict[self.make_zone_column(zone["name"], metric)] = (
+                    values[:, i] if batched else values[0, i]
+                )
+        return zone_dict
+
+    def make_zone_column(self, zone_name: str, metric: str) -> str:
+        """
+        区間の指標のカラム名
+
+        Args:
+            zone_name (str): 区間名
+            metric (str): DfResultSchemaの変数名
+        Returns:
+            column (str): 「区間名_指標のカラム名」
+        """
+        return f"{zone_name}_{getattr(self.df_result_columns, metric)}"
+
+    def _get_reference_points(self, arrays) -> np.ndarray:
+        """区間の判定に使う座標（自車の基準点または左前端）"""
+        x = np.asarray(arrays[self.df_simout_columns.ego_x])
+        y = np.asarray(arrays[self.df_simout_columns.ego_y])
+        if self.config.experiment.zone_reference != "front_left":
+            return np.column_stack([x, y])
+        psi = np.asarray(arrays[self.df_simout_columns.psi])
+        corners = compute_box_corners(
+            x,
+            y,
+            np.sin(psi),
+            np.cos(psi),
+            length=self.config.experiment.Ego_l,
+            width=self.config.experiment.Ego_w,
+            poi_y=self.config.experiment.PoI_y,
+        )
+        return corners[:, CORNER_NAMES.index("front_left"), :]
+
+    def _get_distance(self, arrays) -> np.ndarray:
+        """各サンプルまでの累積走行距離（|v|×dt の累積和）"""
+        time = np.asarray(arrays[self.df_simout_columns.time])
+        velocity = np.asarray(arrays[self.df_simout_columns.ego_v])
+        return np.cumsum(np.abs(velocity) * (time[1] - time[0]))
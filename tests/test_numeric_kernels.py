@@ -0,0 +1,86 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import Config
+from schemas.df_simout_schema import DfSimoutSchema
+from src.batch_metric_engine import BatchMetricEngine
+from src.dtw import dtw_distance
+from src.metric_calculator import MetricCalculator
+
+logger = logging.getLogger(__name__)
+
+
+def make_simout(n_rows: int, dt: float, seed: int) -> pd.DataFrame:
+    """DfSimoutSchemaの列を持つ合成の生データ"""
+    rng = np.random.default_rng(seed)
+    df_simout_columns = DfSimoutSchema()
+    velocity = np.cumsum(rng.normal(0.0, 0.5, n_rows))
+    return pd.DataFrame(
+        {
+            df_simout_columns.time: np.arange(n_rows) * dt,
+            df_simout_columns.ego_a: np.gradient(velocity, dt),
+            df_simout_columns.ego_v: velocity,
+            df_simout_columns.ego_x: np.cumsum(velocity) * dt,
+            df_simout_columns.ego_y: rng.normal(0.0, 0.1, n_rows),
+            df_simout_columns.psi: rng.normal(0.0, 0.01, n_rows),
+            df_simout_columns.Gas_Out: rng.uniform(0.0, 1.0, n_rows),
+            df_simout_columns.Brake_Out: rng.uniform(0.0, 1.0, n_rows),
+        }
+    )
+
+
+def dtw_distance_reference(a: np.ndarray, b: np.ndarray) -> float:
+    """経路を制限しない素朴なDTW距離"""
+    a = np.asarray(a, dtype=np.float64).reshape(len(a), -1)
+    b = np.asarray(b, dtype=np.float64).reshape(len(b), -1)
+    n, m = len(a), len(b)
+    cumulative = np.full((n + 1, m + 1), np.inf)
+    cumulative[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = np.sqrt(((a[i - 1] - b[j - 1]) ** 2).sum())
+            cumulative[i, j] = cost + min(
+                cumulative[i - 1, j], cumulative[i, j - 1], cumulative[i - 1, j - 1]
+            )
+    return float(cumulative[n, m])
+
+
+def test_batch_metric_engine_matches_compute_summary(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = Config()
+    simout_dir = config.paths.folder_path_model.path_folder_simout
+    simout_dir.mkdir(parents=True)
+    simouts = {
+        "output_01_60_A_20250101_000000.csv": make_simout(500, 0.01, seed=0),
+        "output_02_60_B_20250101_000000.csv": make_simout(321, 0.02, seed=1),
+        "output_03_60_C_20250101_000000.csv": make_simout(2, 0.05, seed=2),
+    }
+    for file_name, df in simouts.items():
+        df.to_csv(simout_dir / file_name, index=False)
+
+    df_metrics = BatchMetricEngine(config, logger).compute(list(simouts))
+    df_metrics = df_metrics.set_index("simout_file")
+
+    metric_calculator = MetricCalculator(config, logger)
+    for file_name, df in simouts.items():
+        time = df[DfSimoutSchema().time]
+        expected = metric_calculator.compute_summary(
+            arrays=df, dt=time.iloc[1] - time.iloc[0]
+        )
+        for column, value in expected.items():
+            assert df_metrics.loc[file_name, column] == pytest.approx(
+                value, rel=1e-12, abs=1e-12
+            )
+
+
+@pytest.mark.parametrize("n, m", [(1, 1), (7, 7), (12, 5), (5, 17), (30, 23)])
+def test_dtw_full_band_matches_unbanded(n, m):
+    rng = np.random.default_rng(n * 100 + m)
+    a = rng.normal(size=(n, 2))
+    b = rng.normal(size=(m, 2))
+    assert dtw_distance(a, b, band=max(n, m)) == pytest.approx(
+        dtw_distance_reference(a, b), rel=1e-12
+    )